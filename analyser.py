@@ -1,4 +1,109 @@
 import ast
+import re
+import time
+
+from records import Finding
+from stats import active_stats
+from symbols import CONSTANT_TIME_MEMBERSHIP, Scope, annotation_type, dotted_name, function_scope, infer_type
+
+# === TRAVERSAL TABLES ===
+
+# Field kinds from the AST grammar that never hold child nodes
+SCALAR_FIELD_KINDS = {"identifier", "string", "constant", "int"}
+
+# Field kinds that hold leaf singleton nodes (operators, Load/Store contexts);
+# they are only walked when a handler is registered for them
+LEAF_FIELD_KINDS = {
+    "expr_context": ast.expr_context,
+    "boolop": ast.boolop,
+    "operator": ast.operator,
+    "unaryop": ast.unaryop,
+    "cmpop": ast.cmpop,
+}
+
+_FIELD_SIGNATURE = re.compile(r"^\w+\((.*)\)$")
+_child_field_cache = {}
+
+def child_fields(node_class, skipped_kinds):
+    """
+    Returns ((field, is_list), ...) for the fields of node_class that can hold
+    child nodes, in reverse order so children can be pushed onto a stack.
+    Field kinds are read from the grammar signature in the node class docstring.
+    """
+    key = (node_class, skipped_kinds)
+    fields = _child_field_cache.get(key)
+    if fields is None:
+        match = _FIELD_SIGNATURE.match((node_class.__doc__ or "").strip())
+        if match and node_class._fields:
+            fields = []
+            for part in match.group(1).split(", "):
+                kind, name = part.split()
+                base_kind = kind.rstrip("*?")
+                if base_kind in SCALAR_FIELD_KINDS or base_kind in skipped_kinds:
+                    continue
+                fields.append((name, kind.endswith("*")))
+        else:
+            # Unknown signature: fall back to checking every field at runtime
+            fields = [(name, None) for name in node_class._fields]
+        fields = _child_field_cache[key] = tuple(reversed(fields))
+    return fields
+
+class _Context:
+    """
+    Stack marker that sets the walk context for the nodes popped after it:
+    loop depth, enclosing function, scope, and the names bound by enclosing loop
+    targets within the function (mapped to the loop depth that binds them).
+    """
+
+    __slots__ = ("loop_depth", "function", "scope", "loop_vars")
+
+    def __init__(self, loop_depth, function, scope, loop_vars):
+        self.loop_depth = loop_depth
+        self.function = function
+        self.scope = scope
+        self.loop_vars = loop_vars
+
+def target_names(target):
+    """Returns the plain names bound by an assignment or loop target."""
+    if isinstance(target, ast.Name):
+        return (target.id,)
+    if isinstance(target, (ast.Tuple, ast.List)):
+        return tuple(name for element in target.elts for name in target_names(element))
+    if isinstance(target, ast.Starred):
+        return target_names(target.value)
+    return ()
+
+def _push_fields(node, names, push):
+    """Pushes the named child fields of node in reverse, so they pop in the given order."""
+    for name in reversed(names):
+        value = getattr(node, name, None)
+        if value is None:
+            continue
+        if isinstance(value, list):
+            for item in reversed(value):
+                if item is not None:
+                    push(item)
+        else:
+            push(value)
+
+def visit_methods(obj):
+    """Yields (node class, bound method) for each visit_<NodeClass> method of obj."""
+    for name in dir(type(obj)):
+        if not name.startswith("visit_") or hasattr(ast.NodeVisitor, name):
+            continue
+        node_class = getattr(ast, name[len("visit_"):], None)
+        if isinstance(node_class, type) and issubclass(node_class, ast.AST):
+            yield node_class, getattr(obj, name)
+
+def _compose(first, second):
+    """
+    Runs two handlers in order; the walk skips the node's children only if both return False,
+    so one handler pruning the walk cannot hide nodes from the others.
+    """
+    def handler(node):
+        skip_first = first(node) is False
+        return False if second(node) is False and skip_first else None
+    return handler
 
 class DataStructureAnalyzer(ast.NodeVisitor):
     """
@@ -7,42 +112,306 @@ class DataStructureAnalyzer(ast.NodeVisitor):
     - Structure type
     - Line number
     - Usage context (e.g., membership tests, manual counters)
+
+    - Loop depth and enclosing function (qualified name, None at module level)
+
+    The tree is walked iteratively in the same pre-order as ast.NodeVisitor,
+    dispatching through a node-type -> handler table. A visit_* handler that
+    returns False stops the walk from descending into that node's children
+    (when several handlers share a node type, only if all of them do).
+    Loops, comprehensions, functions and classes are expanded by context pushers
+    that interleave _Context markers with their children, so each finding knows
+    how many loops enclose it within its function.
+
+    Optional detector packs (e.g. pandas_rules.PandasPack) add visit_* handlers
+    of their own, which are composed with the built-in ones in the same table,
+    and may define finalize() to report findings once the walk is complete.
+
+    Names are tracked in a per-scope symbol table (see symbols.py) with the
+    collection type inferred from their latest assignment, so membership and
+    queue findings are only reported for collections that may be lists.
     """
 
-    def __init__(self):
+    def __init__(self, project_index=None, module=None, packs=()):
         self.data_structures = []
 
-        # Track variable names assigned to set literals (for smarter membership detection)
-        self.known_sets = set()
+        # Optional whole-program index (callgraph.ProjectIndex) supplying parameter types
+        # inferred from call sites, and this file's module name within it
+        self.project_index = project_index
+        self.module = module
+
+        # Optional detector packs (classes with visit_* methods and a rules list),
+        # each instantiated with this analyser so they can read the walk context
+        self.packs = [pack(self) for pack in packs]
+
+        # Walk context, maintained by _Context markers on the traversal stack
+        self.loop_depth = 0
+        self.function = None
+        self.module_scope = self.scope = Scope("module")
+        self.loop_vars = {}
+
+        # (function, expression) pairs already reported as repeated lookups
+        self.reported_lookups = set()
+        # func of the Call being visited: a method looked up to be called is not a repeated lookup
+        self.callee = None
+        # Inner prefix of the last reported attribute chain (a.b.c of a.b.c.d), not reported again
+        self.chain_prefix = None
+
+        self.handlers = self.build_handler_table()
+        self.context_pushers = {
+            ast.For: self._push_loop,
+            ast.AsyncFor: self._push_loop,
+            ast.While: self._push_while,
+            ast.ListComp: self._push_comprehension,
+            ast.SetComp: self._push_comprehension,
+            ast.GeneratorExp: self._push_comprehension,
+            ast.DictComp: self._push_comprehension,
+            ast.comprehension: self._push_generator,
+            ast.FunctionDef: self._push_function,
+            ast.AsyncFunctionDef: self._push_function,
+            ast.Lambda: self._push_function,
+            ast.ClassDef: self._push_class,
+        }
+
+    def build_handler_table(self):
+        """
+        Maps each AST node class to the bound visit_* handler for it.
+        Handlers from enabled packs run after the analyser's own handler for the same node type.
+        While statistics are being collected (see stats.py), each handler is wrapped to count
+        and time its calls; otherwise the table holds the bound methods themselves.
+        """
+        stats = active_stats()
+        handlers = {}
+        for owner in [self] + self.packs:
+            for node_class, handler in visit_methods(owner):
+                if stats is not None:
+                    handler = stats.wrap("handler", f"{type(owner).__name__}.visit_{node_class.__name__}", handler)
+                base = handlers.get(node_class)
+                handlers[node_class] = handler if base is None else _compose(base, handler)
+        return handlers
+
+    def visit(self, node):
+        """
+        Walks the tree rooted at node with an explicit stack, so deeply nested
+        expressions cannot hit the interpreter recursion limit.
+        """
+        handlers = self.handlers
+        context_pushers = self.context_pushers
+        skipped_kinds = frozenset(
+            kind for kind, base in LEAF_FIELD_KINDS.items()
+            if not any(issubclass(node_class, base) for node_class in handlers)
+        )
+        field_table = {}
+        stack = [node]
+        pop = stack.pop
+        push = stack.append
+
+        while stack:
+            node = pop()
+            node_class = node.__class__
+            if node_class is _Context:
+                self.loop_depth = node.loop_depth
+                self.function = node.function
+                self.scope = node.scope
+                self.loop_vars = node.loop_vars
+                continue
+
+            handler = handlers.get(node_class)
+            if handler is not None and handler(node) is False:
+                continue
+
+            pusher = context_pushers.get(node_class)
+            if pusher is not None:
+                pusher(node, push)
+                continue
+
+            fields = field_table.get(node_class)
+            if fields is None:
+                fields = field_table[node_class] = child_fields(node_class, skipped_kinds)
+
+            # Fields are stored reversed, so children pop off the stack in field order
+            for field, is_list in fields:
+                value = getattr(node, field, None)
+                if value is None:
+                    continue
+                if is_list:
+                    for item in reversed(value):
+                        if item is not None:
+                            push(item)
+                elif is_list is None:
+                    self._push_unknown_field(value, push)
+                else:
+                    push(value)
+
+    @staticmethod
+    def _push_unknown_field(value, push):
+        if isinstance(value, list):
+            for item in reversed(value):
+                if isinstance(item, ast.AST):
+                    push(item)
+        elif isinstance(value, ast.AST):
+            push(value)
+
+    # === WALK CONTEXT ===
+
+    def _current_context(self):
+        return _Context(self.loop_depth, self.function, self.scope, self.loop_vars)
+
+    def _with_loop_vars(self, target, depth):
+        names = target_names(target)
+        if not names:
+            return self.loop_vars
+        return {**self.loop_vars, **dict.fromkeys(names, depth)}
+
+    def _push_loop(self, node, push):
+        # target and iter run once; body runs once per iteration; orelse runs once
+        depth, function, scope = self.loop_depth, self.function, self.scope
+        _push_fields(node, ("orelse",), push)
+        push(self._current_context())
+        _push_fields(node, ("body",), push)
+        push(_Context(depth + 1, function, scope, self._with_loop_vars(node.target, depth + 1)))
+        _push_fields(node, ("target", "iter"), push)
+
+    def _push_while(self, node, push):
+        # The test is re-evaluated on every iteration, so it counts as inside the loop
+        depth, function, scope = self.loop_depth, self.function, self.scope
+        _push_fields(node, ("orelse",), push)
+        push(self._current_context())
+        _push_fields(node, ("test", "body"), push)
+        push(_Context(depth + 1, function, scope, self.loop_vars))
+
+    def _push_comprehension(self, node, push):
+        # Each generator adds a loop level; the element expression sits inside all of them
+        depth, function, scope = self.loop_depth, self.function, self.scope
+        elements = ("key", "value") if isinstance(node, ast.DictComp) else ("elt",)
+        generators = node.generators
+
+        # Loop variables visible before each generator, and to the element expression
+        loop_vars = [self.loop_vars]
+        for index, generator in enumerate(generators):
+            names = target_names(generator.target)
+            loop_vars.append({**loop_vars[-1], **dict.fromkeys(names, depth + index + 1)})
+
+        push(self._current_context())
+        for index in range(len(generators) - 1, -1, -1):
+            push(generators[index])
+            push(_Context(depth + index, function, scope, loop_vars[index]))
+        _push_fields(node, elements, push)
+        push(_Context(depth + len(generators), function, scope, loop_vars[-1]))
+
+    def _push_generator(self, node, push):
+        # A generator's iterable is evaluated at the enclosing level; its target and ifs run per item
+        depth, function, scope = self.loop_depth, self.function, self.scope
+        inner = _Context(depth + 1, function, scope, self._with_loop_vars(node.target, depth + 1))
+        _push_fields(node, ("ifs",), push)
+        push(inner)
+        _push_fields(node, ("iter",), push)
+        push(self._current_context())
+        _push_fields(node, ("target",), push)
+        push(inner)
+
+    def _push_function(self, node, push):
+        # Arguments, decorators and annotations are evaluated where the function is defined;
+        # the body starts a new function context and scope with no enclosing loops
+        scope = self.scope
+        function = self.function
+        name = getattr(node, "name", "<lambda>")
+        qualname = f"{function}.{name}" if function else name
+        if name != "<lambda>":
+            scope.bind(name, None)
+
+        parameter_types = None
+        if self.project_index is not None:
+            parameter_types = self.project_index.parameter_types(self.module, qualname)
+
+        _push_fields(node, ("decorator_list", "returns", "type_params"), push)
+        push(self._current_context())
+        _push_fields(node, ("body",), push)
+        push(_Context(0, qualname, function_scope(node, scope, qualname, parameter_types), {}))
+        _push_fields(node, ("args",), push)
+
+    def _push_class(self, node, push):
+        depth, function, scope = self.loop_depth, self.function, self.scope
+        qualname = f"{function}.{node.name}" if function else node.name
+        scope.bind(node.name, None)
+
+        _push_fields(node, ("decorator_list", "type_params"), push)
+        push(self._current_context())
+        _push_fields(node, ("body",), push)
+        push(_Context(depth, qualname, Scope("class", qualname, scope), {}))
+        _push_fields(node, ("bases", "keywords"), push)
+
+    def finalize(self):
+        """
+        Lets each pack record findings that need the whole module, e.g. matching
+        class definitions to instantiations that appear before them.
+        """
+        for pack in self.packs:
+            finalize = getattr(pack, "finalize", None)
+            if finalize is not None:
+                finalize()
+
+    def generic_visit(self, node):
+        """Visits every descendant of node (the node's own handler is not called)."""
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
 
-    def record_structure(self, node, struct_type, details="", usage_context=None):
+    def get_state(self, names=None):
         """
-        Stores details about each detected data structure or usage pattern.
+        Returns a hashable snapshot of the state carried between statements
+        (the module-level symbol table), optionally limited to the given names.
+        Used to reuse findings for unchanged definitions during incremental analysis.
         """
-        self.data_structures.append({
-            "line": node.lineno,
-            "type": struct_type,
-            "details": details,
-            "usage_context": usage_context
-        })
+        symbols = self.module_scope.symbols
+        if names is None:
+            return frozenset(symbols.items())
+        return frozenset((name, symbols[name]) for name in names if name in symbols)
+
+    def set_state(self, state):
+        """Restores a snapshot returned by get_state."""
+        self.module_scope.symbols = dict(state)
+
+    def update_state(self, state):
+        """Applies a partial snapshot returned by get_state(names) on top of the current state."""
+        self.module_scope.symbols.update(state)
+
+    def bind_target(self, target, type_):
+        """Binds every name in an assignment target (tuple targets bind each element as unknown)."""
+        if target.__class__ is ast.Name:
+            self.scope.bind(target.id, type_)
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            for element in target.elts:
+                self.bind_target(element, None)
+        elif isinstance(target, ast.Starred):
+            self.bind_target(target.value, "list")
+        else:
+            name = dotted_name(target)
+            if name is not None:
+                self.scope.bind(name, type_)
+
+    def record_structure(self, node, struct_type, details="", usage_context=None, target=None):
+        """
+        Stores details about each detected data structure or usage pattern
+        as a compact Finding record, tagged with the current loop depth and function.
+        target is the dotted name of the collection involved, when known.
+        """
+        self.data_structures.append(
+            Finding(node.lineno, struct_type, details, usage_context, self.loop_depth, self.function, target)
+        )
 
     # === BASIC STRUCTURE DETECTION ===
 
     def visit_List(self, node):
         self.record_structure(node, "List", "Ordered, mutable, allows duplicates.")
-        self.generic_visit(node)
 
     def visit_Tuple(self, node):
         self.record_structure(node, "Tuple", "Ordered, immutable, allows duplicates.")
-        self.generic_visit(node)
 
     def visit_Set(self, node):
         self.record_structure(node, "Set", "Unordered, mutable, no duplicates.")
-        self.generic_visit(node)
 
     def visit_Dict(self, node):
         self.record_structure(node, "Dictionary", "Key-value pairs, mutable, ordered since Python 3.7+.")
-        self.generic_visit(node)
 
     # === SPECIAL STRUCTURES & MODULES ===
 
@@ -55,6 +424,8 @@ class DataStructureAnalyzer(ast.NodeVisitor):
         - namedtuple
         - frozenset
         """
+        self.callee = node.func
+
         # Handle direct function calls like deque(), Counter(), etc.
         if isinstance(node.func, ast.Name):
             func_name = node.func.id
@@ -91,22 +462,20 @@ class DataStructureAnalyzer(ast.NodeVisitor):
                 if node.func.attr == "array":
                     self.record_structure(node, "Array", "Memory-efficient array (array.array).")
 
-
-        self.generic_visit(node)
+        self.detect_call_patterns(node)
 
     # === ASSIGNMENT-BASED DETECTION ===
 
     def visit_Assign(self, node):
         """
-        - Tracks variables assigned to set literals (for smarter membership detection).
+        - Binds assigned names to the collection type inferred from the value.
         - Detects manual dictionary counters (dict.get(..., 0) + 1).
         """
 
-        # Track variables assigned to set literals
-        if isinstance(node.value, ast.Set):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    self.known_sets.add(target.id)
+        # Record the inferred type of every assigned name in the current scope
+        value_type = infer_type(node.value, self.scope)
+        for target in node.targets:
+            self.bind_target(target, value_type)
 
         # Detect manual counter pattern
         if isinstance(node.value, ast.BinOp) and isinstance(node.value.op, ast.Add):
@@ -120,27 +489,40 @@ class DataStructureAnalyzer(ast.NodeVisitor):
                         usage_context="manual_counter"
                     )
 
-        self.generic_visit(node)
+    def visit_AnnAssign(self, node):
+        """Binds an annotated name, preferring the annotation over the value's inferred type."""
+        value_type = infer_type(node.value, self.scope) if node.value is not None else None
+        self.bind_target(node.target, annotation_type(node.annotation) or value_type)
+
+    def visit_NamedExpr(self, node):
+        self.bind_target(node.target, infer_type(node.value, self.scope))
+
+    def visit_For(self, node):
+        # The loop variable is rebound to each item, whose type is unknown
+        self.bind_target(node.target, None)
+
+    visit_AsyncFor = visit_For
+
+    def visit_withitem(self, node):
+        if node.optional_vars is not None:
+            self.bind_target(node.optional_vars, None)
+
+    def visit_Global(self, node):
+        self.scope.global_names.update(node.names)
 
     # === CONTEXT-BASED DETECTION ===
 
     def visit_If(self, node):
         """
         Detects inefficient membership tests: `if x in list`
-        Skips:
-        - set literals
-        - variables known to be sets
+        Skips collections whose inferred type has constant-time membership
+        (set and dict literals, comprehensions and constructors, and names bound to them).
         """
 
         if isinstance(node.test, ast.Compare) and isinstance(node.test.ops[0], ast.In):
             collection = node.test.comparators[0]
 
-            # Skip literal sets (e.g., if x in {1, 2, 3})
-            if isinstance(collection, ast.Set):
-                return
-
-            # Skip known variables assigned to sets earlier
-            if isinstance(collection, ast.Name) and collection.id in self.known_sets:
+            if infer_type(collection, self.scope) in CONSTANT_TIME_MEMBERSHIP:
                 return
 
             # Default to naming the collection
@@ -150,20 +532,24 @@ class DataStructureAnalyzer(ast.NodeVisitor):
                 node,
                 f"Membership Test on {collection_name}",
                 "Membership test detected (consider using set).",
-                usage_context="membership_test"
+                usage_context="membership_test",
+                target=dotted_name(collection)
             )
 
-        self.generic_visit(node)
-
     def visit_Attribute(self, node):
         """
         Detects queue-like patterns using lists:
         - .append()
         - .pop()
-        Skips if the variable name suggests it's a deque or queue (e.g., 'q', 'deque', 'queue').
+        Skips receivers inferred to be something other than a list (deque, set, dict...),
+        and, when the type is unknown, names that suggest a deque or queue ('queue', 'deque', 'dq').
         """
         if node.attr in {"append", "pop"}:
-            if isinstance(node.value, ast.Name):
+            receiver_type = infer_type(node.value, self.scope)
+            if receiver_type is not None and receiver_type != "list":
+                return
+
+            if receiver_type is None and isinstance(node.value, ast.Name):
                 var_name = node.value.id.lower()
                 if var_name in {"deque", "queue", "dq"}:
                     return  # Skip likely deque usage
@@ -172,10 +558,136 @@ class DataStructureAnalyzer(ast.NodeVisitor):
                 node,
                 "List",
                 f"{node.attr} usage detected (may indicate inefficient queue use).",
-                usage_context="append_or_pop"
+                usage_context="append_or_pop",
+                target=dotted_name(node.value)
             )
 
-        self.generic_visit(node)
+        # Only the outermost chain is reported; its inner prefixes are still walked (for packs)
+        if node is self.chain_prefix:
+            self.chain_prefix = node.value
+        elif self.loop_depth and isinstance(node.ctx, ast.Load) and self.detect_attribute_chain(node):
+            self.chain_prefix = node.value
+
+    # === HOT-LOOP DETECTION ===
+
+    def is_loop_invariant(self, expr):
+        """True for a Name/Attribute chain whose root is not rebound by an enclosing loop target."""
+        name = dotted_name(expr)
+        return name is not None and name.split(".", 1)[0] not in self.loop_vars
+
+    def loop_level(self, expr):
+        """Returns the loop depth that binds the root name of expr (through subscripts and attributes)."""
+        while isinstance(expr, (ast.Attribute, ast.Subscript)):
+            expr = expr.value
+        if isinstance(expr, ast.Name):
+            return self.loop_vars.get(expr.id)
+        return None
+
+    def record_lookup(self, node, expression, details):
+        # Report each repeated lookup once per function
+        key = (self.function, expression)
+        if key in self.reported_lookups:
+            return
+        self.reported_lookups.add(key)
+        self.record_structure(node, "Repeated Lookup", details, usage_context="repeated_lookup", target=expression)
+
+    def detect_call_patterns(self, node):
+        """
+        Detects calls that are costly in loops or on lists:
+        - list.insert(0, x), which shifts every element
+        - sorted() / .sort() / single-argument min() / max() recomputed on a loop-invariant collection
+        - len() of a loop-invariant collection recomputed on every iteration
+        """
+        func = node.func
+        args = node.args
+
+        if isinstance(func, ast.Attribute) and func.attr == "insert" and len(args) == 2:
+            first = args[0]
+            if isinstance(first, ast.Constant) and first.value == 0 and not isinstance(first.value, bool):
+                if infer_type(func.value, self.scope) in (None, "list"):
+                    self.record_structure(
+                        node,
+                        "List",
+                        "insert(0, x) shifts every element on each call.",
+                        usage_context="insert_front",
+                        target=dotted_name(func.value)
+                    )
+            return
+
+        if not self.loop_depth:
+            return
+
+        if isinstance(func, ast.Attribute) and func.attr == "sort" and self.is_loop_invariant(func.value):
+            if infer_type(func.value, self.scope) in (None, "list"):
+                self.record_structure(
+                    node,
+                    "Repeated Sort",
+                    f"{dotted_name(func.value)}.sort() re-sorts the collection on every iteration.",
+                    usage_context="repeated_sort",
+                    target=dotted_name(func.value)
+                )
+            return
+
+        if not isinstance(func, ast.Name) or len(args) != 1:
+            return
+        if func.id in {"sorted", "min", "max"} and self.is_loop_invariant(args[0]):
+            self.record_structure(
+                node,
+                "Repeated Sort",
+                f"{func.id}() over {dotted_name(args[0])} is recomputed on every iteration.",
+                usage_context="repeated_sort",
+                target=dotted_name(args[0])
+            )
+        elif func.id == "len" and self.is_loop_invariant(args[0]):
+            name = dotted_name(args[0])
+            self.record_lookup(node, f"len({name})", f"len({name}) is recomputed on every iteration.")
+
+    def detect_attribute_chain(self, node):
+        """
+        Detects a.b.c attribute chains (3+ names) looked up on every loop iteration. Returns True if reported.
+        Chains ending in a called method (self.items.append(x), os.path.join(...)) are not reported.
+        """
+        if node is self.callee or not isinstance(node.value, ast.Attribute) or not self.is_loop_invariant(node):
+            return False
+        name = dotted_name(node)
+        self.record_lookup(node, name, f"{name} is looked up on every iteration.")
+        return True
+
+    def visit_AugAssign(self, node):
+        """
+        Detects strings built with += inside loops (each += copies the string so far).
+        The target must be inferred as a str, or be of unknown type with a str value added.
+        """
+        if not self.loop_depth or not isinstance(node.op, ast.Add):
+            return
+        if not self.is_loop_invariant(node.target):
+            return
+        target_type = infer_type(node.target, self.scope)
+        if target_type == "str" or (target_type is None and infer_type(node.value, self.scope) == "str"):
+            name = dotted_name(node.target)
+            self.record_structure(
+                node,
+                "String Concatenation",
+                f"{name} += ... builds a string inside a loop.",
+                usage_context="string_concat",
+                target=name
+            )
+
+    def visit_Compare(self, node):
+        """
+        Detects nested-loop joins: an equality test between values bound by two
+        different enclosing loops, e.g. `for a in A: for b in B: if a.key == b.key`.
+        """
+        if self.loop_depth < 2 or len(node.ops) != 1 or not isinstance(node.ops[0], ast.Eq):
+            return
+        outer, inner = self.loop_level(node.left), self.loop_level(node.comparators[0])
+        if outer is not None and inner is not None and outer != inner:
+            self.record_structure(
+                node,
+                "Nested Loop Join",
+                "Nested loops match items from two collections by equality.",
+                usage_context="nested_loop_join"
+            )
 
     # === CLASS-BASED STRUCTURE DETECTION ===
 
@@ -208,20 +720,37 @@ class DataStructureAnalyzer(ast.NodeVisitor):
             if isinstance(decorator, ast.Name) and decorator.id == "dataclass":
                 self.record_structure(node, "DataClass", "Structured data container (Python 3.7+).")
 
-        self.generic_visit(node)
 
 # === ENTRY POINT ===
 
-def analyse_code(code_str):
+def analyse_code(code_str, project_index=None, module=None, packs=()):
     """
     Main interface for analysing a block of Python code.
     Returns a list of detected data structures and usage patterns.
+    With a callgraph.ProjectIndex, parameter types are seeded from the types
+    callers pass in (module is this code's module name in the index).
+    packs are detector pack classes to enable on top of the built-in detectors.
     """
+    stats = active_stats()
+    start = time.perf_counter() if stats is not None else None
     try:
         tree = ast.parse(code_str)
     except SyntaxError as e:
         raise ValueError(f"Syntax error while parsing code: {e}")
+    except RecursionError:
+        raise ValueError("Code is too deeply nested to parse.")
+
+    analyser = DataStructureAnalyzer(project_index, module, packs)
+    if stats is None:
+        analyser.visit(tree)
+        analyser.finalize()
+        return analyser.data_structures
 
-    analyser = DataStructureAnalyzer()
+    parsed = time.perf_counter()
+    stats.add("parse", "ast.parse", parsed - start)
     analyser.visit(tree)
+    walked = time.perf_counter()
+    stats.add("analyser", "walk", walked - parsed)
+    analyser.finalize()
+    stats.add("analyser", "finalize", time.perf_counter() - walked)
     return analyser.data_structures
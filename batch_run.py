@@ -1,14 +1,23 @@
 import os
-import subprocess
+import time
+import hashlib
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from pipeline import (
+    analyse_source, build_collector, calculate_sustainability_score, format_jsonl, iter_findings, iter_python_files
+)
+from report_generator import ReportGenerator
+from cache import DEFAULT_CACHE_DIR, ResultCache
+from golden import check_reports
+
 USER_SUBMISSIONS_DIR = "examples/user_submissions/"
 REPORTS_DIR = "examples/reports/"
 EXPECTED_REPORTS_DIR = "examples/expected_reports/"
 
 def compare_reports(generated, expected):
-    """Compare generated and expected reports, ignoring timestamps."""
+    """Compare generated and expected reports line by line, ignoring timestamps (see golden.py for batches)."""
     try:
         with open(generated, 'r') as gen_file, open(expected, 'r') as exp_file:
             gen_lines = [line.strip() for line in gen_file if not line.startswith("_Generated on")]
@@ -17,66 +26,225 @@ def compare_reports(generated, expected):
     except FileNotFoundError:
         return False
 
-def run_batch(refresh_expected=False):
+# === IN-PROCESS ANALYSIS ENGINE ===
+
+def analyse_submission(input_path, report_path=None, csv_path=None, cache_dir=None):
+    """
+    Analyses a single file in the current process and writes its report and CSV.
+    Results are served from the ResultCache in cache_dir when one is given.
+    Returns a result dict with the score, suggestion count, output lines and wall time.
+    Errors are captured in the result so one bad file does not stop the batch.
+    """
+    start = time.perf_counter()
+    result = {"input": input_path, "output": [], "error": None}
+
+    try:
+        with open(input_path, "r") as file:
+            code = file.read()
+
+        cache = _get_cache(cache_dir) if cache_dir else None
+        detected_structures, suggestions = analyse_source(code, cache=cache)
+        sustainability_score = calculate_sustainability_score(suggestions)
+
+        if report_path:
+            report_generator = ReportGenerator(suggestions, sustainability_score=sustainability_score)
+            report_file = report_generator.generate_markdown_report(file_name=report_path)
+            result["output"].append(f"Report saved to: {report_file}")
+
+        if csv_path:
+            collector = build_collector(detected_structures, suggestions)
+            csv_file = collector.export_csv(file_name=csv_path)
+            result["output"].append(f"Usage data exported to: {csv_file}")
+
+        result["output"].append(f"Sustainability Score: {sustainability_score}/100")
+        result["score"] = sustainability_score
+        result["suggestions"] = len(suggestions)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+_caches = {}
+
+def _get_cache(cache_dir):
+    """Returns one ResultCache per directory per process, so workers keep their index warm."""
+    if cache_dir not in _caches:
+        _caches[cache_dir] = ResultCache(cache_dir)
+    return _caches[cache_dir]
+
+def _run_job(job):
+    """Unpacks a job tuple for use with Executor.map."""
+    return analyse_submission(*job)
+
+def run_jobs(jobs, workers=None, run=_run_job):
+    """
+    Runs (input_path, report_path, csv_path, cache_dir) jobs, yielding results in job order.
+    Uses a process pool unless a single worker is requested.
+    run is the picklable function applied to each job.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield run(job)
+        return
+
+    # Batch small files into chunks so pool overhead stays negligible on large trees
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(run, jobs, chunksize=chunksize)
+
+# === SHARDING ===
+
+def parse_shard(text):
+    """Parses an 'i/N' shard spec (1 <= i <= N) into (i, N)."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected a shard spec like 2/8, got {text!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"Shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+def shard_of(relative_path, count):
+    """
+    Returns the 1-based shard a file belongs to. The path is hashed relative to the
+    scanned root with / separators, so every runner assigns files the same way.
+    """
+    key = relative_path.replace(os.sep, "/").encode()
+    return int.from_bytes(hashlib.sha1(key).digest()[:8], "big") % count + 1
+
+def shard_files(paths, index, count):
+    """Returns sorted (relative path, path) pairs for the .py files under paths that fall in shard index/count."""
+    selected = []
+    for root in paths:
+        base = root if os.path.isdir(root) else os.path.dirname(root)
+        for path in iter_python_files([root]):
+            relative = os.path.relpath(path, base).replace(os.sep, "/")
+            if shard_of(relative, count) == index:
+                selected.append((relative, path))
+    return sorted(selected)
+
+def _shard_job(job):
+    """Analyses one file for a shard, returning its iter_findings records as (kind, dict) pairs."""
+    relative, path, cache_dir = job
+    cache = _get_cache(cache_dir) if cache_dir else None
+    return relative, [(kind, dict(record)) for _, kind, record in iter_findings([path], cache=cache)]
+
+def run_shard(paths, index, count, output, workers=None, cache_dir=None):
+    """
+    Analyses the files of shard index/count and writes their findings to output as JSON Lines
+    (the --format jsonl records, keyed by path relative to the scanned root, in path order).
+    merge_shards.py combines the artifacts of all shards. Returns the number of files analysed.
+    """
+    files = shard_files(paths, index, count)
+    jobs = [(relative, path, cache_dir) for relative, path in files]
+    with open(output, "w") as stream:
+        for relative, records in run_jobs(jobs, workers=workers, run=_shard_job):
+            for kind, record in records:
+                stream.write(format_jsonl(relative, kind, record) + "\n")
+    return len(files)
+
+def run_batch(refresh_expected=False, workers=None, cache_dir=DEFAULT_CACHE_DIR):
     os.makedirs(REPORTS_DIR, exist_ok=True)
 
-    submission_files = [f for f in os.listdir(USER_SUBMISSIONS_DIR) if f.endswith(".py")]
+    submission_files = sorted(f for f in os.listdir(USER_SUBMISSIONS_DIR) if f.endswith(".py"))
     if not submission_files:
         print("⚠️ No Python files found in user_submissions/")
-        return
+        return []
 
     summary = []
+    jobs = []
 
     print(f"\n🧪 Batch Analysis Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    batch_start = time.perf_counter()
 
     for file in submission_files:
         base_name = os.path.splitext(file)[0]
-        input_path = os.path.join(USER_SUBMISSIONS_DIR, file)
-        report_path = os.path.join(REPORTS_DIR, f"{base_name}_report.md")
-        csv_path = os.path.join(REPORTS_DIR, f"{base_name}_usage.csv")
-        expected_path = os.path.join(EXPECTED_REPORTS_DIR, f"{base_name}_expected.md")
-
-        # Run the CLI
-        result = subprocess.run([
-            "python", "cli.py",
-            "--input", input_path,
-            "--report", report_path,
-            "--export-csv", csv_path,
-            "--score"
-        ], capture_output=True, text=True)
+        jobs.append((
+            os.path.join(USER_SUBMISSIONS_DIR, file),
+            os.path.join(REPORTS_DIR, f"{base_name}_report.md"),
+            os.path.join(REPORTS_DIR, f"{base_name}_usage.csv"),
+            cache_dir
+        ))
+
+    # Reports that were generated, compared against the golden set once all are written
+    golden = []
+
+    for file, job, result in zip(submission_files, jobs, run_jobs(jobs, workers=workers)):
+        base_name = os.path.splitext(file)[0]
+        elapsed = result["elapsed"]
 
         print(f"📄 {file}:")
-        print(f"{result.stdout.strip()}\n")
-
-        # Optional: update expected report
-        if refresh_expected:
-            with open(expected_path, "w") as f:
-                with open(report_path, "r") as generated:
-                    f.write(generated.read())
-            print(f"🔄 Updated expected report for {base_name}\n")
-            summary.append((file, "UPDATED"))
+        if result["error"]:
+            print(f"💥 Analysis failed: {result['error']}\n")
+            summary.append((file, "ERROR", elapsed))
+            print("-" * 50)
             continue
+        print("\n".join(result["output"]) + "\n")
+        print("-" * 50)
+        golden.append((len(summary), job[1], f"{base_name}_expected.md"))
+        summary.append((file, None, elapsed))
 
-        # Compare reports
-        match = compare_reports(report_path, expected_path)
-        if match:
+    # Compare by normalised hash (in parallel); refresh rewrites only the reports that changed
+    os.makedirs(EXPECTED_REPORTS_DIR, exist_ok=True)
+    results = check_reports(
+        [(report_path, expected_name) for _, report_path, expected_name in golden],
+        EXPECTED_REPORTS_DIR,
+        refresh=refresh_expected,
+        workers=workers
+    )
+    for (position, _, expected_name), (_, status, diff) in zip(golden, results):
+        file, _, elapsed = summary[position]
+        summary[position] = (file, status, elapsed)
+        if status == "PASSED":
             print(f"✅ Test PASSED for {file}")
-            summary.append((file, "PASSED"))
-        else:
+        elif status == "FAILED":
             print(f"❌ Test FAILED for {file}")
-            summary.append((file, "FAILED"))
+            if diff:
+                print(diff)
+        elif status == "UPDATED":
+            print(f"🔄 Updated expected report {expected_name}")
 
-        print("-" * 50)
+    total_elapsed = time.perf_counter() - batch_start
 
     # Summary
     print("\n📋 Batch Test Summary:")
-    for name, status in summary:
-        print(f"• {name}: {status}")
+    for name, status, elapsed in summary:
+        print(f"• {name}: {status} ({elapsed:.3f}s)")
+    print(f"\n⏱️ Total wall time: {total_elapsed:.3f}s for {len(summary)} file(s)")
     print("\n✅ All done.")
+    return summary
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run batch analysis and optionally refresh expected reports.")
     parser.add_argument("--refresh", action="store_true", help="Overwrite expected reports with current output.")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: CPU count).")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for cached analysis results.")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-analyse, bypassing the result cache.")
+    parser.add_argument("--shard", type=parse_shard, metavar="I/N",
+                        help="Analyse only shard I of N (files split by path hash) and write a findings artifact.")
+    parser.add_argument("--input", nargs="+",
+                        help="Files or directories scanned by --shard (default: the submissions directory).")
+    parser.add_argument("--shard-output", help="Artifact path for --shard (default: shard-I-of-N.jsonl in the reports directory).")
     args = parser.parse_args()
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    # The golden-report batch always runs over the submissions directory
+    if args.input and not args.shard:
+        parser.error("--input is only used with --shard")
 
-    run_batch(refresh_expected=args.refresh)
+    if args.shard:
+        index, count = args.shard
+        output = args.shard_output or os.path.join(REPORTS_DIR, f"shard-{index}-of-{count}.jsonl")
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        paths = args.input or [USER_SUBMISSIONS_DIR]
+        analysed = run_shard(paths, index, count, output, workers=args.workers, cache_dir=cache_dir)
+        print(f"Shard {index}/{count}: {analysed} file(s) analysed, findings written to {output}")
+    else:
+        run_batch(
+            refresh_expected=args.refresh,
+            workers=args.workers,
+            cache_dir=cache_dir
+        )
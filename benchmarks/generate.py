@@ -0,0 +1,78 @@
+# benchmarks/generate.py
+
+import random
+
+# === PATTERN TEMPLATES ===
+# Each template is a block of source using `{i}` as a unique suffix.
+
+PATTERNS = {
+    "membership": (
+        'names_{i} = ["a", "b", "c", "d"]\n'
+        'if "c" in names_{i}:\n'
+        '    found_{i} = True\n'
+    ),
+    "counter": (
+        "counts_{i} = {{}}\n"
+        'for ch_{i} in "abracadabra":\n'
+        "    counts_{i}[ch_{i}] = counts_{i}.get(ch_{i}, 0) + 1\n"
+    ),
+    "queue": (
+        "pending_{i} = []\n"
+        "pending_{i}.append({i})\n"
+        "pending_{i}.pop(0)\n"
+    ),
+    "class": (
+        "class Stack{i}:\n"
+        "    def __init__(self):\n"
+        "        self.items = []\n"
+        "\n"
+        "    def push(self, item):\n"
+        "        self.items.append(item)\n"
+    ),
+    "function": (
+        "def process_{i}(items):\n"
+        "    total = 0\n"
+        "    for item in items:\n"
+        "        if item in items:\n"
+        "            total += 1\n"
+        "    return total\n"
+    ),
+    "data": (
+        'row_{i} = ({i}, [{i}, {i} + 1], {{"key": {i}}})\n'
+    ),
+}
+
+DEFAULT_MIX = {
+    "membership": 2,
+    "counter": 2,
+    "queue": 2,
+    "class": 1,
+    "function": 2,
+    "data": 3,
+}
+
+def generate_module(lines, mix=None, seed=0):
+    """
+    Generates a synthetic Python module of roughly `lines` lines.
+    `mix` maps pattern names from PATTERNS to relative weights.
+    Output is deterministic for a given (lines, mix, seed).
+    """
+    mix = mix or DEFAULT_MIX
+    unknown = set(mix) - set(PATTERNS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark patterns: {', '.join(sorted(unknown))}")
+
+    names = [name for name in mix if mix[name] > 0]
+    weights = [mix[name] for name in names]
+    rng = random.Random(seed)
+
+    blocks = []
+    line_count = 0
+    i = 0
+    while line_count < lines:
+        block = PATTERNS[rng.choices(names, weights)[0]].format(i=i)
+        blocks.append(block)
+        line_count += block.count("\n")
+        i += 1
+
+    return "".join(blocks)
@@ -0,0 +1,180 @@
+# benchmarks/run_benchmarks.py
+#
+# Times each stage of the analysis pipeline on synthetic modules.
+# Run from the repository root:
+#
+#   python -m benchmarks.run_benchmarks --compare
+#   python -m benchmarks.run_benchmarks --save benchmarks/baseline.json
+#
+# --compare checks against the committed baseline (benchmarks/baseline.json) and exits
+# non-zero on a regression; tests/test_benchmarks.py runs the same check on one size
+# when RUN_BENCHMARKS=1 is set.
+# Re-save the baseline when a change is expected to alter the results.
+
+import argparse
+import ast
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from analyser import DataStructureAnalyzer
+from benchmarks.generate import generate_module
+from pipeline import build_collector, calculate_sustainability_score
+from report_generator import ReportGenerator
+from suggestor import Suggestor
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+PHASES = ["parse", "visit", "rules", "report", "csv"]
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Phases faster than this are too noisy to flag as regressions
+MIN_COMPARABLE_SECONDS = 0.005
+
+def _timed(func):
+    start = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - start
+
+def measure_findings_memory(structures):
+    """
+    Returns (record_bytes, dict_bytes): the shallow size of the findings as stored,
+    and the size the same findings would take as one dict each.
+    Strings are shared between both forms, so only container overhead is counted.
+    """
+    record_bytes = sys.getsizeof(structures) + sum(sys.getsizeof(s) for s in structures)
+    dict_bytes = sys.getsizeof(structures) + sum(sys.getsizeof(dict(s)) for s in structures)
+    return record_bytes, dict_bytes
+
+def benchmark_source(code, repeat=3):
+    """
+    Times parse, visit, rule application, report generation and CSV export
+    for one block of code. Each phase reports the best of `repeat` runs.
+    """
+    best = {phase: float("inf") for phase in PHASES}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_path = os.path.join(tmp_dir, "report.md")
+        csv_path = os.path.join(tmp_dir, "usage.csv")
+
+        for _ in range(repeat):
+            tree, elapsed = _timed(lambda: ast.parse(code))
+            best["parse"] = min(best["parse"], elapsed)
+
+            analyser = DataStructureAnalyzer()
+            _, elapsed = _timed(lambda: analyser.visit(tree))
+            best["visit"] = min(best["visit"], elapsed)
+            structures = analyser.data_structures
+
+            suggestions, elapsed = _timed(lambda: Suggestor(structures).get_suggestions())
+            best["rules"] = min(best["rules"], elapsed)
+
+            score = calculate_sustainability_score(suggestions)
+            report = ReportGenerator(suggestions, sustainability_score=score)
+            _, elapsed = _timed(lambda: report.generate_markdown_report(file_name=report_path))
+            best["report"] = min(best["report"], elapsed)
+
+            _, elapsed = _timed(lambda: build_collector(structures, suggestions).export_csv(file_name=csv_path))
+            best["csv"] = min(best["csv"], elapsed)
+
+    best["findings"] = len(structures)
+    best["findings_bytes"], best["findings_dict_bytes"] = measure_findings_memory(structures)
+    best["suggestions"] = len(suggestions)
+    return best
+
+def run_suite(sizes=None, mix=None, repeat=3, seed=0):
+    """Runs the benchmark for every module size and returns a machine-readable result dict."""
+    results = {}
+    for size in sizes or DEFAULT_SIZES:
+        code = generate_module(size, mix=mix, seed=seed)
+        result = benchmark_source(code, repeat=repeat)
+        result["lines"] = code.count("\n")
+        results[str(size)] = result
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "seed": seed,
+        "results": results
+    }
+
+def compare_to_baseline(current, baseline, tolerance=0.25):
+    """
+    Returns a list of regression messages for phases slower than the baseline, or
+    findings taking more memory, by more than `tolerance` (a fraction, e.g. 0.25 for 25%).
+    """
+    regressions = []
+    for size, base in baseline["results"].items():
+        result = current["results"].get(size)
+        if result is None:
+            continue
+        before, after = base.get("findings_bytes"), result.get("findings_bytes")
+        if before and after and after > before * (1 + tolerance):
+            regressions.append(
+                f"{size} lines / findings memory: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB "
+                f"(+{(after / before - 1) * 100:.0f}%)"
+            )
+        for phase in PHASES:
+            before, after = base.get(phase), result.get(phase)
+            if before is None or after is None or max(before, after) < MIN_COMPARABLE_SECONDS:
+                continue
+            if after > before * (1 + tolerance):
+                regressions.append(
+                    f"{size} lines / {phase}: {before:.4f}s -> {after:.4f}s (+{(after / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+def format_table(suite):
+    """Formats suite results as a human-readable table."""
+    header = (
+        f"{'lines':>10} " + " ".join(f"{phase:>9}" for phase in PHASES)
+        + f" {'findings':>9} {'rec KiB':>9} {'dict KiB':>9}"
+    )
+    rows = [header, "-" * len(header)]
+    for result in suite["results"].values():
+        rows.append(
+            f"{result['lines']:>10} "
+            + " ".join(f"{result[phase]:>9.4f}" for phase in PHASES)
+            + f" {result['findings']:>9}"
+            + f" {result['findings_bytes'] / 1024:>9.0f} {result['findings_dict_bytes'] / 1024:>9.0f}"
+        )
+    return "\n".join(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline on synthetic modules.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Module sizes in lines (up to 1000000).")
+    parser.add_argument("--mix", help='Pattern weights as JSON, e.g. \'{"membership": 3, "data": 1}\'.')
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per phase; the best time is kept.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the source generator.")
+    parser.add_argument("--save", help="Write results to this JSON file.")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH,
+                        help="Baseline JSON file to check for regressions (default: the committed baseline).")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a phase counts as a regression.")
+    args = parser.parse_args()
+
+    mix = json.loads(args.mix) if args.mix else None
+    suite = run_suite(sizes=args.sizes, mix=mix, repeat=args.repeat, seed=args.seed)
+    print(format_table(suite))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(suite, f, indent=2)
+        print(f"\nResults saved to: {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(suite, baseline, tolerance=args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for message in regressions:
+                print(f"• {message}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# cache.py
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import analyser
+import cost_model
+import rules
+import suggestor
+import records
+import symbols
+from records import Finding, Suggestion
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_DIR = ".dsa_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_rule_set_version = None
+
+def rule_set_version():
+    """
+    Returns a fingerprint of the analyser and rule set.
+    Any edit to the modules that produce findings invalidates every cached entry.
+    """
+    global _rule_set_version
+    if _rule_set_version is None:
+        digest = hashlib.sha256(f"format-{CACHE_FORMAT_VERSION}".encode())
+        for module in (analyser, cost_model, rules, suggestor, records, symbols):
+            with open(module.__file__, "rb") as f:
+                digest.update(f.read())
+        _rule_set_version = digest.hexdigest()
+    return _rule_set_version
+
+def packs_version(packs):
+    """
+    Returns a fingerprint of the enabled detector packs: their names, module source
+    and, for generated packs (e.g. patterns.pattern_pack), their version attribute.
+    """
+    digest = hashlib.sha256()
+    for pack in packs:
+        digest.update(pack.name.encode())
+        digest.update(getattr(pack, "version", "").encode())
+        with open(sys.modules[pack.__module__].__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+class ResultCache:
+    """
+    Persistent on-disk cache of detected structures and suggestions,
+    keyed by a hash of the source code and the rule set version.
+    Entries are evicted least-recently-used first once the cache exceeds max_bytes.
+    One instance may be shared between threads (e.g. by the analysis daemon).
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        # Lazily loaded {path: (last_used, size)} view of the cache directory
+        self._index = None
+        self._total_bytes = 0
+        # Guards the counters and the index; file reads and writes happen outside it
+        self._lock = threading.RLock()
+
+    def key(self, code, context=""):
+        """
+        Returns the cache key for a block of source code.
+        context identifies any outside input the results depend on (e.g. a project index digest).
+        """
+        digest = hashlib.sha256(rule_set_version().encode())
+        digest.update(code.encode("utf-8", "surrogatepass"))
+        if context:
+            digest.update(f"\0{context}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        # Two-character fan-out keeps directories small on large trees
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, code, context=""):
+        """Returns (detected_structures, suggestions) for the code, or None on a miss."""
+        path = self._path(self.key(code, context))
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if self._index is not None and path in self._index:
+                self._index[path] = (time.time(), self._index[path][1])
+            self.hits += 1
+        return (
+            [Finding.from_dict(s) for s in entry["structures"]],
+            [Suggestion.from_dict(s) for s in entry["suggestions"]]
+        )
+
+    def put(self, code, detected_structures, suggestions, context=""):
+        """
+        Stores the results for the code and evicts old entries if over the size cap.
+        Caching is best effort: if the entry cannot be written (disk full, read-only
+        cache directory) it is skipped and the results are simply not cached.
+        """
+        path = self._path(self.key(code, context))
+        payload = json.dumps({
+            "structures": [dict(s) for s in detected_structures],
+            "suggestions": [dict(s) for s in suggestions]
+        })
+
+        # Write atomically so concurrent workers never read a partial entry
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            mtime = os.path.getmtime(path)
+        except OSError:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+
+        with self._lock:
+            index = self._load_index()
+            size = len(payload)
+            previous = index.get(path)
+            if previous:
+                self._total_bytes -= previous[1]
+            index[path] = (mtime, size)
+            self._total_bytes += size
+
+            if self._total_bytes > self.max_bytes:
+                self.evict()
+
+    def _load_index(self):
+        # Callers hold self._lock
+        if self._index is None:
+            self._index = {}
+            self._total_bytes = 0
+            if os.path.isdir(self.cache_dir):
+                for root, _, files in os.walk(self.cache_dir):
+                    for name in files:
+                        if not name.endswith(".json"):
+                            continue
+                        path = os.path.join(root, name)
+                        try:
+                            stat = os.stat(path)
+                        except OSError:
+                            continue
+                        self._index[path] = (stat.st_mtime, stat.st_size)
+                        self._total_bytes += stat.st_size
+        return self._index
+
+    def evict(self):
+        """Removes least-recently-used entries until the cache is below 90% of max_bytes."""
+        with self._lock:
+            index = self._load_index()
+            target = self.max_bytes * 0.9
+
+            for path, (_, size) in sorted(index.items(), key=lambda item: item[1][0]):
+                if self._total_bytes <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                del index[path]
+                self._total_bytes -= size
+
+    def clear(self):
+        """Removes every cached entry."""
+        with self._lock:
+            index = self._load_index()
+            for path in list(index):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            index.clear()
+            self._total_bytes = 0
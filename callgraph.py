@@ -0,0 +1,247 @@
+# callgraph.py
+
+import ast
+import hashlib
+import os
+
+from analyser import DataStructureAnalyzer
+from pipeline import iter_python_files
+from symbols import dotted_name, infer_type
+
+# Upper bound on propagation rounds; each round pushes types one call deeper
+MAX_ROUNDS = 20
+
+def module_name(path, root):
+    """Returns the dotted module name of a file relative to a project root."""
+    relative = os.path.splitext(os.path.relpath(path, root))[0]
+    parts = [part for part in relative.split(os.sep) if part not in ("", ".")]
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+def join_types(types):
+    """
+    Combines the argument types seen at every call site of one parameter:
+    a single agreed type is kept, any list makes it a list, anything else is unknown.
+    """
+    if len(types) == 1:
+        return next(iter(types))
+    if "list" in types:
+        return "list"
+    return None
+
+class _ParamRef:
+    """An argument that forwards the caller's own (unrebound) parameter."""
+
+    __slots__ = ("function", "name")
+
+    def __init__(self, function, name):
+        self.function = function
+        self.name = name
+
+class _CallSiteCollector(DataStructureAnalyzer):
+    """Walks one module recording its function signatures, imports and resolvable call sites."""
+
+    def __init__(self, index, module, is_package=False):
+        super().__init__(module=module)
+        self.index = index
+        self.is_package = is_package
+        self.imports = {}
+
+    # === DEFINITIONS & IMPORTS ===
+
+    def visit_FunctionDef(self, node):
+        qualname = f"{self.function}.{node.name}" if self.function else node.name
+        args = node.args
+        self.index.functions[(self.module, qualname)] = (
+            tuple(arg.arg for arg in args.posonlyargs + args.args),
+            frozenset(arg.arg for arg in args.args + args.kwonlyargs)
+        )
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            if alias.asname:
+                self.imports[alias.asname] = alias.name
+            else:
+                top = alias.name.split(".", 1)[0]
+                self.imports[top] = top
+
+    def visit_ImportFrom(self, node):
+        base = node.module or ""
+        if node.level:
+            # A module's package is one level up, but a package's __init__ is its own package
+            package = self.module.split(".") if self.module else []
+            level = node.level - 1 if self.is_package else node.level
+            package = package[:len(package) - level] if level else package
+            base = ".".join(package + ([base] if base else []))
+        for alias in node.names:
+            self.imports[alias.asname or alias.name] = f"{base}.{alias.name}" if base else alias.name
+
+    # === CALL SITES ===
+
+    def visit_Call(self, node):
+        super().visit_Call(node)
+        callee = self.resolve_callee(node.func)
+        if callee is None:
+            return
+
+        positional = []
+        for arg in node.args:
+            if isinstance(arg, ast.Starred):
+                break
+            positional.append(self.argument(arg))
+        keywords = {kw.arg: self.argument(kw.value) for kw in node.keywords if kw.arg}
+        self.index.calls.append((callee, tuple(positional), keywords))
+
+    def resolve_callee(self, func):
+        """
+        Returns ((module, qualname) candidates, bound) for a call target, or None.
+        bound is True when the first parameter is supplied implicitly (self.method()).
+        """
+        name = dotted_name(func)
+        if name is None:
+            return None
+
+        first, _, rest = name.partition(".")
+        scope = self.scope
+        if rest and first == scope.self_name and "." not in rest:
+            return ((self.module, f"{scope.parent.name}.{rest}"),), True
+
+        if first in self.imports:
+            target = self.imports[first] + (f".{rest}" if rest else "")
+            module, _, qualname = target.rpartition(".")
+            return ((module, qualname),), False
+        if rest:
+            return None
+
+        candidates = [(self.module, name)]
+        if self.function:
+            candidates.insert(0, (self.module, f"{self.function}.{name}"))
+        return tuple(candidates), False
+
+    def argument(self, expr):
+        type_ = infer_type(expr, self.scope)
+        if type_ is None and isinstance(expr, ast.Name) and expr.id in self.scope.params:
+            return _ParamRef((self.module, self.function), expr.id)
+        return type_
+
+class ProjectIndex:
+    """
+    Whole-program index of function signatures and call sites across analysed files.
+
+    solve() propagates the collection types of arguments from call sites to the
+    parameters they bind, following parameters that are passed straight on to
+    other functions, until the types stop changing. The analyser then seeds
+    unannotated parameters with these types (see parameter_types).
+    """
+
+    def __init__(self):
+        # (module, qualname) -> (positional parameter names, keyword-passable names)
+        self.functions = {}
+        # ((module, qualname) candidates, bound), positional args, keyword args
+        self.calls = []
+        # (module, qualname) -> {parameter: type}
+        self.parameters = {}
+        # path -> module name
+        self.modules = {}
+
+    def add_module(self, module, code, is_package=False):
+        """Collects definitions and call sites from one module's source (a package's __init__ if is_package)."""
+        tree = ast.parse(code)
+        _CallSiteCollector(self, module, is_package).visit(tree)
+
+    def resolve(self, candidates, bound):
+        """Returns (key, positional parameters, keyword names) for the first defined candidate."""
+        for key in candidates:
+            if key in self.functions:
+                positional, keywords = self.functions[key]
+                return key, positional[1:] if bound else positional, keywords
+            # Calling a class runs its __init__ with self bound
+            init = (key[0], f"{key[1]}.__init__")
+            if init in self.functions:
+                positional, keywords = self.functions[init]
+                return init, positional[1:], keywords
+        return None
+
+    def solve(self):
+        """Propagates argument types to parameters until they stabilise. Returns self."""
+        resolved = []
+        # (function, parameter) pairs that at least one call site passes an argument for
+        passed = set()
+        for (candidates, bound), positional, keywords in self.calls:
+            target = self.resolve(candidates, bound)
+            if target is None:
+                continue
+            key, names, keyword_names = target
+            bindings = list(zip(names, positional))
+            bindings.extend((name, arg) for name, arg in keywords.items() if name in keyword_names)
+            resolved.append((key, bindings))
+            passed.update((key, name) for name, _ in bindings)
+
+        parameters = {}
+        for _ in range(MAX_ROUNDS):
+            observed = {}
+            for key, bindings in resolved:
+                for name, arg in bindings:
+                    if isinstance(arg, _ParamRef):
+                        if (arg.function, arg.name) not in passed:
+                            arg = None  # No known caller supplies it, so its type is unknown
+                        elif arg.name in parameters.get(arg.function, ()):
+                            arg = parameters[arg.function][arg.name]
+                        else:
+                            continue  # Not known yet; may resolve in a later round
+                    observed.setdefault(key, {}).setdefault(name, set()).add(arg)
+
+            updated = {
+                key: {name: join_types(types) for name, types in params.items()}
+                for key, params in observed.items()
+            }
+            if updated == parameters:
+                break
+            parameters = updated
+
+        self.parameters = parameters
+        return self
+
+    def parameter_types(self, module, qualname):
+        """Returns {parameter: inferred type} for a function (empty if it has no known callers)."""
+        return self.parameters.get((module, qualname), {})
+
+    def module_for(self, path):
+        """Returns the module name a file was indexed under (its bare name if it was not indexed)."""
+        module = self.modules.get(os.path.abspath(path))
+        if module is None:
+            module = os.path.splitext(os.path.basename(path))[0]
+        return module
+
+    def digest(self, module):
+        """Returns a hash of the parameter types the index supplies to one module, for cache keys."""
+        entries = sorted(
+            (qualname, sorted(params.items(), key=lambda item: item[0]))
+            for (owner, qualname), params in self.parameters.items()
+            if owner == module
+        )
+        return hashlib.sha1(repr(entries).encode()).hexdigest()
+
+def build_project_index(paths):
+    """
+    Indexes every .py file under paths (see iter_python_files) and solves parameter types.
+    Module names are relative to the deepest directory containing all the files.
+    Files that cannot be read or parsed are skipped.
+    """
+    files = [os.path.abspath(path) for path in iter_python_files(paths)]
+    index = ProjectIndex()
+    if not files:
+        return index
+
+    root = os.path.commonpath([os.path.dirname(path) for path in files])
+    for path in files:
+        module = index.modules[path] = module_name(path, root)
+        try:
+            with open(path, "r") as file:
+                index.add_module(module, file.read(), os.path.basename(path) == "__init__.py")
+        except (OSError, UnicodeDecodeError, SyntaxError, ValueError, RecursionError):
+            continue
+    return index.solve()
@@ -1,34 +1,269 @@
 # cli.py
 
 import argparse
-from analyser import analyse_code
-from suggestor import Suggestor
+import sys
+from cost_model import rank_suggestions
+from pipeline import (
+    analyse_source, build_collector, calculate_sustainability_score, iter_findings, load_packs,
+    write_jsonl
+)
 from report_generator import ReportGenerator
-from usage_data import UsageDataCollector
+from cache import DEFAULT_CACHE_DIR, ResultCache
+from stats import timer
 
-def calculate_sustainability_score(suggestions):
-    """
-    Simple heuristic: base score of 100 minus 2 points per suggestion,
-    with a floor of 0.
-    """
-    return max(0, 100 - (len(suggestions) * 2))
+def print_watch_result(result, verbose=False):
+    """Prints one watch-mode result as a one-line summary (plus suggestions if verbose)."""
+    if result["error"]:
+        print(f"{result['file']}: {result['error']}")
+        return
 
-def main():
+    print(
+        f"{result['file']}: {len(result['suggestions'])} suggestion(s), "
+        f"score {result['score']}/100 "
+        f"[{result['visited']} definition(s) re-analysed, {result['reused']} reused, "
+        f"{result['elapsed'] * 1000:.1f} ms]"
+    )
+    if verbose:
+        for suggestion in result["suggestions"]:
+            print(f"  Line {suggestion['line']}: {suggestion['suggestion']}")
+
+def watch_directory(directory, interval=0.5, verbose=False, packs=()):
+    """Keeps a warm process re-analysing changed files until interrupted."""
+    from watch import Watcher
+
+    print(f"Watching {directory} for changes (Ctrl+C to stop)...")
+    try:
+        Watcher(directory, interval=interval, packs=packs).run(lambda result: print_watch_result(result, verbose))
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+
+def print_changed_findings(findings, score=False, verbose=False):
+    """Prints each suggestion on a changed line as file:line, plus per-file scores if requested."""
+    total = 0
+    for path, kind, record in findings:
+        if kind == "suggestion":
+            total += 1
+            print(f"{path}:{record['line']}: {record['suggestion']}")
+            if verbose:
+                print(f"  Explanation: {record['explanation']}")
+                print(f"  Impact: {record['impact_estimate']}")
+        elif kind == "error":
+            print(f"{path}: {record['error']}")
+        elif kind == "summary" and score:
+            print(f"{path}: Sustainability Score: {record['score']}/100")
+    print(f"{total} suggestion(s) on changed lines.")
+
+def store_findings(findings, database, label=None):
+    """Passes iter_findings items through while saving them as one run in a SQLite findings store."""
+    from findings_store import FindingsStore
+
+    store = FindingsStore(database)
+    try:
+        yield from store.tee(findings, store.start_run(label))
+    finally:
+        store.close()
+
+def columnar_exports(args):
+    """Returns (path, format) for each requested Parquet / Arrow export."""
+    return [(path, format) for path, format in ((args.export_parquet, "parquet"), (args.export_arrow, "arrow")) if path]
+
+def tee_exports(findings, args):
+    """Wraps an iter_findings stream with the requested SQLite and columnar sinks."""
+    if args.sqlite:
+        findings = store_findings(findings, args.sqlite, args.run_label)
+    exports = columnar_exports(args)
+    if exports:
+        from columnar import tee_findings
+    for path, format in exports:
+        findings = tee_findings(findings, path, format, {"input": args.input, "run_label": args.run_label})
+    return findings
+
+def build_parser():
     parser = argparse.ArgumentParser(description="Data Structure Sustainability Suggestion Tool")
-    parser.add_argument("--input", required=True, help="Path to the Python file to analyse.")
+    parser.add_argument("--input", help="Path to the Python file (or, with --format jsonl, directory) to analyse.")
     parser.add_argument("--report", help="Path to save the Markdown report.")
     parser.add_argument("--score", action="store_true", help="Display sustainability score.")
     parser.add_argument("--export-csv", help="Export usage and suggestion data to CSV.")
+    parser.add_argument("--export-jsonl", help="Export usage and suggestion data to JSON Lines.")
+    parser.add_argument("--export-parquet", help="Export usage and suggestion data to a Parquet file (needs pyarrow).")
+    parser.add_argument("--export-arrow", help="Export usage and suggestion data to an Arrow IPC file (needs pyarrow).")
     parser.add_argument("--verbose", action="store_true", help="Print suggestions in the console.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for cached analysis results.")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-analyse, bypassing the result cache.")
 
+    parser.add_argument("--format", choices=["markdown", "jsonl"], default="markdown",
+                        help="Output mode. 'jsonl' streams one JSON record per finding as files are analysed.")
+    parser.add_argument("--output", help="File to write --format jsonl records to (default: stdout).")
+    parser.add_argument("--interprocedural", action="store_true",
+                        help="Infer parameter types from call sites across the project before analysing.")
+    parser.add_argument("--project", metavar="DIR",
+                        help="Files or directory indexed for --interprocedural (default: the --input path).")
+    parser.add_argument("--pandas", action="store_true",
+                        help="Enable the pandas / NumPy detector pack.")
+    parser.add_argument("--memory", action="store_true",
+                        help="Enable the memory-footprint detector pack (__slots__, array.array, compact rows).")
+    parser.add_argument("--since", metavar="REF",
+                        help="Analyse only .py files changed since a git ref and report findings on changed lines.")
+    parser.add_argument("--sqlite", metavar="DB",
+                        help="Also record this run's findings in a SQLite database (query with findings_store.py).")
+    parser.add_argument("--run-label", help="Label stored with the run by --sqlite and columnar exports (e.g. a commit hash).")
+    parser.add_argument("--daemon", metavar="URL",
+                        help="Send the analysis to a running daemon (http://host:port or unix:///path/to/socket).")
+    parser.add_argument("--rules-file", action="append", default=[], metavar="JSON",
+                        help="Load declarative AST pattern rules from a JSON file (repeatable; see patterns.py).")
+    parser.add_argument("--watch", metavar="DIR", help="Watch a directory and re-analyse files as they change.")
+    parser.add_argument("--interval", type=float, default=0.5, help="Polling interval in seconds for --watch.")
+    parser.add_argument("--profile-run", action="store_true",
+                        help="Run a script under a tracer and attach measured call counts and sizes to suggestions.")
+    parser.add_argument("--profile-target", help="Script to run for --profile-run (default: the --input file itself).")
+    parser.add_argument("--measure-impact", action="store_true",
+                        help="Run a micro-benchmark per suggestion and report the measured speedup.")
+    parser.add_argument("--bench-size", type=int, default=1000,
+                        help="Collection size for --measure-impact when no size was observed by --profile-run.")
+    parser.add_argument("--profile-args", nargs=argparse.REMAINDER, default=[],
+                        help="Arguments passed to the profiled script (must come last).")
+    parser.add_argument("--stats", action="store_true",
+                        help="Print parse, handler, rule and output timings to stderr after the run.")
+    parser.add_argument("--stats-json", metavar="FILE", help="Write the --stats timings to FILE as JSON.")
+    return parser
+
+def emit_stats(stats, args):
+    """Prints the collected statistics as a table (to stderr) and/or writes them as JSON."""
+    if args.stats:
+        print(stats.format_table(), file=sys.stderr)
+    if args.stats_json:
+        with open(args.stats_json, "w") as f:
+            f.write(stats.to_json() + "\n")
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
 
-    with open(args.input, "r") as file:
-        code = file.read()
+    if not (args.stats or args.stats_json):
+        run(args, parser)
+        return
+
+    # Handlers and rules are only wrapped with timers while statistics are collected
+    from stats import collect
+
+    with collect() as stats:
+        run(args, parser)
+    emit_stats(stats, args)
+
+def run(args, parser):
+    """Runs the analysis requested by the parsed command-line arguments."""
+    if args.daemon:
+        # The daemon analyses one file with its packs; these modes only run locally
+        local_only = [
+            flag for flag, enabled in (
+                ("--watch", args.watch), ("--since", args.since), ("--format jsonl", args.format == "jsonl"),
+                ("--interprocedural", args.interprocedural)
+            ) if enabled
+        ]
+        if local_only:
+            parser.error(f"--daemon cannot be combined with {', '.join(local_only)}")
+
+    # Optional detector packs, imported only when enabled
+    pack_names = [name for name, enabled in (("pandas", args.pandas), ("memory", args.memory)) if enabled]
+    packs = load_packs(pack_names)
+
+    # Declarative pattern rules, compiled together into one indexed matcher (by the daemon, if used)
+    rule_specs = None
+    if args.rules_file:
+        from patterns import load_rule_files, pattern_pack
+
+        try:
+            rule_specs = load_rule_files(args.rules_file)
+            if not args.daemon:
+                packs.append(pattern_pack(rule_specs))
+        except (OSError, ValueError) as e:
+            parser.error(f"--rules-file: {e}")
 
-    detected_structures = analyse_code(code)
-    suggestor = Suggestor(detected_structures)
-    suggestions = suggestor.get_suggestions()
+    if args.watch:
+        watch_directory(args.watch, interval=args.interval, verbose=args.verbose, packs=packs)
+        return
+
+    if args.rules_file and not args.daemon:
+        import gc
+
+        # One-shot run: large rule sets leave many long-lived objects; keep them out of every later GC pass
+        gc.freeze()
+
+    if args.since and not args.input:
+        args.input = "."
+    if not args.input:
+        parser.error("--input is required unless --watch or --since is given")
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+
+    # Whole-program pass: index call sites once, then reuse it for every file
+    project_index = None
+    if args.interprocedural:
+        from callgraph import build_project_index
+
+        project_index = build_project_index([args.project or args.input])
+
+    # Changed-lines mode: whole changed files are analysed (for symbol context), findings are
+    # kept only on lines inside the diff against the ref
+    changed = None
+    if args.since:
+        from gitdiff import changed_lines
+
+        try:
+            changed = changed_lines(args.since, [args.input])
+        except ValueError as e:
+            parser.error(f"--since {args.since}: {e}")
+        if args.format != "jsonl":
+            findings = iter_findings(list(changed), cache=cache, project_index=project_index, packs=packs,
+                                     changed=changed)
+            findings = tee_exports(findings, args)
+            print_changed_findings(findings, score=args.score, verbose=args.verbose)
+            return
+
+    # Streaming mode: write records as they are produced and exit
+    if args.format == "jsonl":
+        paths = list(changed) if changed is not None else [args.input]
+        findings = iter_findings(paths, cache=cache, project_index=project_index, packs=packs, changed=changed)
+        findings = tee_exports(findings, args)
+        if args.output:
+            with open(args.output, "w") as stream:
+                write_jsonl(findings, stream)
+        else:
+            write_jsonl(findings, sys.stdout)
+        return
+
+    if args.daemon:
+        # Thin client: the warm daemon does the analysis, everything after it runs locally
+        from daemon import request_analysis
+
+        detected_structures, suggestions = request_analysis(args.daemon, args.input, pack_names, rule_specs)
+    else:
+        with open(args.input, "r") as file:
+            code = file.read()
+
+        module = project_index.module_for(args.input) if project_index is not None else None
+        detected_structures, suggestions = analyse_source(code, cache, project_index, module, packs)
+
+    # Confirm static findings with a traced run of the program
+    if args.profile_run:
+        from profiler import apply_profile, profile_script
+
+        profile = profile_script(args.input, detected_structures, args.profile_target, args.profile_args)
+        suggestions = rank_suggestions(apply_profile(suggestions, profile))
+
+    # Replace adjectives with numbers: benchmark each suggestion on this host
+    if args.measure_impact:
+        from microbench import ImpactEstimator
+
+        cache_dir = None if args.no_cache else args.cache_dir
+        estimator = ImpactEstimator(cache_dir=cache_dir, default_size=args.bench_size)
+        estimator.measure(suggestions)
+
+    if args.sqlite:
+        records = [(args.input, "structure", struct) for struct in detected_structures]
+        records.extend((args.input, "suggestion", suggestion) for suggestion in suggestions)
+        with timer("output", "sqlite"):
+            list(store_findings(records, args.sqlite, args.run_label))
 
     # Calculate score
     sustainability_score = calculate_sustainability_score(suggestions)
@@ -43,18 +278,27 @@ def main():
     # Generate report if requested
     if args.report:
         report_generator = ReportGenerator(suggestions, sustainability_score=sustainability_score)
-        report_file = report_generator.generate_markdown_report(file_name=args.report)
+        with timer("output", "markdown_report"):
+            report_file = report_generator.generate_markdown_report(file_name=args.report)
         print(f"Report saved to: {report_file}")
 
-    # Export CSV if requested
-    if args.export_csv:
-        collector = UsageDataCollector()
-        for struct in detected_structures:
-            collector.add_detected_structure(struct)
-        for suggestion in suggestions:
-            collector.add_suggestion(suggestion)
-        csv_file = collector.export_csv(file_name=args.export_csv)
-        print(f"Usage data exported to: {csv_file}")
+    # Export CSV / JSONL / columnar files if requested
+    if args.export_csv or args.export_jsonl or columnar_exports(args):
+        collector = build_collector(detected_structures, suggestions)
+        if args.export_csv:
+            with timer("output", "csv"):
+                csv_file = collector.export_csv(file_name=args.export_csv)
+            print(f"Usage data exported to: {csv_file}")
+        if args.export_jsonl:
+            with timer("output", "jsonl"):
+                jsonl_file = collector.export_jsonl(file_name=args.export_jsonl)
+            print(f"Usage data exported to: {jsonl_file}")
+        for path, format in columnar_exports(args):
+            with timer("output", format):
+                columnar_file = collector.export_columnar(
+                    path, format, {"input": args.input, "run_label": args.run_label}
+                )
+            print(f"Usage data exported to: {columnar_file}")
 
     # Display sustainability score if requested
     if args.score:
@@ -0,0 +1,144 @@
+# columnar.py
+
+import datetime
+
+from usage_data import COLUMNS, structure_row, suggestion_row
+
+# Rows per record batch (and per Parquet row group)
+BATCH_SIZE = 65536
+
+FORMATS = ("parquet", "arrow")
+
+# Low-cardinality string columns, stored dictionary-encoded (categorical in pandas)
+DICTIONARY_COLUMNS = {"file", "kind", "structure_type", "usage_context", "impact_estimate", "function"}
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Columnar export needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+def arrow_schema(with_file=False, metadata=None):
+    """Returns the typed Arrow schema for COLUMNS (plus file and kind columns for streamed findings)."""
+    pa = _require_pyarrow()
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    types = {
+        "line": pa.int32(),
+        "details": pa.string(),
+        "loop_depth": pa.int16(),
+        "executions": pa.int64(),
+        "observed_size": pa.int64(),
+        "speedup": pa.float64(),
+        "benchmark_size": pa.int64(),
+        "bytes_saved": pa.int64(),
+    }
+    names = (("file", "kind") if with_file else ()) + COLUMNS
+    fields = [pa.field(name, dictionary if name in DICTIONARY_COLUMNS else types[name]) for name in names]
+    return pa.schema(fields, metadata={key: str(value) for key, value in (metadata or {}).items()})
+
+def run_metadata(**extra):
+    """Returns the run metadata stored in the file: generation time, rule set fingerprint and any extra fields."""
+    from cache import rule_set_version
+
+    metadata = {
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "rule_set_version": rule_set_version(),
+    }
+    metadata.update({key: value for key, value in extra.items() if value is not None})
+    return metadata
+
+class ColumnarWriter:
+    """
+    Streams rows into a Parquet or Arrow IPC file in record batches of BATCH_SIZE,
+    so only one batch is held in memory. Use as a context manager, or call close().
+    """
+
+    def __init__(self, path, format="parquet", with_file=False, metadata=None):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown columnar format: {format} (expected one of {', '.join(FORMATS)})")
+        pa = _require_pyarrow()
+        self.pa = pa
+        self.path = path
+        self.schema = arrow_schema(with_file, metadata)
+        self.columns = [[] for _ in self.schema.names]
+        # Dictionary columns share one growing dictionary across batches, so IPC files can
+        # carry later batches as dictionary deltas: name -> {value: index}
+        self.dictionaries = {
+            field.name: {} for field in self.schema if pa.types.is_dictionary(field.type)
+        }
+        self.rows = 0
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self.writer = pa.ipc.new_file(path, self.schema, options=options)
+
+    def write_row(self, row):
+        for column, value in zip(self.columns, row):
+            column.append(value)
+        self.rows += 1
+        if len(self.columns[0]) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.columns[0]:
+            return
+        arrays = [
+            self.encode(field, values) if field.name in self.dictionaries else self.pa.array(values, type=field.type)
+            for values, field in zip(self.columns, self.schema)
+        ]
+        self.writer.write_batch(self.pa.record_batch(arrays, schema=self.schema))
+        self.columns = [[] for _ in self.schema.names]
+
+    def encode(self, field, values):
+        """Dictionary-encodes one batch of a column against the column's running dictionary."""
+        pa = self.pa
+        dictionary = self.dictionaries[field.name]
+        if not dictionary and all(value is None for value in values):
+            # IPC files treat growing an empty dictionary as a replacement, not a delta,
+            # so a column that is all null so far gets an unused placeholder entry
+            dictionary[""] = 0
+        indices = [
+            None if value is None else dictionary.setdefault(value, len(dictionary))
+            for value in values
+        ]
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=field.type.index_type),
+            pa.array(list(dictionary), type=field.type.value_type)
+        )
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def export_rows(rows, path, format="parquet", metadata=None):
+    """Writes COLUMNS rows (as held by UsageDataCollector) to a columnar file. Returns the path."""
+    with ColumnarWriter(path, format, metadata=run_metadata(**(metadata or {}))) as writer:
+        for row in rows:
+            writer.write_row(row)
+    return path
+
+def tee_findings(findings, path, format="parquet", metadata=None):
+    """
+    Streams iter_findings items into a columnar file with file and kind columns,
+    passing each item through so the stream can be consumed further. Summary and
+    error records are not stored.
+    """
+    with ColumnarWriter(path, format, with_file=True, metadata=run_metadata(**(metadata or {}))) as writer:
+        for item in findings:
+            file, kind, record = item
+            if kind == "structure":
+                writer.write_row((file, kind) + structure_row(record))
+            elif kind == "suggestion":
+                writer.write_row((file, kind) + suggestion_row(record))
+            yield item
@@ -0,0 +1,86 @@
+# cost_model.py
+
+# Asymptotic cost of a single occurrence of each usage pattern, as a power of n:
+# a list membership test or pop(0) is O(n), a dict.get counter update is O(1).
+# A nested-loop join's quadratic cost comes from the two loops enclosing it.
+BASE_ORDER = {
+    "membership_test": 1,
+    "append_or_pop": 1,
+    "manual_counter": 0,
+    "string_concat": 1,
+    "repeated_sort": 1,
+    "nested_loop_join": 0,
+    "insert_front": 1,
+    "repeated_lookup": 0,
+    # pandas / NumPy pack: row-wise Python work is O(n) per call, frames grown
+    # in a loop copy O(n) rows per iteration, a scalar .loc write is O(1)
+    "pandas_iterrows": 1,
+    "pandas_row_apply": 1,
+    "pandas_grow_in_loop": 1,
+    "numpy_python_loop": 1,
+    "pandas_scalar_write": 0,
+    # Memory pack: footprint findings, weighted only by how often the allocation repeats
+    "missing_slots": 0,
+    "numeric_list": 0,
+    "list_of_dicts": 0,
+}
+
+# A finding costs BASE_PENALTY points when it is at most O(n) overall, and is
+# multiplied by LOOP_WEIGHT for every extra power of n its enclosing loops add.
+BASE_PENALTY = 2
+LOOP_WEIGHT = 3
+
+def complexity_order(finding):
+    """
+    Returns the estimated power of n for a finding or suggestion:
+    its pattern's base order plus one per enclosing loop. A suggestion's own
+    base_order (set by its rule) takes precedence over BASE_ORDER.
+    """
+    base = finding.get("base_order")
+    if base is None:
+        base = BASE_ORDER.get(finding.get("usage_context"), 0)
+    return base + (finding.get("loop_depth") or 0)
+
+def format_complexity(order):
+    """Formats a power of n in big-O notation, e.g. 0 -> O(1), 2 -> O(n^2)."""
+    if order == 0:
+        return "O(1)"
+    if order == 1:
+        return "O(n)"
+    return f"O(n^{order})"
+
+def penalty(finding):
+    """Returns the score penalty for a finding, weighted by its asymptotic blow-up."""
+    return BASE_PENALTY * LOOP_WEIGHT ** max(0, complexity_order(finding) - 1)
+
+def calculate_sustainability_score(suggestions):
+    """
+    Base score of 100 minus a penalty per suggestion, with a floor of 0.
+    Suggestions outside loops cost 2 points each; each loop that multiplies
+    the cost by another factor of n multiplies the penalty by LOOP_WEIGHT.
+    """
+    return max(0, 100 - sum(penalty(suggestion) for suggestion in suggestions))
+
+def rank_suggestions(suggestions):
+    """
+    Orders suggestions so the most expensive hot spots come first (ties by line).
+    After a profiling run, suggestions whose line never executed drop to the end,
+    and measured execution counts break ties between equally expensive findings.
+    """
+    return sorted(
+        suggestions,
+        key=lambda s: (
+            s.get("executions") == 0,
+            -penalty(s),
+            -(s.get("executions") or 0),
+            -complexity_order(s),
+            s.get("line") or 0
+        )
+    )
+
+def describe_cost(suggestion):
+    """Returns a short description of a suggestion's estimated cost and location."""
+    depth = suggestion.get("loop_depth") or 0
+    location = f"in {suggestion.get('function')}" if suggestion.get("function") else "at module level"
+    loops = "not in a loop" if depth == 0 else f"inside {depth} loop{'s' if depth > 1 else ''}"
+    return f"{format_complexity(complexity_order(suggestion))} ({loops}, {location})"
@@ -0,0 +1,323 @@
+# daemon.py
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from cache import DEFAULT_CACHE_DIR, ResultCache
+from patterns import pattern_pack, specs_version
+from pipeline import analyse_source, calculate_sustainability_score, load_packs, rule_set_for
+from records import Finding, Suggestion
+from suggestor import get_rule_index
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Number of recent request latencies kept for percentile metrics
+LATENCY_WINDOW = 1000
+
+# Largest request body accepted (source text is sent inline)
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+# Number of compiled pattern-rule packs kept, keyed by their version
+PATTERN_PACK_CACHE_SIZE = 16
+
+class DaemonMetrics:
+    """Thread-safe request counters and a sliding window of request latencies."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed, error=False):
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+            self.latencies.append(elapsed)
+
+    def snapshot(self):
+        """Returns request counts, throughput since start and latency percentiles in milliseconds."""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            requests, errors = self.requests, self.errors
+        uptime = time.time() - self.started
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 3)
+
+        return {
+            "uptime_seconds": round(uptime, 3),
+            "requests": requests,
+            "errors": errors,
+            "throughput_per_second": round(requests / uptime, 3) if uptime > 0 else 0.0,
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(latencies[-1] * 1000, 3) if latencies else None,
+            },
+        }
+
+def validate_request(request):
+    """Raises ValueError unless request is an analysis request object with fields of the expected types."""
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object.")
+    for field in ("source", "path", "name"):
+        if field in request and not isinstance(request[field], str):
+            raise ValueError(f"'{field}' must be a string.")
+    packs = request.get("packs")
+    if packs is not None and not (isinstance(packs, list) and all(isinstance(name, str) for name in packs)):
+        raise ValueError("'packs' must be a list of pack names.")
+    rules = request.get("rules")
+    if rules is not None and not (isinstance(rules, list) and all(isinstance(spec, dict) for spec in rules)):
+        raise ValueError("'rules' must be a list of pattern rule objects.")
+
+class AnalysisService:
+    """
+    Keeps the analyser, rule index, detector packs and result cache warm between requests.
+    analyse() takes a request dict and returns a JSON-serialisable response dict.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.metrics = DaemonMetrics()
+        self._packs = {}
+        self._pattern_packs = OrderedDict()
+        self._lock = threading.Lock()
+        # Build the built-in rule index once up front, so the first request does not pay for it
+        get_rule_index(rule_set_for())
+
+    def packs_for(self, names):
+        key = tuple(sorted(names or ()))
+        if key not in self._packs:
+            self._packs[key] = load_packs(key)
+        return self._packs[key]
+
+    def pattern_pack_for(self, specs):
+        """Returns the pattern pack for rule specs, compiling each distinct rule set only once."""
+        version = specs_version(specs)
+        with self._lock:
+            pack = self._pattern_packs.get(version)
+            if pack is not None:
+                self._pattern_packs.move_to_end(version)
+                return pack
+        pack = pattern_pack(specs)
+        with self._lock:
+            self._pattern_packs[version] = pack
+            while len(self._pattern_packs) > PATTERN_PACK_CACHE_SIZE:
+                self._pattern_packs.popitem(last=False)
+        return pack
+
+    def analyse(self, request):
+        """
+        Analyses {"path": ...} or {"source": ..., "name": ...}, with optional "packs": [names]
+        and "rules": [pattern rule specs, as in a --rules-file].
+        Returns {"file", "score", "structures", "suggestions", "elapsed"}.
+        Raises ValueError for a malformed request.
+        """
+        validate_request(request)
+        packs = self.packs_for(request.get("packs"))
+        if request.get("rules"):
+            packs = packs + [self.pattern_pack_for(request["rules"])]
+        if "source" in request:
+            code = request["source"]
+            name = request.get("name", "<source>")
+        elif "path" in request:
+            name = request["path"]
+            with open(name, "r") as file:
+                code = file.read()
+        else:
+            raise ValueError("Request must include 'path' or 'source'.")
+
+        start = time.perf_counter()
+        detected_structures, suggestions = analyse_source(code, cache=self.cache, packs=packs)
+        return {
+            "file": name,
+            "score": calculate_sustainability_score(suggestions),
+            "structures": [struct.to_dict() for struct in detected_structures],
+            "suggestions": [suggestion.to_dict() for suggestion in suggestions],
+            "elapsed": time.perf_counter() - start,
+        }
+
+    def metrics_snapshot(self):
+        metrics = self.metrics.snapshot()
+        if self.cache is not None:
+            metrics["cache"] = {"hits": self.cache.hits, "misses": self.cache.misses}
+        return metrics
+
+# === SERVER ===
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API:
+    - POST /analyse   JSON request body, JSON findings response
+    - GET  /metrics   request counts, throughput and latency percentiles
+    - GET  /health    liveness check
+    """
+
+    server_version = "DSADaemon/1.0"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self.send_json(200, self.server.service.metrics_snapshot())
+        else:
+            self.send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/analyse":
+            self.send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+
+        service = self.server.service
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_REQUEST_BYTES:
+                raise ValueError("Request body too large.")
+            request = json.loads(self.rfile.read(length) or b"{}")
+            response = service.analyse(request)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            service.metrics.record(time.perf_counter() - start, error=True)
+            self.send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            # Keep serving: report the failure to the client and in /metrics
+            service.metrics.record(time.perf_counter() - start, error=True)
+            self.log_error("Unexpected error: %s", traceback.format_exc())
+            self.send_json(500, {"error": f"Internal error: {type(e).__name__}: {e}"})
+            return
+
+        service.metrics.record(time.perf_counter() - start)
+        self.send_json(200, response)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class UnixAnalysisServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+def create_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, verbose=False):
+    """Returns an HTTP server (localhost TCP, or a Unix socket if socket_path is given) for the service."""
+    if socket_path:
+        server = UnixAnalysisServer(socket_path, AnalysisRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), AnalysisRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+# === CLIENT ===
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+
+    def __init__(self, socket_path, timeout=30):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+def _connect(url, timeout):
+    """Opens a connection for http://host:port or unix:///path/to/socket."""
+    parts = urlsplit(url)
+    if parts.scheme == "unix":
+        return UnixHTTPConnection(parts.path, timeout=timeout)
+    if parts.scheme == "http":
+        return http.client.HTTPConnection(parts.hostname or DEFAULT_HOST, parts.port or DEFAULT_PORT, timeout=timeout)
+    raise ValueError(f"Unsupported daemon URL: {url} (use http://host:port or unix:///path)")
+
+def call_daemon(url, method, endpoint, payload=None, timeout=30):
+    """Sends one request to a running daemon and returns the decoded JSON response."""
+    connection = _connect(url, timeout)
+    try:
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        connection.request(method, endpoint, body=body, headers=headers)
+        response = connection.getresponse()
+        data = json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise ValueError(data.get("error", f"Daemon returned HTTP {response.status}"))
+    return data
+
+def request_analysis(url, path, packs=(), rules=None, timeout=30):
+    """
+    Asks a running daemon to analyse a file, with optional pattern rule specs.
+    Returns (detected_structures, suggestions) as Finding / Suggestion records,
+    like pipeline.analyse_source.
+    """
+    payload = {"path": os.path.abspath(path), "packs": list(packs)}
+    if rules:
+        payload["rules"] = list(rules)
+    response = call_daemon(url, "POST", "/analyse", payload, timeout)
+    return (
+        [Finding.from_dict(struct) for struct in response["structures"]],
+        [Suggestion.from_dict(suggestion) for suggestion in response["suggestions"]]
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a warm local analysis daemon.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Address to listen on (localhost by default).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on.")
+    parser.add_argument("--socket", help="Listen on this Unix socket path instead of TCP.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for cached analysis results.")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-analyse, bypassing the result cache.")
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    args = parser.parse_args()
+
+    service = AnalysisService(cache=None if args.no_cache else ResultCache(args.cache_dir))
+    server = create_server(service, args.host, args.port, args.socket, args.verbose)
+    where = f"unix://{args.socket}" if args.socket else f"http://{args.host}:{server.server_address[1]}"
+    print(f"Analysis daemon listening on {where} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping daemon.")
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# findings_store.py
+
+import argparse
+import datetime
+import os
+import sqlite3
+
+from usage_data import COLUMNS, structure_row, suggestion_row
+
+# Rows buffered before each executemany
+BATCH_SIZE = 5000
+
+# The aggregate queries filter on kind, so it is part of each index to keep them index-only
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    file TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    line INTEGER,
+    structure_type TEXT,
+    details TEXT,
+    usage_context TEXT,
+    impact_estimate TEXT,
+    loop_depth INTEGER,
+    function TEXT,
+    executions INTEGER,
+    observed_size INTEGER,
+    speedup REAL,
+    benchmark_size INTEGER,
+    bytes_saved INTEGER
+);
+CREATE INDEX IF NOT EXISTS findings_run ON findings (run_id, kind, usage_context);
+CREATE INDEX IF NOT EXISTS findings_file ON findings (file, kind, run_id);
+CREATE INDEX IF NOT EXISTS findings_line ON findings (file, line);
+CREATE INDEX IF NOT EXISTS findings_structure_type ON findings (structure_type, kind);
+CREATE INDEX IF NOT EXISTS findings_usage_context ON findings (usage_context, kind, file, run_id);
+"""
+
+INSERT = (
+    f"INSERT INTO findings (run_id, file, kind, {', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' * (len(COLUMNS) + 3))})"
+)
+
+def normalise_path(path, root=None):
+    """
+    Returns the form a file is stored under: relative to root (default: the working
+    directory) with / separators, so ./a.py, a.py and /abs/a.py are one file.
+    Files outside root keep their absolute path.
+    """
+    root = os.path.abspath(root or os.getcwd())
+    absolute = os.path.abspath(path)
+    try:
+        relative = os.path.relpath(absolute, root)
+    except ValueError:
+        # Different drive on Windows
+        relative = absolute
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        relative = absolute
+    return relative.replace(os.sep, "/")
+
+class FindingsStore:
+    """
+    SQLite sink for findings across runs. Records are buffered and written with
+    executemany in batches of BATCH_SIZE; call flush() (or close()) to write the rest.
+    File paths are stored (and filtered on) in normalise_path form relative to root.
+    Aggregates count suggestions by default (kind="structure" counts detections).
+    """
+
+    def __init__(self, path, root=None):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.pending = []
+        self.root = root
+        # As-given path -> stored path
+        self._paths = {}
+
+    def normalise(self, file):
+        stored = self._paths.get(file)
+        if stored is None:
+            stored = self._paths[file] = normalise_path(file, self.root)
+        return stored
+
+    def start_run(self, label=None):
+        """Records a new run and returns its run ID."""
+        started = datetime.datetime.now().isoformat(timespec="seconds")
+        with self.connection:
+            cursor = self.connection.execute("INSERT INTO runs (started, label) VALUES (?, ?)", (started, label))
+        return cursor.lastrowid
+
+    def add(self, run_id, file, kind, record):
+        """Buffers one structure or suggestion record; other kinds are ignored."""
+        if kind == "structure":
+            row = structure_row(record)
+        elif kind == "suggestion":
+            row = suggestion_row(record)
+        else:
+            return
+        self.pending.append((run_id, self.normalise(file), kind) + row)
+        if len(self.pending) >= BATCH_SIZE:
+            self.flush()
+
+    def tee(self, findings, run_id):
+        """Stores each iter_findings item while passing it through unchanged."""
+        for path, kind, record in findings:
+            self.add(run_id, path, kind, record)
+            yield path, kind, record
+        self.flush()
+
+    def flush(self):
+        if self.pending:
+            with self.connection:
+                self.connection.executemany(INSERT, self.pending)
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    # === QUERIES ===
+
+    def _aggregate(self, group, order, kind="suggestion", file=None, usage_context=None, last_runs=None, limit=None):
+        conditions, params = ["kind = ?"], [kind]
+        if file is not None:
+            conditions.append("file = ?")
+            params.append(self.normalise(file))
+        if usage_context is not None:
+            conditions.append("usage_context = ?")
+            params.append(usage_context)
+        if last_runs is not None:
+            conditions.append("run_id IN (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?)")
+            params.append(last_runs)
+        query = (
+            f"SELECT {group}, COUNT(*) FROM findings WHERE {' AND '.join(conditions)} "
+            f"GROUP BY {group} ORDER BY {order}"
+        )
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.connection.execute(query, params).fetchall()
+
+    def per_file(self, **filters):
+        """Returns [(file, count)], most findings first."""
+        return self._aggregate("file", "COUNT(*) DESC, file", **filters)
+
+    def per_rule(self, **filters):
+        """Returns [(usage_context, count)], most findings first."""
+        return self._aggregate("usage_context", "COUNT(*) DESC, usage_context", **filters)
+
+    def per_run(self, **filters):
+        """Returns [(run_id, count)] in run order (runs with no matching findings are omitted)."""
+        return self._aggregate("run_id", "run_id", **filters)
+
+def main():
+    parser = argparse.ArgumentParser(description="Query findings stored with --sqlite.")
+    parser.add_argument("database", help="SQLite database written by --sqlite.")
+    parser.add_argument("group", choices=["files", "rules", "runs"], help="Aggregate per file, per rule or per run.")
+    parser.add_argument("--file", help="Only count findings in this file.")
+    parser.add_argument("--context", help="Only count findings with this usage context (e.g. membership_test).")
+    parser.add_argument("--last", type=int, help="Only count findings from the last N runs.")
+    parser.add_argument("--kind", choices=["suggestion", "structure"], default="suggestion",
+                        help="Count suggestions (default) or detected structures.")
+    parser.add_argument("--limit", type=int, help="Show at most this many rows.")
+    args = parser.parse_args()
+
+    store = FindingsStore(args.database)
+    query = {"files": store.per_file, "rules": store.per_rule, "runs": store.per_run}[args.group]
+    for key, count in query(kind=args.kind, file=args.file, usage_context=args.context, last_runs=args.last,
+                            limit=args.limit):
+        print(f"{count}\t{key}")
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# gitdiff.py
+
+import os
+import re
+import subprocess
+
+# @@ -old_start[,old_count] +new_start[,new_count] @@
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# Diff options that override user config (diff.noprefix, diff.mnemonicPrefix), so
+# new-file paths always start with b/
+DIFF_PREFIXES = ["--src-prefix=a/", "--dst-prefix=b/"]
+
+# C-style escapes git uses in quoted paths, besides \ooo octal bytes
+PATH_ESCAPES = {"a": 7, "b": 8, "t": 9, "n": 10, "v": 11, "f": 12, "r": 13, '"': 34, "\\": 92}
+
+def run_git(args, cwd):
+    """Runs a git command and returns its stdout; raises ValueError if git is missing or the command fails."""
+    try:
+        result = subprocess.run(
+            ["git", "-c", "core.quotePath=false", *args], cwd=cwd, capture_output=True,
+            encoding="utf-8", errors="surrogateescape"
+        )
+    except OSError as e:
+        raise ValueError(f"Could not run git: {e}")
+    if result.returncode != 0:
+        raise ValueError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+def unquote_path(path):
+    """Decodes a path git wrote in double quotes (with C-style and octal escapes); others are returned as is."""
+    if len(path) < 2 or path[0] != '"' or path[-1] != '"':
+        return path
+    body = path[1:-1]
+    data = bytearray()
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char != "\\":
+            data += char.encode("utf-8", "surrogateescape")
+            i += 1
+        elif body[i + 1:i + 4].isdigit() and len(body[i + 1:i + 4]) == 3:
+            data.append(int(body[i + 1:i + 4], 8))
+            i += 4
+        else:
+            data.append(PATH_ESCAPES.get(body[i + 1:i + 2], ord("\\")))
+            i += 2
+    return data.decode("utf-8", "surrogateescape")
+
+def parse_hunks(diff):
+    """
+    Parses `git diff --unified=0` output into {path: set of changed line numbers in the new file}.
+    Paths are relative to the repository root (the diff must use the b/ prefix for new
+    files, see DIFF_PREFIXES). Pure deletions add no lines.
+    """
+    changed = {}
+    lines = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            path = unquote_path(line[4:])
+            if path == "/dev/null":
+                lines = None
+                continue
+            lines = changed.setdefault(path[2:] if path.startswith("b/") else path, set())
+        elif lines is not None and line.startswith("@@"):
+            match = HUNK_HEADER.match(line)
+            if match:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                lines.update(range(start, start + count))
+    return changed
+
+def changed_lines(ref, paths=(".",)):
+    """
+    Returns {absolute path: changed lines} for the .py files under paths that differ
+    from ref in the working tree. Untracked files map to None (every line is new).
+    """
+    paths = [os.path.abspath(path) for path in paths]
+    cwd = paths[0] if os.path.isdir(paths[0]) else os.path.dirname(paths[0])
+    root = run_git(["rev-parse", "--show-toplevel"], cwd).strip()
+
+    diff = run_git(
+        ["diff", "--no-color", "--no-ext-diff", *DIFF_PREFIXES, "--unified=0", "--diff-filter=AMR", ref, "--", *paths],
+        cwd
+    )
+    untracked = run_git(["ls-files", "--others", "--exclude-standard", "--full-name", "--", *paths], cwd)
+
+    changed = {
+        os.path.join(root, path): lines
+        for path, lines in parse_hunks(diff).items()
+        if path.endswith(".py") and lines
+    }
+    for path in map(unquote_path, untracked.splitlines()):
+        if path.endswith(".py"):
+            changed[os.path.join(root, path)] = None
+    return dict(sorted(changed.items()))
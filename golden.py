@@ -0,0 +1,170 @@
+# golden.py
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+MANIFEST_NAME = "manifest.json"
+
+# Report lines that change on every run and are left out of comparisons
+VOLATILE_PREFIXES = ("_Generated on",)
+
+def normalised_lines(path):
+    """Yields a report's lines with surrounding whitespace (and line endings) stripped and timestamps dropped."""
+    with open(path, "r") as file:
+        for line in file:
+            if not line.startswith(VOLATILE_PREFIXES):
+                yield line.strip()
+
+def report_hash(path):
+    """Returns the SHA-256 of a report's normalised lines, or None if the file does not exist."""
+    digest = hashlib.sha256()
+    try:
+        for line in normalised_lines(path):
+            digest.update(line.encode())
+            digest.update(b"\n")
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+def hash_reports(paths, workers=None):
+    """Hashes reports in parallel, returning hashes in path order."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        return [report_hash(path) for path in paths]
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(report_hash, paths, chunksize=chunksize))
+
+def diff_reports(generated, expected):
+    """Returns a unified diff of two reports' normalised lines."""
+    return "\n".join(difflib.unified_diff(
+        list(normalised_lines(expected)) if os.path.exists(expected) else [],
+        list(normalised_lines(generated)),
+        fromfile=expected,
+        tofile=generated,
+        lineterm=""
+    ))
+
+class GoldenManifest:
+    """
+    Normalised content hashes of the expected reports in one directory, stored in
+    manifest.json as {file name: {"hash", "size", "mtime_ns"}}. An entry is trusted only
+    while both the size and the mtime of its file still match; anything else (an expected
+    report edited by hand, or a fresh checkout with new mtimes) is re-hashed. A re-hash
+    that only refreshes the mtime does not by itself rewrite the manifest.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.dirty = False
+        try:
+            with open(self.path, "r") as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    def _stat(self, name):
+        try:
+            stat = os.stat(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            return None
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def stale(self, names):
+        """Returns the names whose manifest entry is missing or out of date with the file on disk."""
+        stale = []
+        for name in names:
+            entry = self.entries.get(name)
+            stat = self._stat(name)
+            if stat is None:
+                if entry is not None:
+                    del self.entries[name]
+                    self.dirty = True
+            elif entry is None or any(entry.get(key) != value for key, value in stat.items()):
+                stale.append(name)
+        return stale
+
+    def record(self, name, digest):
+        entry = {"hash": digest, **(self._stat(name) or {})}
+        previous = self.entries.get(name)
+        if previous is None or previous["hash"] != digest or previous.get("size") != entry.get("size"):
+            self.dirty = True
+        self.entries[name] = entry
+
+    def expected_hash(self, name):
+        entry = self.entries.get(name)
+        return entry["hash"] if entry is not None else None
+
+    def save(self):
+        if self.dirty:
+            with open(self.path, "w") as f:
+                json.dump(dict(sorted(self.entries.items())), f, indent=2)
+                f.write("\n")
+            self.dirty = False
+
+def check_reports(pairs, expected_dir, refresh=False, workers=None):
+    """
+    Compares generated reports with expected reports in expected_dir by normalised hash.
+    pairs are (generated path, expected file name). Generated reports and stale manifest
+    entries are hashed in parallel; a full diff is computed only for mismatches.
+    With refresh, only mismatched expected reports are overwritten and re-recorded.
+    Returns a list of (generated path, status, diff) with status PASSED, FAILED,
+    UPDATED or UNCHANGED (refresh of a matching report); diff is None unless FAILED.
+    """
+    manifest = GoldenManifest(expected_dir)
+    names = [name for _, name in pairs]
+
+    stale = manifest.stale(names)
+    generated_hashes = hash_reports([generated for generated, _ in pairs] + [
+        os.path.join(expected_dir, name) for name in stale
+    ], workers)
+    for name, digest in zip(stale, generated_hashes[len(pairs):]):
+        manifest.record(name, digest)
+
+    results = []
+    for (generated, name), digest in zip(pairs, generated_hashes):
+        expected = os.path.join(expected_dir, name)
+        matched = digest is not None and digest == manifest.expected_hash(name)
+        if not matched and digest is not None and name not in stale:
+            # Confirm against the file itself before reporting a mismatch from a trusted entry
+            actual = report_hash(expected)
+            if actual is not None and actual != manifest.expected_hash(name):
+                manifest.record(name, actual)
+            matched = actual == digest
+        if refresh:
+            if matched:
+                results.append((generated, "UNCHANGED", None))
+            else:
+                shutil.copyfile(generated, expected)
+                manifest.record(name, digest)
+                results.append((generated, "UPDATED", None))
+        elif matched:
+            results.append((generated, "PASSED", None))
+        else:
+            results.append((generated, "FAILED", diff_reports(generated, expected)))
+
+    manifest.save()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the golden-report manifest for a directory.")
+    parser.add_argument("directory", help="Directory of expected reports.")
+    parser.add_argument("--pattern", default="_expected.md", help="Suffix of the expected report files.")
+    args = parser.parse_args()
+
+    manifest = GoldenManifest(args.directory)
+    manifest.entries = {}
+    names = sorted(name for name in os.listdir(args.directory) if name.endswith(args.pattern))
+    for name, digest in zip(names, hash_reports([os.path.join(args.directory, name) for name in names])):
+        manifest.record(name, digest)
+    manifest.save()
+    print(f"Recorded {len(names)} expected report(s) in {manifest.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+# memory_rules.py
+
+import ast
+import sys
+
+from records import Finding
+from rules import SuggestionRule
+from symbols import dotted_name
+
+# Size of one object pointer in a list or tuple
+POINTER_SIZE = 8
+
+# Numeric list literals shorter than this are not worth converting
+MIN_ARRAY_ELEMENTS = 16
+
+# Bases whose subclasses cannot or need not declare __slots__
+SLOTLESS_BASES = {"NamedTuple", "Enum", "IntEnum", "Flag", "IntFlag", "TypedDict", "Protocol", "tuple", "Exception"}
+
+# array.array type codes, smallest first, with their signed integer ranges
+INT_TYPECODES = (("b", 1, 2 ** 7), ("h", 2, 2 ** 15), ("i", 4, 2 ** 31), ("q", 8, 2 ** 63))
+
+# === SIZE ESTIMATES ===
+# Estimates are measured on the running interpreter, so they track its object layout.
+
+# Bytes per entry in a dict's entry table: the hash, key and value
+DICT_ENTRY_SIZE = 3 * POINTER_SIZE
+
+class _Plain:
+    pass
+
+class _Slotted:
+    __slots__ = ()
+
+def slots_saving(attribute_count):
+    """
+    Returns the bytes saved per instance by __slots__ for a class with attribute_count attributes:
+    the instance's own __dict__ (an empty dict plus one entry per attribute) against one slot
+    pointer per attribute. The model is deterministic and grows with the attribute count.
+    """
+    attribute_count = max(1, attribute_count)
+    plain = sys.getsizeof(_Plain()) + sys.getsizeof({}) + attribute_count * DICT_ENTRY_SIZE
+    slotted = sys.getsizeof(_Slotted()) + attribute_count * POINTER_SIZE
+    return max(0, plain - slotted)
+
+def dict_row_saving(key_count):
+    """Returns the bytes saved per row by storing a dict with key_count keys as a tuple."""
+    row = {f"k{i}": None for i in range(key_count)}
+    return max(0, sys.getsizeof(row) - sys.getsizeof(tuple(row.values())))
+
+def int_typecode(values):
+    """Returns (array typecode, itemsize) for the smallest signed type that holds all values."""
+    for typecode, itemsize, limit in INT_TYPECODES:
+        if all(-limit <= value < limit for value in values):
+            return typecode, itemsize
+    return None, None
+
+def array_saving(kind, values=None):
+    """
+    Returns the bytes saved per element by storing numbers in an array.array instead of a list.
+    With literal values, small ints (which CPython caches) cost only their list pointer.
+    """
+    if kind == "float":
+        return POINTER_SIZE + sys.getsizeof(0.5) - 8
+    if values is None:
+        return POINTER_SIZE + sys.getsizeof(10 ** 6) - 8
+    _, itemsize = int_typecode(values)
+    object_bytes = sum(sys.getsizeof(value) for value in values if not -5 <= value <= 256) / len(values)
+    return int(POINTER_SIZE + object_bytes - itemsize)
+
+# === RULE CONDITIONS ===
+
+def is_class_without_slots(structure):
+    """
+    Matches classes without __slots__ that are instantiated inside loops.
+    """
+    return structure.get("usage_context") == "missing_slots"
+
+def is_numeric_list(structure):
+    """
+    Matches lists holding only numbers.
+    """
+    return structure.get("usage_context") == "numeric_list"
+
+def is_list_of_dicts(structure):
+    """
+    Matches lists of dicts that all share the same constant keys.
+    """
+    return structure.get("usage_context") == "list_of_dicts"
+
+# === RULE DEFINITIONS ===
+
+rules = [
+    SuggestionRule(
+        is_class_without_slots,
+        suggestion="Declare __slots__ (or use @dataclass(slots=True)) for classes created in bulk.",
+        explanation="Without __slots__ every instance carries a per-object __dict__; slots store attributes "
+                    "in a fixed array.",
+        impact_estimate="Cuts per-instance memory, raising how many objects fit in each worker.",
+        usage_contexts={"missing_slots"}
+    ),
+    SuggestionRule(
+        is_numeric_list,
+        suggestion="Store homogeneous numbers in array.array (or a NumPy array) instead of a list.",
+        explanation="A list holds a pointer to a separate int/float object per element; an array stores raw "
+                    "machine values contiguously.",
+        impact_estimate="Reduces memory per element and improves cache locality.",
+        usage_contexts={"numeric_list"}
+    ),
+    SuggestionRule(
+        is_list_of_dicts,
+        suggestion="Store records with fixed keys as tuples or namedtuples (or slotted dataclasses) instead of dicts.",
+        explanation="Every dict row keeps its own hash table; a tuple row is a compact fixed-size array.",
+        impact_estimate="Reduces memory per row, often by more than half.",
+        usage_contexts={"list_of_dicts"}
+    ),
+]
+
+class MemoryPack:
+    """
+    Detector pack for memory footprint:
+    - classes without __slots__ that are instantiated in loops or comprehensions
+      (matched to their definitions once the whole module has been walked)
+    - homogeneous numeric list literals and comprehensions that could be array.array
+    - lists of dicts with identical constant keys that could be tuples or namedtuples
+    Each finding carries bytes_saved, the estimated saving per instance or element.
+    """
+
+    name = "memory"
+    rules = rules
+
+    def __init__(self, analyser):
+        self.analyser = analyser
+        # class name -> (ClassDef node, enclosing function, attribute count), for classes without slots
+        self.classes = {}
+        # class name -> (max loop depth, first line) of instantiations inside loops
+        self.instantiations = {}
+
+    # === CLASSES WITHOUT __slots__ ===
+
+    def visit_ClassDef(self, node):
+        if _declares_slots(node) or any(
+            (dotted_name(base) or "").rsplit(".", 1)[-1] in SLOTLESS_BASES for base in node.bases
+        ):
+            return
+        self.classes[node.name] = (node, self.analyser.function, _attribute_count(node))
+
+    def visit_Call(self, node):
+        analyser = self.analyser
+        func = node.func
+
+        if analyser.loop_depth and isinstance(func, ast.Name):
+            depth, line = self.instantiations.get(func.id, (0, node.lineno))
+            self.instantiations[func.id] = (max(depth, analyser.loop_depth), min(line, node.lineno))
+
+        # rows.append({...}) inside a loop builds a list of dict rows
+        if (analyser.loop_depth and isinstance(func, ast.Attribute) and func.attr == "append"
+                and len(node.args) == 1):
+            keys = _constant_keys(node.args[0])
+            if keys:
+                self.record_dict_rows(node, len(keys), dotted_name(func.value))
+
+    def finalize(self):
+        """Reports each slot-less class that is instantiated inside a loop anywhere in the module."""
+        analyser = self.analyser
+        for name, (node, function, attribute_count) in self.classes.items():
+            site = self.instantiations.get(name)
+            if site is None:
+                continue
+            depth, line = site
+            analyser.data_structures.append(Finding(
+                node.lineno,
+                "Class",
+                f"{name} has no __slots__ and is instantiated inside a loop (line {line}).",
+                "missing_slots",
+                depth,
+                function,
+                name,
+                slots_saving(attribute_count)
+            ))
+
+    # === COMPACT CONTAINERS ===
+
+    def visit_List(self, node):
+        elements = node.elts
+        if len(elements) >= 2:
+            keys = _constant_keys(elements[0])
+            if keys and all(_constant_keys(element) == keys for element in elements[1:]):
+                self.record_dict_rows(node, len(keys))
+                return
+
+        if len(elements) < MIN_ARRAY_ELEMENTS:
+            return
+        values = [element.value if isinstance(element, ast.Constant) else None for element in elements]
+        if all(type(value) is int for value in values):
+            typecode, _ = int_typecode(values)
+            if typecode is not None:
+                self.record_numeric_list(node, f"array.array('{typecode}')", array_saving("int", values))
+        elif all(type(value) in (int, float) for value in values):
+            self.record_numeric_list(node, "array.array('d')", array_saving("float"))
+
+    def visit_ListComp(self, node):
+        keys = _constant_keys(node.elt)
+        if keys:
+            self.record_dict_rows(node, len(keys))
+            return
+
+        int_names = set()
+        for generator in node.generators:
+            iterable = generator.iter
+            if (isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Name)
+                    and iterable.func.id == "range" and isinstance(generator.target, ast.Name)):
+                int_names.add(generator.target.id)
+
+        try:
+            kind = _numeric_kind(node.elt, int_names)
+        except RecursionError:
+            kind = None
+        if kind == "int":
+            self.record_numeric_list(node, "array.array('q')", array_saving("int"))
+        elif kind == "float":
+            self.record_numeric_list(node, "array.array('d')", array_saving("float"))
+
+    def record_numeric_list(self, node, replacement, saving):
+        if saving <= 0:
+            return
+        self.analyser.data_structures.append(self._finding(
+            node, "List", f"Homogeneous numeric list (could be {replacement}).", "numeric_list", saving
+        ))
+
+    def record_dict_rows(self, node, key_count, target=None):
+        self.analyser.data_structures.append(self._finding(
+            node, "List of Dicts", f"List of dicts with the same {key_count} constant keys.",
+            "list_of_dicts", dict_row_saving(key_count), target
+        ))
+
+    def _finding(self, node, struct_type, details, usage_context, saving, target=None):
+        analyser = self.analyser
+        return Finding(
+            node.lineno, struct_type, details, usage_context, analyser.loop_depth, analyser.function, target, saving
+        )
+
+def _declares_slots(node):
+    """True if a class body assigns __slots__ or it is decorated with @dataclass(slots=True)."""
+    for statement in node.body:
+        targets = statement.targets if isinstance(statement, ast.Assign) else [getattr(statement, "target", None)]
+        if any(isinstance(target, ast.Name) and target.id == "__slots__" for target in targets):
+            return True
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call) and any(
+            keyword.arg == "slots" and isinstance(keyword.value, ast.Constant) and keyword.value.value is True
+            for keyword in decorator.keywords
+        ):
+            return True
+    return False
+
+def _attribute_count(node):
+    """Counts the distinct instance attributes a class sets (self.x = ... in methods, plus annotated fields)."""
+    names = {
+        statement.target.id for statement in node.body
+        if isinstance(statement, ast.AnnAssign) and isinstance(statement.target, ast.Name)
+    }
+    for method in node.body:
+        if not isinstance(method, (ast.FunctionDef, ast.AsyncFunctionDef)) or not method.args.args:
+            continue
+        self_name = method.args.args[0].arg
+        for child in ast.walk(method):
+            if (isinstance(child, ast.Attribute) and isinstance(child.ctx, ast.Store)
+                    and isinstance(child.value, ast.Name) and child.value.id == self_name):
+                names.add(child.attr)
+    return len(names)
+
+def _constant_keys(node):
+    """Returns the tuple of keys of a dict literal whose keys are all constant strings, else None."""
+    if not isinstance(node, ast.Dict) or not node.keys:
+        return None
+    keys = []
+    for key in node.keys:
+        if not isinstance(key, ast.Constant) or not isinstance(key.value, str):
+            return None
+        keys.append(key.value)
+    return tuple(sorted(keys))
+
+def _numeric_kind(expr, int_names):
+    """Returns 'int' or 'float' if expr always evaluates to that numeric type, else None."""
+    if isinstance(expr, ast.Constant):
+        if type(expr.value) is int:
+            return "int"
+        if type(expr.value) is float:
+            return "float"
+        return None
+    if isinstance(expr, ast.Name):
+        return "int" if expr.id in int_names else None
+    if isinstance(expr, ast.Call) and isinstance(expr.func, ast.Name) and expr.func.id in ("int", "float", "len"):
+        return "float" if expr.func.id == "float" else "int"
+    if isinstance(expr, ast.UnaryOp) and isinstance(expr.op, (ast.USub, ast.UAdd)):
+        return _numeric_kind(expr.operand, int_names)
+    if isinstance(expr, ast.BinOp) and isinstance(expr.op, (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod)):
+        left, right = _numeric_kind(expr.left, int_names), _numeric_kind(expr.right, int_names)
+        if left is None or right is None:
+            return None
+        if isinstance(expr.op, ast.Div) or "float" in (left, right):
+            return "float"
+        return "int"
+    return None
@@ -0,0 +1,128 @@
+# merge_shards.py
+
+import argparse
+import csv
+import datetime
+import heapq
+import json
+from itertools import groupby
+
+from report_generator import suggestion_lines
+from usage_data import COLUMNS, structure_row, suggestion_row
+
+def read_shard(path):
+    """Yields the JSON records of one shard artifact, one line at a time."""
+    with open(path, "r") as stream:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+def iter_merged(paths):
+    """
+    Yields the records of every shard in file order. Each shard is already sorted by file,
+    so a k-way merge keeps only one pending record per shard in memory.
+    """
+    return heapq.merge(*(read_shard(path) for path in paths), key=lambda record: record["file"])
+
+def summarise(paths):
+    """
+    First pass: totals from the per-file summary records.
+    The project score is the mean of the per-file scores.
+    """
+    totals = {"files": 0, "errors": 0, "structures": 0, "suggestions": 0, "score_sum": 0}
+    for record in iter_merged(paths):
+        if record["kind"] == "summary":
+            totals["files"] += 1
+            totals["structures"] += record["structures"]
+            totals["suggestions"] += record["suggestions"]
+            totals["score_sum"] += record["score"]
+        elif record["kind"] == "error":
+            totals["errors"] += 1
+    totals["score"] = round(totals.pop("score_sum") / totals["files"]) if totals["files"] else 100
+    return totals
+
+def write_outputs(paths, totals, report_path=None, csv_path=None):
+    """Second pass: streams the merged records into the Markdown report and CSV."""
+    report = open(report_path, "w") if report_path else None
+    csv_file = open(csv_path, "w", newline="") if csv_path else None
+    try:
+        writer = None
+        if csv_file:
+            writer = csv.writer(csv_file, lineterminator="\n")
+            writer.writerow(("file",) + COLUMNS)
+        if report:
+            report.write("# Data Structure Sustainability Suggestions Report\n")
+            report.write(f"_Generated on {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_\n\n")
+            report.write(f"## Sustainability Score: {totals['score']}/100\n\n")
+            report.write(
+                f"{totals['files']} file(s) analysed, {totals['suggestions']} suggestion(s), "
+                f"{totals['errors']} error(s).\n\n"
+            )
+
+        for file, records in groupby(iter_merged(paths), key=lambda record: record["file"]):
+            heading = False
+            for record in records:
+                kind = record["kind"]
+                if writer and kind in ("structure", "suggestion"):
+                    row = structure_row(record) if kind == "structure" else suggestion_row(record)
+                    writer.writerow((file,) + row)
+                if not report:
+                    continue
+                if kind == "suggestion":
+                    if not heading:
+                        report.write(f"## {file}\n\n")
+                        heading = True
+                    report.write("\n".join(suggestion_lines(record)) + "\n")
+                elif kind == "error":
+                    report.write(f"## {file}\n\n- **Error:** {record['error']}\n\n")
+    finally:
+        if report:
+            report.close()
+        if csv_file:
+            csv_file.close()
+
+def merge_shards(paths, report_path=None, csv_path=None):
+    """Combines shard artifacts (batch_run.py --shard) into one report and CSV. Returns the totals."""
+    totals = summarise(paths)
+    if report_path or csv_path:
+        write_outputs(paths, totals, report_path, csv_path)
+    return totals
+
+def store_shards(paths, database, label=None):
+    """Loads every shard's findings into a SQLite findings store as one run. Returns the run ID."""
+    from findings_store import FindingsStore
+
+    store = FindingsStore(database)
+    try:
+        run_id = store.start_run(label)
+        for record in iter_merged(paths):
+            store.add(run_id, record["file"], record["kind"], record)
+    finally:
+        store.close()
+    return run_id
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge batch_run.py --shard artifacts into one report.")
+    parser.add_argument("shards", nargs="+", help="Shard artifacts (JSON Lines) to merge.")
+    parser.add_argument("--report", help="Path to save the merged Markdown report.")
+    parser.add_argument("--export-csv", help="Path to save the merged usage CSV.")
+    parser.add_argument("--score", action="store_true", help="Display the project sustainability score.")
+    parser.add_argument("--sqlite", metavar="DB", help="Also record the merged findings as one run in a SQLite database.")
+    parser.add_argument("--run-label", help="Label stored with the run for --sqlite (e.g. a commit hash).")
+    args = parser.parse_args()
+
+    totals = merge_shards(args.shards, args.report, args.export_csv)
+    print(f"Merged {len(args.shards)} shard(s): {totals['files']} file(s), "
+          f"{totals['suggestions']} suggestion(s), {totals['errors']} error(s)")
+    if args.report:
+        print(f"Report saved to: {args.report}")
+    if args.export_csv:
+        print(f"Usage data exported to: {args.export_csv}")
+    if args.sqlite:
+        run_id = store_shards(args.shards, args.sqlite, args.run_label)
+        print(f"Findings stored as run {run_id} in: {args.sqlite}")
+    if args.score:
+        print(f"Sustainability Score: {totals['score']}/100")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# microbench.py
+
+import heapq
+import json
+import math
+import os
+import platform
+import timeit
+from collections import Counter, deque
+
+from cache import DEFAULT_CACHE_DIR
+
+DEFAULT_SIZE = 1000
+RESULTS_FILE = "microbench.json"
+
+# === MICRO-BENCHMARKS ===
+# Each benchmark takes a collection size n and returns
+# (seconds for the current structure, seconds for the suggested one).
+
+def _best(stmt, setup="pass", namespace=None, number=1, repeat=5):
+    timer = timeit.Timer(stmt, setup=setup, globals=namespace)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def bench_membership(n):
+    """`x in list` against `x in set` for a probe in the middle of the collection."""
+    items = list(range(n))
+    namespace = {"items_list": items, "items_set": set(items), "probe": n // 2}
+    number = max(10, 200_000 // n)
+    return (
+        _best("probe in items_list", namespace=namespace, number=number),
+        _best("probe in items_set", namespace=namespace, number=number)
+    )
+
+def bench_counter(n):
+    """A dict.get(k, 0) + 1 counting loop against collections.Counter."""
+    namespace = {"items": [i % 64 for i in range(n)], "Counter": Counter}
+    number = max(1, 100_000 // n)
+    current = _best(
+        "counts = {}\nfor key in items:\n    counts[key] = counts.get(key, 0) + 1",
+        namespace=namespace, number=number
+    )
+    return current, _best("Counter(items)", namespace=namespace, number=number)
+
+def bench_queue(n):
+    """Draining a queue of n items with list.pop(0) against deque.popleft()."""
+    namespace = {"deque": deque, "n": n}
+    return (
+        _best("while queue:\n    queue.pop(0)", setup="queue = list(range(n))", namespace=namespace),
+        _best("while queue:\n    queue.popleft()", setup="queue = deque(range(n))", namespace=namespace)
+    )
+
+def bench_concat(n):
+    """Building a string from n pieces with += against ''.join()."""
+    namespace = {"pieces": [str(i) for i in range(n)]}
+    number = max(1, 100_000 // n)
+    return (
+        _best("text = ''\nfor piece in pieces:\n    text += piece", namespace=namespace, number=number),
+        _best("''.join(pieces)", namespace=namespace, number=number)
+    )
+
+def bench_sort(n):
+    """Taking the smallest of n items n times with min() over a list against heapq.heappop()."""
+    namespace = {"heapq": heapq, "n": n}
+    return (
+        _best("while items:\n    items.remove(min(items))", setup="items = list(range(n, 0, -1))", namespace=namespace),
+        _best("while items:\n    heapq.heappop(items)",
+              setup="items = list(range(n, 0, -1))\nheapq.heapify(items)", namespace=namespace)
+    )
+
+def bench_join(n):
+    """Matching two lists of n keys with nested loops against a dict index."""
+    namespace = {"left": list(range(n)), "right": list(range(n // 2, n + n // 2))}
+    return (
+        _best("[(a, b) for a in left for b in right if a == b]", namespace=namespace, repeat=3),
+        _best("index = {b: b for b in right}\n[(a, index[a]) for a in left if a in index]", namespace=namespace)
+    )
+
+def bench_insert_front(n):
+    """Prepending n items with list.insert(0, x) against deque.appendleft()."""
+    namespace = {"deque": deque, "n": n}
+    return (
+        _best("items = []\nfor i in range(n):\n    items.insert(0, i)", namespace=namespace),
+        _best("items = deque()\nfor i in range(n):\n    items.appendleft(i)", namespace=namespace)
+    )
+
+def bench_lookup(n):
+    """Calling len() on every iteration of a while loop against a hoisted local."""
+    namespace = {"items": list(range(n))}
+    number = max(1, 100_000 // n)
+    return (
+        _best("i = 0\nwhile i < len(items):\n    i += 1", namespace=namespace, number=number),
+        _best("i = 0\nsize = len(items)\nwhile i < size:\n    i += 1", namespace=namespace, number=number)
+    )
+
+BENCHMARKS = {
+    "membership": bench_membership,
+    "counter": bench_counter,
+    "queue": bench_queue,
+    "concat": bench_concat,
+    "sort": bench_sort,
+    "join": bench_join,
+    "insert_front": bench_insert_front,
+    "lookup": bench_lookup,
+}
+
+# Benchmarks whose current side is quadratic are capped so they finish in well under a second
+MAX_SIZES = {
+    "queue": 16384,
+    "sort": 4096,
+    "join": 4096,
+    "insert_front": 16384,
+}
+
+def size_bucket(size):
+    """Rounds a collection size up to a power of two (minimum 16) so results can be reused."""
+    return max(16, 2 ** math.ceil(math.log2(max(1, size))))
+
+class ImpactEstimator:
+    """
+    Measures the speedup of each suggestion with the micro-benchmark of the rule that produced it
+    (the suggestion's benchmark field). Results are cached per host, Python version, benchmark
+    and size bucket in a JSON file.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, default_size=DEFAULT_SIZE):
+        self.cache_path = os.path.join(cache_dir, RESULTS_FILE) if cache_dir else None
+        self.default_size = default_size
+        self.host_key = f"{platform.node()}|{platform.python_implementation()}-{platform.python_version()}"
+        self.results = self._load()
+        self._dirty = False
+
+    def _load(self):
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Writes new results back to the per-host cache file."""
+        if not self.cache_path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path, "w") as f:
+            json.dump(self.results, f, indent=2, sort_keys=True)
+        self._dirty = False
+
+    def speedup(self, benchmark, size):
+        """Returns current_time / suggested_time for a benchmark at a size bucket."""
+        key = f"{self.host_key}|{benchmark}|{size}"
+        if key not in self.results:
+            current, suggested = BENCHMARKS[benchmark](size)
+            self.results[key] = current / suggested if suggested > 0 else None
+            self._dirty = True
+        return self.results[key]
+
+    def measure(self, suggestions):
+        """
+        Attaches speedup and benchmark_size to each suggestion that has a benchmark.
+        The observed collection size from a profiling run is used when available.
+        """
+        for suggestion in suggestions:
+            benchmark = suggestion.get("benchmark")
+            if benchmark not in BENCHMARKS:
+                continue
+            size = size_bucket(suggestion.get("observed_size") or self.default_size)
+            size = min(size, MAX_SIZES.get(benchmark, size))
+            suggestion["speedup"] = self.speedup(benchmark, size)
+            suggestion["benchmark_size"] = size
+        self.save()
+        return suggestions
@@ -0,0 +1,284 @@
+# pandas_rules.py
+
+import ast
+
+from rules import SuggestionRule
+from symbols import dotted_name
+
+# pandas / NumPy functions, by module, whose result type is known
+PANDAS_CONSTRUCTORS = {
+    "DataFrame": "DataFrame",
+    "read_csv": "DataFrame",
+    "read_parquet": "DataFrame",
+    "read_excel": "DataFrame",
+    "read_json": "DataFrame",
+    "read_sql": "DataFrame",
+    "read_table": "DataFrame",
+    "concat": "DataFrame",
+    "merge": "DataFrame",
+    "Series": "Series",
+}
+NUMPY_CONSTRUCTORS = {
+    "array", "asarray", "zeros", "ones", "empty", "full", "arange", "linspace",
+    "zeros_like", "ones_like", "empty_like", "full_like", "concatenate", "stack",
+}
+
+# DataFrame / Series methods that return a NumPy array
+ARRAY_METHODS = {"to_numpy"}
+ARRAY_ATTRIBUTES = {"values"}
+
+PANDAS_TYPES = {"DataFrame", "Series"}
+
+# Indexers whose scalar writes go through pandas' indexing machinery on every call
+INDEXERS = {"loc", "iloc", "at", "iat"}
+
+# === RULE CONDITIONS ===
+
+def is_row_iteration(structure):
+    """
+    Matches DataFrame.iterrows() / itertuples() calls.
+    """
+    return structure.get("usage_context") == "pandas_iterrows"
+
+def is_row_wise_apply(structure):
+    """
+    Matches DataFrame.apply(..., axis=1).
+    """
+    return structure.get("usage_context") == "pandas_row_apply"
+
+def is_frame_grown_in_loop(structure):
+    """
+    Matches DataFrame.append / pd.concat inside a loop.
+    """
+    return structure.get("usage_context") == "pandas_grow_in_loop"
+
+def is_python_loop_over_array(structure):
+    """
+    Matches Python for loops over the elements of a NumPy array.
+    """
+    return structure.get("usage_context") == "numpy_python_loop"
+
+def is_scalar_write_in_loop(structure):
+    """
+    Matches .loc / .iloc / .at / .iat scalar writes inside a loop.
+    """
+    return structure.get("usage_context") == "pandas_scalar_write"
+
+# === RULE DEFINITIONS ===
+
+rules = [
+    SuggestionRule(
+        is_row_iteration,
+        suggestion="Replace iterrows()/itertuples() with vectorised column operations.",
+        explanation="Row iteration boxes every row into Python objects; column arithmetic, np.where "
+                    "and merges run in compiled code over whole columns.",
+        impact_estimate="Typically 10-100x faster on large frames.",
+        usage_contexts={"pandas_iterrows"}
+    ),
+    SuggestionRule(
+        is_row_wise_apply,
+        suggestion="Replace apply(axis=1) with vectorised column expressions.",
+        explanation="apply(axis=1) calls a Python function once per row and builds a Series for each.",
+        impact_estimate="Typically 10-100x faster on large frames.",
+        usage_contexts={"pandas_row_apply"}
+    ),
+    SuggestionRule(
+        is_frame_grown_in_loop,
+        suggestion="Collect rows or frames in a list and build the DataFrame once with pd.DataFrame(rows) or pd.concat(frames).",
+        explanation="Appending or concatenating inside a loop copies everything accumulated so far on every "
+                    "iteration, making the loop O(n^2).",
+        impact_estimate="Turns quadratic copying into a single linear build.",
+        usage_contexts={"pandas_grow_in_loop"}
+    ),
+    SuggestionRule(
+        is_python_loop_over_array,
+        suggestion="Use NumPy vectorised operations or ufuncs instead of looping over array elements.",
+        explanation="Each element access in a Python loop creates a Python scalar; ufuncs process the whole array in C.",
+        impact_estimate="Often 10-100x faster and avoids a Python object per element.",
+        usage_contexts={"numpy_python_loop"}
+    ),
+    SuggestionRule(
+        is_scalar_write_in_loop,
+        suggestion="Compute the column in one vectorised assignment (or build a list and assign it once) "
+                   "instead of .loc/.at writes in a loop.",
+        explanation="Every scalar .loc/.at write goes through pandas' indexing machinery and may copy data.",
+        impact_estimate="Removes per-element indexing overhead from the loop.",
+        usage_contexts={"pandas_scalar_write"}
+    ),
+]
+
+class PandasPack:
+    """
+    Detector pack for the costliest pandas and NumPy patterns: Python-level row
+    iteration (iterrows/itertuples, apply(axis=1)), growing frames inside loops
+    (DataFrame.append / pd.concat), Python loops over ndarray elements and
+    scalar .loc/.at writes inside loops.
+
+    Names bound to pandas or NumPy constructor results are typed as DataFrame,
+    Series or ndarray in the analyser's symbol table, so a DataFrame's .append()
+    is not mistaken for a list being used as a queue.
+    """
+
+    name = "pandas"
+    rules = rules
+
+    def __init__(self, analyser):
+        self.analyser = analyser
+        # Names that refer to the pandas / numpy modules, with the conventional aliases
+        self.pandas_names = {"pd", "pandas"}
+        self.numpy_names = {"np", "numpy"}
+        # Names imported directly from pandas / numpy (from pandas import DataFrame)
+        self.imported = {}
+
+    # === TYPE TRACKING ===
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            if alias.name == "pandas":
+                self.pandas_names.add(alias.asname or alias.name)
+            elif alias.name == "numpy":
+                self.numpy_names.add(alias.asname or alias.name)
+
+    def visit_ImportFrom(self, node):
+        if node.module in ("pandas", "numpy"):
+            for alias in node.names:
+                self.imported[alias.asname or alias.name] = (node.module, alias.name)
+
+    def library_function(self, func):
+        """Returns ('pandas' | 'numpy', function name) for a call target such as pd.read_csv, else None."""
+        if isinstance(func, ast.Name):
+            return self.imported.get(func.id)
+        name = dotted_name(func)
+        if name is None:
+            return None
+        root, _, rest = name.partition(".")
+        if root in self.pandas_names:
+            return "pandas", rest
+        if root in self.numpy_names:
+            return "numpy", rest
+        return None
+
+    def value_type(self, expr):
+        """Returns DataFrame, Series or ndarray for expressions known to produce them, else the inferred type."""
+        analyser = self.analyser
+        if isinstance(expr, ast.Call):
+            library = self.library_function(expr.func)
+            if library is not None:
+                module, function = library
+                if module == "pandas":
+                    return PANDAS_CONSTRUCTORS.get(function)
+                if function in NUMPY_CONSTRUCTORS or function.startswith("random."):
+                    return "ndarray"
+                return None
+            func = expr.func
+            if isinstance(func, ast.Attribute):
+                receiver = self.value_type(func.value)
+                if receiver in PANDAS_TYPES and func.attr in ARRAY_METHODS:
+                    return "ndarray"
+                if receiver in PANDAS_TYPES and func.attr in ("copy", "append"):
+                    return receiver
+        elif isinstance(expr, ast.Attribute) and expr.attr in ARRAY_ATTRIBUTES:
+            if self.value_type(expr.value) in PANDAS_TYPES:
+                return "ndarray"
+        name = dotted_name(expr)
+        return analyser.scope.lookup(name) if name is not None else None
+
+    def visit_Assign(self, node):
+        """Types names bound to pandas / NumPy results and detects frames grown with df = df.append(...)."""
+        analyser = self.analyser
+        value = node.value
+        value_type = self.value_type(value)
+
+        # df = df.append(row): list.append returns None, so rebinding the receiver means a DataFrame
+        if isinstance(value, ast.Call) and isinstance(value.func, ast.Attribute) and value.func.attr == "append":
+            receiver = dotted_name(value.func.value)
+            if receiver is not None and any(dotted_name(target) == receiver for target in node.targets):
+                value_type = "DataFrame"
+                analyser.scope.bind(receiver, value_type)
+
+        if value_type in PANDAS_TYPES or value_type == "ndarray":
+            for target in node.targets:
+                analyser.bind_target(target, value_type)
+
+        # Detect scalar writes through .loc / .at inside loops
+        if analyser.loop_depth:
+            for target in node.targets:
+                if (isinstance(target, ast.Subscript) and isinstance(target.value, ast.Attribute)
+                        and target.value.attr in INDEXERS):
+                    analyser.record_structure(
+                        node,
+                        "DataFrame",
+                        f".{target.value.attr}[] scalar write inside a loop.",
+                        usage_context="pandas_scalar_write",
+                        target=dotted_name(target.value.value)
+                    )
+
+    # === PATTERN DETECTION ===
+
+    def visit_Call(self, node):
+        """Detects iterrows/itertuples, row-wise apply, and frames grown inside loops."""
+        analyser = self.analyser
+        func = node.func
+        library = self.library_function(func)
+
+        if library == ("pandas", "concat") and analyser.loop_depth:
+            analyser.record_structure(
+                node,
+                "DataFrame",
+                "pd.concat inside a loop copies every frame accumulated so far.",
+                usage_context="pandas_grow_in_loop"
+            )
+            return
+
+        if not isinstance(func, ast.Attribute):
+            return
+        receiver = dotted_name(func.value)
+
+        if func.attr in ("iterrows", "itertuples") and not node.args:
+            analyser.record_structure(
+                node,
+                "DataFrame",
+                f"{func.attr}() iterates over rows in Python.",
+                usage_context="pandas_iterrows",
+                target=receiver
+            )
+        elif func.attr == "apply" and any(
+            keyword.arg == "axis" and isinstance(keyword.value, ast.Constant) and keyword.value.value in (1, "columns")
+            for keyword in node.keywords
+        ):
+            analyser.record_structure(
+                node,
+                "DataFrame",
+                "apply(axis=1) calls a Python function once per row.",
+                usage_context="pandas_row_apply",
+                target=receiver
+            )
+        elif func.attr == "append" and analyser.loop_depth and self.value_type(func.value) in PANDAS_TYPES:
+            analyser.record_structure(
+                node,
+                "DataFrame",
+                "DataFrame.append inside a loop copies the whole frame on every call.",
+                usage_context="pandas_grow_in_loop",
+                target=receiver
+            )
+
+    def visit_For(self, node):
+        """Detects Python for loops over the elements (or indices) of a NumPy array."""
+        iterable = node.iter
+        # for i in range(len(arr))
+        if (isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Name) and iterable.func.id == "range"
+                and len(iterable.args) == 1 and isinstance(iterable.args[0], ast.Call)
+                and isinstance(iterable.args[0].func, ast.Name) and iterable.args[0].func.id == "len"
+                and iterable.args[0].args):
+            iterable = iterable.args[0].args[0]
+
+        if self.value_type(iterable) == "ndarray":
+            self.analyser.record_structure(
+                node,
+                "NumPy Array",
+                "Python loop over NumPy array elements.",
+                usage_context="numpy_python_loop",
+                target=dotted_name(iterable)
+            )
+
+    visit_AsyncFor = visit_For
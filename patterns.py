@@ -0,0 +1,332 @@
+# patterns.py
+
+import ast
+import hashlib
+import json
+import re
+
+from rules import SuggestionRule
+
+# $NAME matches any one node (binding it), $_ matches anything without binding,
+# $$NAME / $$_ matches zero or more items of a list field (call arguments, statements, ...)
+PLACEHOLDER = re.compile(r"(\$\$|\$)([A-Za-z_][A-Za-z0-9_]*)")
+SINGLE_PREFIX = "__pat_"
+MULTI_PREFIX = "__pats_"
+
+# Fields that never affect whether code matches
+IGNORED_FIELDS = {"ctx", "type_comment", "kind"}
+
+# === PATTERN COMPILATION ===
+
+def parse_pattern(source):
+    """
+    Parses pattern source with $ placeholders into a single AST node:
+    an expression for expression patterns, otherwise the one statement.
+    """
+    code = PLACEHOLDER.sub(
+        lambda match: (MULTI_PREFIX if match.group(1) == "$$" else SINGLE_PREFIX) + match.group(2), source
+    )
+    try:
+        body = ast.parse(code).body
+    except SyntaxError as e:
+        raise ValueError(f"Invalid pattern {source!r}: {e}")
+    if len(body) != 1:
+        raise ValueError(f"Pattern {source!r} must be a single expression or statement")
+    node = body[0]
+    if isinstance(node, ast.Expr):
+        node = node.value
+    if _placeholder(node) is not None:
+        raise ValueError(f"Pattern {source!r} must not be a bare placeholder")
+    return node
+
+def _placeholder(node):
+    """Returns ('one' | 'many', name) if node is a placeholder (a Name, or a statement wrapping one)."""
+    if isinstance(node, ast.Expr):
+        node = node.value
+    if isinstance(node, ast.Name):
+        if node.id.startswith(MULTI_PREFIX):
+            return "many", node.id[len(MULTI_PREFIX):]
+        if node.id.startswith(SINGLE_PREFIX):
+            return "one", node.id[len(SINGLE_PREFIX):]
+    return None
+
+def _attr_placeholder(value):
+    """Returns the placeholder name for an attribute written as .$NAME, else None."""
+    if isinstance(value, str) and value.startswith(SINGLE_PREFIX):
+        return value[len(SINGLE_PREFIX):]
+    return None
+
+def _bind(bindings, name, value):
+    """
+    Binds a placeholder, or checks a repeated placeholder matches the same code
+    (compared as source, so `$X = f($X)` matches whatever the load/store context).
+    """
+    if name == "_":
+        return True
+    if name not in bindings:
+        bindings[name] = value
+        return True
+    bound = bindings[name]
+    if isinstance(value, ast.AST) and isinstance(bound, ast.AST):
+        return ast.unparse(value) == ast.unparse(bound)
+    if isinstance(value, list) and isinstance(bound, list):
+        return [ast.unparse(item) for item in value] == [ast.unparse(item) for item in bound]
+    return value == bound
+
+def compile_node(pattern):
+    """
+    Compiles a pattern node into a predicate (node, bindings) -> bool.
+    Field comparisons are resolved once here, so matching does no pattern introspection.
+    """
+    placeholder = _placeholder(pattern)
+    if placeholder is not None:
+        _, name = placeholder
+        return lambda node, bindings: _bind(bindings, name, node)
+
+    node_class = pattern.__class__
+    checks = []
+    for field in pattern._fields:
+        if field in IGNORED_FIELDS:
+            continue
+        value = getattr(pattern, field, None)
+        if isinstance(value, list):
+            checks.append((field, _compile_list(value)))
+        elif isinstance(value, ast.AST):
+            checks.append((field, compile_node(value)))
+        elif _attr_placeholder(value) is not None:
+            name = _attr_placeholder(value)
+            checks.append((field, lambda actual, bindings, name=name: _bind(bindings, name, actual)))
+        else:
+            checks.append((field, lambda actual, bindings, expected=value: (
+                actual == expected and type(actual) is type(expected)
+            )))
+
+    def match(node, bindings):
+        if node.__class__ is not node_class:
+            return False
+        for field, check in checks:
+            if not check(getattr(node, field, None), bindings):
+                return False
+        return True
+
+    return match
+
+def _compile_list(patterns):
+    """Compiles a list field; at most one $$ placeholder may absorb a run of items."""
+    variadic = [i for i, item in enumerate(patterns) if _placeholder(item) and _placeholder(item)[0] == "many"]
+    if len(variadic) > 1:
+        raise ValueError("A list in a pattern may contain at most one $$ placeholder")
+
+    if not variadic:
+        item_checks = [compile_node(item) if isinstance(item, ast.AST) else _equals(item) for item in patterns]
+
+        def match_exact(values, bindings):
+            if values is None or len(values) != len(item_checks):
+                return False
+            return all(check(value, bindings) for check, value in zip(item_checks, values))
+
+        return match_exact
+
+    split = variadic[0]
+    name = _placeholder(patterns[split])[1]
+    prefix = [compile_node(item) for item in patterns[:split]]
+    suffix = [compile_node(item) for item in patterns[split + 1:]]
+
+    def match_variadic(values, bindings):
+        if values is None or len(values) < len(prefix) + len(suffix):
+            return False
+        end = len(values) - len(suffix)
+        if not all(check(value, bindings) for check, value in zip(prefix, values)):
+            return False
+        if not all(check(value, bindings) for check, value in zip(suffix, values[end:])):
+            return False
+        return _bind(bindings, name, list(values[len(prefix):end]))
+
+    return match_variadic
+
+def _equals(expected):
+    return lambda actual, bindings: actual == expected
+
+def discriminator(node):
+    """
+    Returns a cheap secondary key for a node (callee name, attribute, operator), or None.
+    Patterns are indexed by node type and this key, so each node is checked only against
+    patterns that agree on both.
+    """
+    node_class = node.__class__
+    if node_class is ast.Call:
+        func = node.func
+        if func.__class__ is ast.Attribute:
+            return "." + func.attr
+        if func.__class__ is ast.Name:
+            return func.id
+        return None
+    if node_class is ast.Attribute:
+        return node.attr
+    if node_class is ast.Name:
+        return node.id
+    if node_class in (ast.BinOp, ast.AugAssign, ast.BoolOp, ast.UnaryOp):
+        return node.op.__class__.__name__
+    if node_class is ast.Compare:
+        return tuple(op.__class__.__name__ for op in node.ops)
+    return None
+
+def _pattern_discriminator(pattern):
+    """The discriminator a pattern requires of matching nodes, or None if any value may match."""
+    node_class = pattern.__class__
+    if node_class is ast.Call:
+        func = pattern.func
+        if func.__class__ is ast.Attribute and _attr_placeholder(func.attr) is None:
+            return "." + func.attr
+        if func.__class__ is ast.Name and _placeholder(func) is None:
+            return func.id
+        return None
+    if node_class is ast.Attribute:
+        return None if _attr_placeholder(pattern.attr) is not None else pattern.attr
+    if node_class is ast.Name:
+        return pattern.id
+    return discriminator(pattern)
+
+class PatternRule:
+    """One declarative rule: a compiled pattern plus how to report and suggest on a match."""
+
+    __slots__ = ("id", "source", "pattern", "match", "structure_type", "details", "in_loop", "usage_context", "rule")
+
+    def __init__(self, spec):
+        try:
+            self.id = spec["id"]
+            self.source = spec["pattern"]
+            suggestion = spec["suggestion"]
+        except KeyError as e:
+            raise ValueError(f"Pattern rule is missing {e.args[0]!r}: {spec}")
+        self.pattern = parse_pattern(self.source)
+        self.match = compile_node(self.pattern)
+        self.structure_type = spec.get("type", "Pattern")
+        self.details = spec.get("details", f"Matches pattern {self.source}")
+        self.in_loop = bool(spec.get("in_loop", False))
+        self.usage_context = f"pattern:{self.id}"
+
+        usage_context = self.usage_context
+
+        def condition(structure):
+            return structure.get("usage_context") == usage_context
+
+        condition.__name__ = f"pattern_{self.id}"
+        self.rule = SuggestionRule(
+            condition,
+            suggestion=suggestion,
+            explanation=spec.get("explanation", ""),
+            impact_estimate=spec.get("impact", ""),
+            usage_contexts={usage_context},
+            base_order=int(spec["order"]) if "order" in spec else None
+        )
+
+    def describe(self, bindings):
+        """Formats details, substituting {NAME} with the source of each bound placeholder."""
+        values = {}
+        for name, value in bindings.items():
+            if isinstance(value, list):
+                values[name] = ", ".join(ast.unparse(item) for item in value)
+            elif isinstance(value, ast.AST):
+                values[name] = ast.unparse(value)
+            else:
+                values[name] = str(value)
+        try:
+            return self.details.format(**values)
+        except (KeyError, IndexError, ValueError):
+            return self.details
+
+class PatternIndex:
+    """
+    All pattern rules compiled into one matcher, indexed by node type and then by
+    discriminator (see discriminator()), so adding rules for other calls, attributes
+    or node types does not slow down matching of unrelated nodes.
+    """
+
+    def __init__(self, pattern_rules):
+        self.rules = list(pattern_rules)
+        # node class -> ({discriminator: [rules]}, [rules matching any discriminator])
+        self.by_type = {}
+        for rule in self.rules:
+            keyed, general = self.by_type.setdefault(rule.pattern.__class__, ({}, []))
+            key = _pattern_discriminator(rule.pattern)
+            if key is None:
+                general.append(rule)
+            else:
+                keyed.setdefault(key, []).append(rule)
+
+    def node_classes(self):
+        return list(self.by_type)
+
+    def match(self, node):
+        """Yields (rule, bindings) for each rule whose pattern matches node."""
+        entry = self.by_type.get(node.__class__)
+        if entry is None:
+            return
+        keyed, general = entry
+        candidates = keyed.get(discriminator(node), ()) if keyed else ()
+        for rules in (candidates, general):
+            for rule in rules:
+                bindings = {}
+                if rule.match(node, bindings):
+                    yield rule, bindings
+
+# === RULE FILES & DETECTOR PACK ===
+
+def load_rule_specs(path):
+    """Reads pattern rules from a JSON file: a list of rule objects, or {"rules": [...]}."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    specs = data.get("rules", []) if isinstance(data, dict) else data
+    if not isinstance(specs, list):
+        raise ValueError(f"{path}: expected a list of rules")
+    return specs
+
+def load_rule_files(paths):
+    """Reads and concatenates the pattern rules from every given JSON file."""
+    specs = []
+    for path in paths:
+        specs.extend(load_rule_specs(path))
+    return specs
+
+def specs_version(specs):
+    """Returns a stable hash of rule specs: the version of the pack built from them."""
+    return hashlib.sha256(json.dumps(specs, sort_keys=True).encode()).hexdigest()
+
+def pattern_pack(specs, name="patterns"):
+    """
+    Returns a detector pack class that reports every match of the given rule specs.
+    Each spec has id, pattern and suggestion, and optionally explanation, impact,
+    type, details (with {NAME} placeholders), in_loop and order (base complexity
+    as a power of n, for the cost model).
+    """
+    pattern_rules = [PatternRule(spec) for spec in specs]
+    ids = [rule.id for rule in pattern_rules]
+    duplicates = {rule_id for rule_id in ids if ids.count(rule_id) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate pattern rule id(s): {', '.join(sorted(duplicates))}")
+    index = PatternIndex(pattern_rules)
+
+    def visit_pattern(self, node):
+        analyser = self.analyser
+        for rule, bindings in index.match(node):
+            if rule.in_loop and not analyser.loop_depth:
+                continue
+            analyser.record_structure(node, rule.structure_type, rule.describe(bindings), usage_context=rule.usage_context)
+
+    namespace = {
+        "__doc__": "Detector pack generated from declarative pattern rules (see patterns.py).",
+        "__init__": lambda self, analyser: setattr(self, "analyser", analyser),
+        "name": name,
+        "rules": [rule.rule for rule in pattern_rules],
+        "index": index,
+        # Part of the cache key, so editing a rules file invalidates cached results
+        "version": specs_version(specs),
+    }
+    for node_class in index.node_classes():
+        namespace[f"visit_{node_class.__name__}"] = visit_pattern
+    return type("PatternPack", (), namespace)
+
+def load_pattern_pack(paths):
+    """Builds one pattern pack from the rules in every given JSON file."""
+    return pattern_pack(load_rule_files(paths))
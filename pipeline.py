@@ -0,0 +1,141 @@
+# pipeline.py
+
+import importlib
+import json
+import os
+
+from analyser import analyse_code
+from cache import packs_version
+from cost_model import calculate_sustainability_score, rank_suggestions
+from rules import rules
+from stats import active_stats
+from suggestor import Suggestor
+from usage_data import UsageDataCollector
+
+# Detector packs by name: (module, class), imported only when enabled
+PACKS = {
+    "pandas": ("pandas_rules", "PandasPack"),
+    "memory": ("memory_rules", "MemoryPack"),
+}
+
+def load_packs(names):
+    """Imports and returns the detector pack classes for the given pack names."""
+    packs = []
+    for name in names:
+        if name not in PACKS:
+            raise ValueError(f"Unknown detector pack: {name}")
+        module_name, class_name = PACKS[name]
+        packs.append(getattr(importlib.import_module(module_name), class_name))
+    return packs
+
+def rule_set_for(packs=()):
+    """Returns the built-in rules followed by the rules of each enabled detector pack."""
+    if not packs:
+        return rules
+    return rules + [rule for pack in packs for rule in pack.rules]
+
+def analyse_source(code, cache=None, project_index=None, module=None, packs=()):
+    """
+    Runs the analyser and the suggestion rules over a block of Python code.
+    Returns a (detected_structures, suggestions) tuple, with suggestions ranked
+    by the cost model. If a ResultCache is given, unchanged code is served from it.
+    With a callgraph.ProjectIndex, parameter types come from the project's call sites.
+    packs are detector pack classes (e.g. pandas_rules.PandasPack) to enable.
+    """
+    context = project_index.digest(module) if project_index is not None else ""
+    if packs:
+        context += packs_version(packs)
+    if cache is not None:
+        cached = cache.get(code, context)
+        stats = active_stats()
+        if stats is not None:
+            stats.add("cache", "hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
+
+    detected_structures = analyse_code(code, project_index, module, packs)
+    suggestions = rank_suggestions(Suggestor(detected_structures, rule_set_for(packs)).get_suggestions())
+
+    if cache is not None:
+        cache.put(code, detected_structures, suggestions, context)
+    return detected_structures, suggestions
+
+def build_collector(detected_structures, suggestions):
+    """Returns a UsageDataCollector filled with structures followed by suggestions."""
+    collector = UsageDataCollector()
+    for struct in detected_structures:
+        collector.add_detected_structure(struct)
+    for suggestion in suggestions:
+        collector.add_suggestion(suggestion)
+    return collector
+
+# === STREAMING ===
+
+def iter_python_files(paths):
+    """
+    Yields the .py files named by paths, expanding directories recursively
+    in sorted order and skipping hidden directories and __pycache__.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    yield os.path.join(root, name)
+
+def iter_findings(paths, cache=None, project_index=None, packs=(), changed=None):
+    """
+    Analyses files one at a time and yields (file, kind, record) tuples as they are produced:
+    - ("structure", Finding) for each detected structure
+    - ("suggestion", Suggestion) for each suggestion
+    - ("summary", dict) with the file's score once its findings are done
+    - ("error", dict) if the file cannot be read or parsed
+    Only one file's results are held in memory at a time.
+    A callgraph.ProjectIndex built over the same paths enables interprocedural types.
+    With changed ({path: line numbers, or None for the whole file}, see gitdiff.changed_lines),
+    each file is still analysed in full but only findings on changed lines are yielded and scored.
+    """
+    for path in iter_python_files(paths):
+        try:
+            with open(path, "r") as file:
+                code = file.read()
+            module = project_index.module_for(path) if project_index is not None else None
+            detected_structures, suggestions = analyse_source(code, cache, project_index, module, packs)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            yield path, "error", {"error": str(e)}
+            continue
+
+        lines = changed.get(path) if changed is not None else None
+        if lines is not None:
+            detected_structures = [struct for struct in detected_structures if struct["line"] in lines]
+            suggestions = [suggestion for suggestion in suggestions if suggestion["line"] in lines]
+
+        for struct in detected_structures:
+            yield path, "structure", struct
+        for suggestion in suggestions:
+            yield path, "suggestion", suggestion
+        yield path, "summary", {
+            "score": calculate_sustainability_score(suggestions),
+            "structures": len(detected_structures),
+            "suggestions": len(suggestions)
+        }
+
+def format_jsonl(path, kind, record):
+    """Formats one iter_findings item as a JSON line."""
+    return json.dumps({"file": path, "kind": kind, **dict(record)})
+
+def write_jsonl(findings, stream):
+    """
+    Writes each iter_findings item to stream as it is produced, flushing once per file
+    (after its summary or error record). Returns the record count.
+    """
+    count = 0
+    for path, kind, record in findings:
+        stream.write(format_jsonl(path, kind, record) + "\n")
+        if kind in ("summary", "error"):
+            stream.flush()
+        count += 1
+    return count
@@ -0,0 +1,124 @@
+# profiler.py
+
+import os
+import runpy
+import sys
+import threading
+
+class LineProfile:
+    """Execution counts and observed collection sizes for the watched lines of one file."""
+
+    def __init__(self):
+        self.executions = {}
+        self.max_sizes = {}
+
+    def size_at(self, line):
+        return self.max_sizes.get(line)
+
+class FindingTracer:
+    """
+    Lightweight line tracer that only instruments frames running code from one file.
+
+    For every line with a finding it counts executions, and for findings with a target
+    (the collection in an `in` check or the receiver of append/pop) it records the
+    largest len() seen for that collection when the line runs.
+    """
+
+    def __init__(self, file_name, detected_structures):
+        self.file_name = os.path.realpath(file_name)
+        self.profile = LineProfile()
+
+        # line -> tuple of target names to measure on that line
+        self.watched = {}
+        for struct in detected_structures:
+            if struct.get("usage_context") is None:
+                continue
+            targets = self.watched.setdefault(struct.get("line"), ())
+            target = struct.get("target")
+            if target and target not in targets:
+                self.watched[struct.get("line")] = targets + (target,)
+
+        self._code_files = {}
+
+    def _is_target_code(self, code):
+        matches = self._code_files.get(code.co_filename)
+        if matches is None:
+            matches = self._code_files[code.co_filename] = os.path.realpath(code.co_filename) == self.file_name
+        return matches
+
+    def _global_trace(self, frame, event, arg):
+        # Only frames executing the analysed file get a local (per-line) tracer
+        if event == "call" and self._is_target_code(frame.f_code):
+            return self._line_trace
+        return None
+
+    def _line_trace(self, frame, event, arg):
+        if event == "line":
+            line = frame.f_lineno
+            targets = self.watched.get(line)
+            if targets is not None:
+                executions = self.profile.executions
+                executions[line] = executions.get(line, 0) + 1
+                for target in targets:
+                    size = _measure(frame, target)
+                    if size is not None and size > self.profile.max_sizes.get(line, -1):
+                        self.profile.max_sizes[line] = size
+        return self._line_trace
+
+    def run(self, script_path, args=()):
+        """
+        Runs a script as __main__ under the tracer and returns the LineProfile.
+        As with `python script.py`, the script's directory is first on sys.path.
+        If the script raises, a warning is printed and the counts so far are kept.
+        """
+        saved_argv = sys.argv
+        saved_path = sys.path[:]
+        sys.argv = [script_path] + list(args)
+        sys.path.insert(0, os.path.dirname(os.path.abspath(script_path)))
+        sys.settrace(self._global_trace)
+        threading.settrace(self._global_trace)
+        try:
+            runpy.run_path(script_path, run_name="__main__")
+        except SystemExit:
+            pass
+        except Exception as e:
+            print(f"Warning: {script_path} raised {type(e).__name__}: {e}; "
+                  f"the profile covers the run up to that point.", file=sys.stderr)
+        finally:
+            sys.settrace(None)
+            threading.settrace(None)
+            sys.argv = saved_argv
+            sys.path[:] = saved_path
+        return self.profile
+
+def _measure(frame, target):
+    """Returns len() of a dotted name as seen from frame, or None if unavailable."""
+    first, *rest = target.split(".")
+    if first in frame.f_locals:
+        value = frame.f_locals[first]
+    elif first in frame.f_globals:
+        value = frame.f_globals[first]
+    else:
+        return None
+    try:
+        for attr in rest:
+            value = getattr(value, attr)
+        return len(value)
+    except Exception:
+        return None
+
+def profile_script(file_name, detected_structures, target_script=None, args=()):
+    """
+    Runs target_script (default: file_name itself) and measures the findings in file_name.
+    Returns a LineProfile.
+    """
+    tracer = FindingTracer(file_name, detected_structures)
+    return tracer.run(target_script or file_name, args)
+
+def apply_profile(suggestions, profile):
+    """Attaches execution counts and observed collection sizes to each suggestion."""
+    for suggestion in suggestions:
+        line = suggestion.get("line")
+        suggestion["executions"] = profile.executions.get(line, 0)
+        suggestion["observed_size"] = profile.size_at(line)
+    return suggestions
@@ -0,0 +1,117 @@
+# records.py
+
+import sys
+
+class Record:
+    """
+    Base class for compact, slotted finding records.
+    Records behave like read-only dicts (record["line"], record.get(...), dict(record))
+    so existing callers keep working, without paying for a dict per finding.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a record from a dict, ignoring unknown keys."""
+        return cls(**{key: data[key] for key in cls.__slots__ if key in data})
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def get(self, key, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return self.__slots__
+
+    def values(self):
+        return [getattr(self, key) for key in self.__slots__]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.__slots__]
+
+    def replace(self, **changes):
+        """Returns a copy of the record with the given fields replaced."""
+        return type(self)(**{**self.to_dict(), **changes})
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class Finding(Record):
+    """A data structure or usage pattern detected by the analyser."""
+
+    __slots__ = ("line", "type", "details", "usage_context", "loop_depth", "function", "target", "bytes_saved")
+
+    def __init__(self, line, type, details="", usage_context=None, loop_depth=0, function=None, target=None,
+                 bytes_saved=None):
+        self.line = line
+        # Type names are built with f-strings, so intern them to share one copy per name
+        self.type = sys.intern(type)
+        self.details = sys.intern(details)
+        self.usage_context = usage_context
+        self.loop_depth = loop_depth
+        self.function = function
+        self.target = target
+        # Estimated memory saved per instance or element by the suggested layout (memory findings only)
+        self.bytes_saved = bytes_saved
+
+class Suggestion(Record):
+    """A recommendation produced by a SuggestionRule for one finding."""
+
+    __slots__ = (
+        "line", "current_type", "usage_context", "suggestion", "explanation", "impact_estimate",
+        "loop_depth", "function", "executions", "observed_size", "speedup", "benchmark_size", "bytes_saved",
+        "benchmark", "base_order"
+    )
+
+    def __init__(self, line, current_type, usage_context, suggestion, explanation, impact_estimate,
+                 loop_depth=0, function=None, executions=None, observed_size=None,
+                 speedup=None, benchmark_size=None, bytes_saved=None, benchmark=None,
+                 base_order=None):
+        self.line = line
+        self.current_type = current_type
+        self.usage_context = usage_context
+        self.suggestion = suggestion
+        self.explanation = explanation
+        self.impact_estimate = impact_estimate
+        self.loop_depth = loop_depth
+        self.function = function
+        # Runtime measurements, filled in by a profiling run (None when not profiled)
+        self.executions = executions
+        self.observed_size = observed_size
+        # Micro-benchmark result: current time / suggested time at benchmark_size elements
+        self.speedup = speedup
+        self.benchmark_size = benchmark_size
+        # Estimated bytes saved per instance or element, copied from a memory finding
+        self.bytes_saved = bytes_saved
+        # Name of the rule's micro-benchmark in microbench.BENCHMARKS (None if it has none)
+        self.benchmark = benchmark
+        # Cost of one occurrence as a power of n, when the rule sets it (else cost_model.BASE_ORDER applies)
+        self.base_order = base_order
@@ -2,6 +2,44 @@
 
 import datetime
 
+from cost_model import describe_cost
+
+def describe_measurements(suggestion):
+    """Formats the runtime measurements attached to a suggestion by a profiling run."""
+    executions = suggestion["executions"]
+    if executions == 0:
+        return "never executed during the profiling run"
+    text = f"executed {executions} time{'s' if executions != 1 else ''}"
+    if suggestion.get("observed_size") is not None:
+        text += f", collection size up to {suggestion['observed_size']}"
+    return text
+
+def suggestion_lines(suggestion):
+    """Returns the Markdown lines describing one suggestion, ending with a blank line."""
+    lines = []
+    lines.append(f"### Line {suggestion['line']}")
+    lines.append(f"- **Current structure:** {suggestion['current_type']}")
+    if suggestion.get("usage_context"):
+        lines.append(f"- **Usage context:** {suggestion['usage_context']}")
+    if "loop_depth" in suggestion:
+        lines.append(f"- **Estimated cost:** {describe_cost(suggestion)}")
+    if suggestion.get("executions") is not None:
+        lines.append(f"- **Measured:** {describe_measurements(suggestion)}")
+    lines.append(f"- **Suggestion:** {suggestion['suggestion']}")
+    lines.append(f"- **Explanation:** {suggestion['explanation']}")
+    lines.append(f"- **Impact:** {suggestion['impact_estimate']}")
+    if suggestion.get("speedup"):
+        lines.append(
+            f"- **Measured speedup:** {suggestion['speedup']:.1f}x with the suggested structure "
+            f"(micro-benchmark, n={suggestion['benchmark_size']})"
+        )
+    if suggestion.get("bytes_saved"):
+        lines.append(
+            f"- **Estimated memory saving:** ~{suggestion['bytes_saved']} bytes per instance or element"
+        )
+    lines.append("")
+    return lines
+
 class ReportGenerator:
     """
     Generates a structured Markdown report of suggestions, including explanations and sustainability impact.
@@ -24,13 +62,7 @@ class ReportGenerator:
             report_lines.append("No suggestions found. Great job!\n")
         else:
             for suggestion in self.suggestions:
-                report_lines.append(f"### Line {suggestion['line']}")
-                report_lines.append(f"- **Current structure:** {suggestion['current_type']}")
-                if suggestion.get("usage_context"):
-                    report_lines.append(f"- **Usage context:** {suggestion['usage_context']}")
-                report_lines.append(f"- **Suggestion:** {suggestion['suggestion']}")
-                report_lines.append(f"- **Explanation:** {suggestion['explanation']}")
-                report_lines.append(f"- **Impact:** {suggestion['impact_estimate']}\n")
+                report_lines.extend(suggestion_lines(suggestion))
 
         with open(file_name, "w") as f:
             f.write("\n".join(report_lines))
@@ -1,33 +1,52 @@
 # rules.py
 
+from records import Suggestion
+
 class SuggestionRule:
     """
     Represents a rule that checks for a certain usage context or structure pattern
     and provides a recommendation.
     """
 
-    def __init__(self, condition_function, suggestion, explanation, impact_estimate):
+    def __init__(self, condition_function, suggestion, explanation, impact_estimate, usage_contexts=None,
+                 benchmark=None, base_order=None):
         """
         :param condition_function: A function that takes a structure dict and returns True if the rule applies.
         :param suggestion: Suggested alternative data structure.
         :param explanation: Explanation of why the alternative is better.
         :param impact_estimate: Estimated improvement impact (textual description).
+        :param usage_contexts: usage_context values the rule can match. The Suggestor only
+            evaluates the rule for structures with one of these contexts; None means
+            the rule is checked against every structure.
+        :param benchmark: Name of the micro-benchmark in microbench.BENCHMARKS that compares the
+            current structure with the suggested one, used to measure a concrete speedup.
+            It is copied onto each Suggestion, so the link does not depend on the suggestion text.
+        :param base_order: Cost of one occurrence as a power of n, copied onto each Suggestion,
+            for rules whose usage context has no entry in cost_model.BASE_ORDER.
         """
         self.condition_function = condition_function
         self.suggestion = suggestion
         self.explanation = explanation
         self.impact_estimate = impact_estimate
+        self.usage_contexts = frozenset(usage_contexts) if usage_contexts is not None else None
+        self.benchmark = benchmark
+        self.base_order = base_order
 
     def apply(self, structure):
         if self.condition_function(structure):
-            return {
-                "line": structure.get("line"),
-                "current_type": structure.get("type"),
-                "usage_context": structure.get("usage_context"),
-                "suggestion": self.suggestion,
-                "explanation": self.explanation,
-                "impact_estimate": self.impact_estimate
-            }
+            return Suggestion(
+                structure.get("line"),
+                structure.get("type"),
+                structure.get("usage_context"),
+                self.suggestion,
+                self.explanation,
+                self.impact_estimate,
+                structure.get("loop_depth", 0),
+                structure.get("function"),
+                bytes_saved=structure.get("bytes_saved"),
+                benchmark=self.benchmark,
+                base_order=self.base_order
+            )
         return None
 
 # === RULE CONDITIONS ===
@@ -53,6 +72,36 @@ def is_queue_like_list_usage(structure):
     """
     return structure.get("usage_context") == "append_or_pop"
 
+def is_string_concat_in_loop(structure):
+    """
+    Matches strings built up with += inside a loop.
+    """
+    return structure.get("usage_context") == "string_concat"
+
+def is_repeated_sort(structure):
+    """
+    Matches sorted() / .sort() / min() / max() recomputed over the same collection inside a loop.
+    """
+    return structure.get("usage_context") == "repeated_sort"
+
+def is_nested_loop_join(structure):
+    """
+    Matches nested loops that pair up items from two collections by comparing keys.
+    """
+    return structure.get("usage_context") == "nested_loop_join"
+
+def is_insert_at_front(structure):
+    """
+    Matches list.insert(0, x).
+    """
+    return structure.get("usage_context") == "insert_front"
+
+def is_repeated_lookup(structure):
+    """
+    Matches len() calls and attribute chains re-evaluated on every loop iteration.
+    """
+    return structure.get("usage_context") == "repeated_lookup"
+
 # === RULE DEFINITIONS ===
 
 rules = [
@@ -60,18 +109,65 @@ rules = [
         is_membership_test_on_list,
         suggestion="Use a set for membership testing.",
         explanation="Sets offer O(1) lookup time compared to O(n) for lists.",
-        impact_estimate="Can reduce lookup time and CPU cycles significantly, improving sustainability."
+        impact_estimate="Can reduce lookup time and CPU cycles significantly, improving sustainability.",
+        usage_contexts={"membership_test"},
+        benchmark="membership"
     ),
     SuggestionRule(
         is_manual_counter_detected,
         suggestion="Use collections.Counter instead of manual dictionary counting.",
         explanation="Cleaner, more efficient counting with optimised memory handling.",
-        impact_estimate="Reduces repeated memory operations and redundant instructions."
+        impact_estimate="Reduces repeated memory operations and redundant instructions.",
+        usage_contexts={"manual_counter"},
+        benchmark="counter"
     ),
     SuggestionRule(
         is_queue_like_list_usage,
         suggestion="Consider using collections.deque for queue operations.",
         explanation="Deques are optimised for appending and popping from both ends.",
-        impact_estimate="Reduces unnecessary re-indexing in lists, saving computational effort."
+        impact_estimate="Reduces unnecessary re-indexing in lists, saving computational effort.",
+        usage_contexts={"append_or_pop"},
+        benchmark="queue"
+    ),
+    SuggestionRule(
+        is_string_concat_in_loop,
+        suggestion="Collect the pieces in a list and combine them once with ''.join().",
+        explanation="Each += may copy the whole string built so far, making the loop O(n^2) in the output size.",
+        impact_estimate="Turns quadratic copying into a single linear pass over the pieces.",
+        usage_contexts={"string_concat"},
+        benchmark="concat"
+    ),
+    SuggestionRule(
+        is_repeated_sort,
+        suggestion="Sort once outside the loop, or keep the data in a heap (heapq) or sorted list (bisect).",
+        explanation="Sorting or scanning for min/max on every iteration repeats O(n log n) or O(n) work; "
+                    "heapq gives O(log n) updates with O(1) access to the smallest item, bisect keeps order on insert.",
+        impact_estimate="Removes a full sort or scan from every loop iteration.",
+        usage_contexts={"repeated_sort"},
+        benchmark="sort"
+    ),
+    SuggestionRule(
+        is_nested_loop_join,
+        suggestion="Index one collection in a dict keyed on the join key, then look matches up in a single loop.",
+        explanation="Comparing every pair of items is O(n*m); a dict index join is O(n + m).",
+        impact_estimate="Replaces a quadratic pairwise scan with one pass over each collection.",
+        usage_contexts={"nested_loop_join"},
+        benchmark="join"
+    ),
+    SuggestionRule(
+        is_insert_at_front,
+        suggestion="Use collections.deque and appendleft() instead of list.insert(0, x).",
+        explanation="Inserting at the front of a list shifts every element (O(n)); deque.appendleft is O(1).",
+        impact_estimate="Avoids moving the whole list on every insertion.",
+        usage_contexts={"insert_front"},
+        benchmark="insert_front"
+    ),
+    SuggestionRule(
+        is_repeated_lookup,
+        suggestion="Hoist the len() call or attribute lookup into a local variable before the loop.",
+        explanation="Local variable access is cheaper than repeating a function call or attribute chain on every iteration.",
+        impact_estimate="Trims constant per-iteration overhead in hot loops (only valid if the value does not change in the loop).",
+        usage_contexts={"repeated_lookup"},
+        benchmark="lookup"
     )
 ]
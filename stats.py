@@ -0,0 +1,108 @@
+# stats.py
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# The Stats instance receiving measurements, or None when collection is disabled
+_active = None
+
+class Stats:
+    """
+    Accumulates call counts and wall time by (category, name), for example
+    ("parse", "ast.parse"), ("handler", "DataStructureAnalyzer.visit_Call")
+    or ("rule", "is_membership_test").
+    """
+
+    def __init__(self):
+        # (category, name) -> [count, seconds]
+        self.entries = {}
+
+    def add(self, category, name, seconds=0.0, count=1):
+        entry = self.entries.get((category, name))
+        if entry is None:
+            entry = self.entries[(category, name)] = [0, 0.0]
+        entry[0] += count
+        entry[1] += seconds
+
+    @contextmanager
+    def timer(self, category, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(category, name, time.perf_counter() - start)
+
+    def wrap(self, category, name, func):
+        """Returns func wrapped so every call is counted and timed under (category, name)."""
+        entry = self.entries.setdefault((category, name), [0, 0.0])
+        perf_counter = time.perf_counter
+
+        def timed(*args):
+            start = perf_counter()
+            try:
+                return func(*args)
+            finally:
+                entry[0] += 1
+                entry[1] += perf_counter() - start
+
+        return timed
+
+    def to_dict(self):
+        """Returns {category: {name: {"count", "seconds", "mean_us"}}}, slowest first within each category."""
+        result = {}
+        for (category, name), (count, seconds) in sorted(self.entries.items(), key=lambda item: -item[1][1]):
+            if not count:
+                continue
+            result.setdefault(category, {})[name] = {
+                "count": count,
+                "seconds": round(seconds, 6),
+                "mean_us": round(seconds / count * 1e6, 3),
+            }
+        return result
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format_table(self):
+        """Returns the measurements as a plain-text table grouped by category."""
+        data = self.to_dict()
+        if not data:
+            return "No statistics recorded."
+        width = max(len(name) for names in data.values() for name in names)
+        lines = [f"{'category':<10} {'name':<{width}} {'count':>10} {'total ms':>12} {'mean us':>10}"]
+        for category, names in data.items():
+            for name, entry in names.items():
+                lines.append(
+                    f"{category:<10} {name:<{width}} {entry['count']:>10} "
+                    f"{entry['seconds'] * 1000:>12.3f} {entry['mean_us']:>10.3f}"
+                )
+        return "\n".join(lines)
+
+def active_stats():
+    """Returns the Stats being collected into, or None (the analyser checks this once per file)."""
+    return _active
+
+def timer(category, name):
+    """Times a with block into the active Stats; a no-op while collection is disabled."""
+    return _active.timer(category, name) if _active is not None else nullcontext()
+
+def enable(stats=None):
+    """Starts collecting into stats (a new Stats if omitted) and returns it."""
+    global _active
+    _active = stats if stats is not None else Stats()
+    return _active
+
+def disable():
+    global _active
+    _active = None
+
+@contextmanager
+def collect(stats=None):
+    """Collects statistics for the duration of a with block: `with collect() as stats: ...`."""
+    global _active
+    previous = _active
+    try:
+        yield enable(stats)
+    finally:
+        _active = previous
@@ -1,21 +1,67 @@
 # suggestor.py
 
+from functools import lru_cache
+
 from rules import rules
+from stats import active_stats
+
+def build_rule_index(rule_set):
+    """
+    Indexes rules by the usage_context values they declare.
+    Returns ({usage_context: [rules]}, general_rules). Each indexed list also contains
+    the general rules (those without declared contexts) and keeps rule-set order.
+    """
+    general_rules = [rule for rule in rule_set if rule.usage_contexts is None]
+    contexts = {context for rule in rule_set if rule.usage_contexts for context in rule.usage_contexts}
+
+    index = {}
+    for context in contexts:
+        index[context] = [
+            rule for rule in rule_set
+            if rule.usage_contexts is None or context in rule.usage_contexts
+        ]
+    return index, general_rules
+
+# Rule sets whose index is kept; long-lived processes (daemon, watch) may see
+# a new rule set each time a pattern pack is reloaded
+RULE_INDEX_CACHE_SIZE = 32
+
+@lru_cache(maxsize=RULE_INDEX_CACHE_SIZE)
+def _cached_rule_index(rule_set):
+    return build_rule_index(rule_set)
+
+def get_rule_index(rule_set):
+    """Returns the (cached) rule index for a rule set."""
+    return _cached_rule_index(tuple(rule_set))
 
 class Suggestor:
     """
     Applies suggestion rules to detected data structures and compiles recommendations.
     """
 
-    def __init__(self, detected_structures):
+    def __init__(self, detected_structures, rule_set=None):
         self.detected_structures = detected_structures
+        self.rule_set = rules if rule_set is None else rule_set
         self.suggestions = []
 
     def apply_rules(self):
-        """Applies each suggestion rule to each detected structure."""
+        """
+        Applies the rules indexed under each structure's usage context to that structure.
+        While statistics are being collected, each rule evaluation is counted and timed.
+        """
+        index, general_rules = get_rule_index(self.rule_set)
+        stats = active_stats()
+        timed = {}
+
         for structure in self.detected_structures:
-            for rule in rules:
-                suggestion = rule.apply(structure)
+            for rule in index.get(structure.get("usage_context"), general_rules):
+                if stats is None:
+                    suggestion = rule.apply(structure)
+                else:
+                    apply = timed.get(rule)
+                    if apply is None:
+                        apply = timed[rule] = stats.wrap("rule", rule.condition_function.__name__, rule.apply)
+                    suggestion = apply(structure)
                 if suggestion:
                     self.suggestions.append(suggestion)
 
@@ -0,0 +1,210 @@
+# symbols.py
+
+import ast
+
+# Collection types where `x in c` is O(1) (hash lookup) or otherwise not a list scan
+CONSTANT_TIME_MEMBERSHIP = {
+    "set", "frozenset", "dict", "Counter", "defaultdict", "OrderedDict", "dict_keys", "range", "str"
+}
+
+# Constructors that produce a known collection type, called bare or as collections.X
+CONSTRUCTORS = {
+    "set": "set",
+    "frozenset": "frozenset",
+    "dict": "dict",
+    "list": "list",
+    "tuple": "tuple",
+    "deque": "deque",
+    "Counter": "Counter",
+    "defaultdict": "defaultdict",
+    "OrderedDict": "OrderedDict",
+    "range": "range",
+    "sorted": "list",
+    "str": "str",
+}
+
+# Type annotations that name a collection type
+ANNOTATIONS = {
+    "set": "set", "Set": "set", "AbstractSet": "set", "MutableSet": "set",
+    "frozenset": "frozenset", "FrozenSet": "frozenset",
+    "dict": "dict", "Dict": "dict", "Mapping": "dict", "MutableMapping": "dict",
+    "list": "list", "List": "list",
+    "tuple": "tuple", "Tuple": "tuple",
+    "deque": "deque", "Deque": "deque",
+    "Counter": "Counter", "DefaultDict": "defaultdict", "OrderedDict": "OrderedDict",
+    "str": "str",
+}
+
+# Displays and comprehensions, by node class
+LITERAL_TYPES = {
+    ast.Set: "set", ast.SetComp: "set",
+    ast.Dict: "dict", ast.DictComp: "dict",
+    ast.List: "list", ast.ListComp: "list",
+    ast.Tuple: "tuple",
+    ast.JoinedStr: "str",
+}
+
+# Binary operators that keep the type of a set or str left operand
+SET_OPERATORS = {ast.BitOr, ast.BitAnd, ast.Sub, ast.BitXor}
+STR_OPERATORS = {ast.Add, ast.Mod}
+
+# str methods that return a new string
+STR_METHODS = {"format", "join", "strip", "lower", "upper", "replace"}
+
+# Methods that return a collection of the same type as their receiver
+SAME_TYPE_METHODS = {"copy", "union", "intersection", "difference", "symmetric_difference"}
+
+class Scope:
+    """
+    One lexical scope (module, class or function) mapping names to inferred types.
+    A type of None means the name is bound but its type is unknown, which still
+    shadows any binding of the same name in an enclosing scope.
+    """
+
+    __slots__ = ("kind", "name", "parent", "symbols", "global_names", "self_name", "params")
+
+    def __init__(self, kind, name=None, parent=None, self_name=None):
+        self.kind = kind
+        self.name = name
+        self.parent = parent
+        self.symbols = {}
+        self.global_names = set()
+        # For methods, the name of the first parameter, so self.x bindings go to the class
+        self.self_name = self_name
+        # Parameters that have not been rebound in the body (still hold the caller's argument)
+        self.params = set()
+
+    def module(self):
+        scope = self
+        while scope.parent is not None:
+            scope = scope.parent
+        return scope
+
+    def bind(self, name, type_):
+        """Binds a plain or `self.attr` name in the scope where Python would bind it."""
+        if "." in name:
+            owner = self.attribute_scope(name)
+            if owner is not None:
+                owner.symbols[name.split(".", 1)[1]] = type_
+            return
+        if self.global_names and name in self.global_names:
+            self.module().symbols[name] = type_
+        else:
+            self.symbols[name] = type_
+            self.params.discard(name)
+
+    def attribute_scope(self, dotted):
+        """Returns the class scope holding `self.attr` for a method's self name, else None."""
+        if self.self_name and dotted.split(".", 1)[0] == self.self_name:
+            if self.parent is not None and self.parent.kind == "class":
+                return self.parent
+        return None
+
+    def lookup(self, name):
+        """
+        Returns the inferred type of a name, following Python's rules:
+        local scope, then enclosing function scopes (class scopes are skipped), then module.
+        Dotted `self.attr` names are looked up on the enclosing class.
+        """
+        if "." in name:
+            owner = self.attribute_scope(name)
+            return owner.symbols.get(name.split(".", 1)[1]) if owner is not None else None
+        if self.global_names and name in self.global_names:
+            return self.module().symbols.get(name)
+
+        scope = self
+        while scope is not None:
+            if name in scope.symbols:
+                return scope.symbols[name]
+            scope = scope.parent
+            while scope is not None and scope.kind == "class":
+                scope = scope.parent
+        return None
+
+def annotation_type(annotation):
+    """Returns the collection type named by an annotation such as set[int] or Dict[str, int]."""
+    if isinstance(annotation, ast.Subscript):
+        annotation = annotation.value
+    if isinstance(annotation, ast.Attribute):
+        return ANNOTATIONS.get(annotation.attr)
+    if isinstance(annotation, ast.Name):
+        return ANNOTATIONS.get(annotation.id)
+    if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+        try:
+            return annotation_type(ast.parse(annotation.value, mode="eval").body)
+        except SyntaxError:
+            return None
+    return None
+
+def infer_type(expr, scope):
+    """
+    Infers the collection type of an expression from literals, comprehensions,
+    constructor calls and names already bound in scope. Returns None when unknown.
+    """
+    expr_class = expr.__class__
+    literal = LITERAL_TYPES.get(expr_class)
+    if literal is not None:
+        return literal
+    if expr_class is ast.Name:
+        return scope.lookup(expr.id)
+    if isinstance(expr, ast.Constant) and isinstance(expr.value, str):
+        return "str"
+    if isinstance(expr, ast.Attribute):
+        name = dotted_name(expr)
+        return scope.lookup(name) if name else None
+    if isinstance(expr, ast.Call):
+        func = expr.func
+        if isinstance(func, ast.Name):
+            return CONSTRUCTORS.get(func.id)
+        if isinstance(func, ast.Attribute):
+            if func.attr in STR_METHODS and infer_type(func.value, scope) == "str":
+                return "str"
+            if func.attr == "keys":
+                return "dict_keys"
+            if func.attr in SAME_TYPE_METHODS:
+                return infer_type(func.value, scope)
+            if isinstance(func.value, ast.Name) and func.value.id == "collections":
+                return CONSTRUCTORS.get(func.attr)
+        return None
+    if expr_class is ast.BinOp:
+        # a + b + c nests to the left, so walk the left operands iteratively
+        ops = set()
+        while expr.__class__ is ast.BinOp:
+            ops.add(expr.op.__class__)
+            expr = expr.left
+        left = infer_type(expr, scope)
+        if left in ("set", "frozenset") and ops <= SET_OPERATORS:
+            return left
+        if left == "str" and ops <= STR_OPERATORS:
+            return left
+    return None
+
+def dotted_name(node):
+    """Returns 'a.b.c' for a Name/Attribute chain, or None for any other expression."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+def function_scope(node, parent, qualname, parameter_types=None):
+    """
+    Creates the scope for a function or lambda, binding its parameters.
+    Parameters are typed by their annotation, else by parameter_types (e.g. inferred from callers).
+    """
+    args = node.args
+    positional = args.posonlyargs + args.args
+    self_name = positional[0].arg if positional and parent.kind == "class" else None
+    scope = Scope("function", qualname, parent, self_name=self_name)
+
+    for arg in positional + args.kwonlyargs + [a for a in (args.vararg, args.kwarg) if a]:
+        annotation = getattr(arg, "annotation", None)
+        type_ = annotation_type(annotation) if annotation is not None else None
+        if type_ is None and parameter_types:
+            type_ = parameter_types.get(arg.arg)
+        scope.symbols[arg.arg] = type_
+        scope.params.add(arg.arg)
+    return scope
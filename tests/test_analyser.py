@@ -15,3 +15,60 @@ def test_detects_membership_context():
     code = """numbers = [1, 2, 3]\nif 2 in numbers:\n    pass"""
     structures = analyse_code(code)
     assert any(struct.get('usage_context') == 'membership_test' for struct in structures)
+
+def test_deeply_nested_expression_does_not_recurse():
+    code = "x = " + " + ".join(["[1]"] * 2000)
+    structures = analyse_code(code)
+    assert sum(1 for struct in structures if struct['type'] == 'List') == 2000
+
+def test_findings_follow_source_order():
+    code = "a = [1, (2, 3)]\nb = {'k': [4]}"
+    structures = analyse_code(code)
+    assert [(s['line'], s['type']) for s in structures] == [
+        (1, 'List'), (1, 'Tuple'), (2, 'Dictionary'), (2, 'List')
+    ]
+
+def contexts(code):
+    return [(s['line'], s['usage_context']) for s in analyse_code(code) if s.get('usage_context')]
+
+def test_detects_string_concatenation_in_loop_but_not_loop_variable():
+    code = "out = ''\nfor row in rows:\n    out += f'{row}'\n    row += '!'\nout += 'done'\n"
+    assert contexts(code) == [(3, 'string_concat')]
+
+def test_detects_repeated_sort_of_invariant_collection():
+    code = "for item in items:\n    best = max(scores)\n    order = sorted(item)\n    scores.sort()\n"
+    assert contexts(code) == [(2, 'repeated_sort'), (4, 'repeated_sort')]
+
+def test_detects_nested_loop_join_in_statements_and_comprehensions():
+    code = (
+        "for u in users:\n    for o in orders:\n        if u.id == o.user_id:\n            pass\n"
+        "pairs = [(u, o) for u in users for o in orders if u['id'] == o['uid']]\n"
+    )
+    assert contexts(code) == [(3, 'nested_loop_join'), (5, 'nested_loop_join')]
+
+def test_detects_insert_at_front_of_list_only():
+    code = "from collections import deque\na = []\na.insert(0, 1)\na.insert(1, 2)\nd = deque()\nd.insert(0, 1)\n"
+    assert contexts(code) == [(3, 'insert_front')]
+
+def test_repeated_lookups_are_reported_once_per_function():
+    code = (
+        "import os\n"
+        "def f(paths):\n"
+        "    i = 0\n"
+        "    while i < len(paths):\n"
+        "        os.path.join('a', 'b')\n"
+        "        sep = os.path.sep\n"
+        "        sep = os.path.sep\n"
+        "        i += 1\n"
+    )
+    assert [(s['line'], s['target']) for s in analyse_code(code) if s.get('usage_context') == 'repeated_lookup'] == [
+        (4, 'len(paths)'), (6, 'os.path.sep')
+    ]
+
+def test_method_calls_are_not_repeated_lookups():
+    code = "for item in data:\n    self.items.append(item)\n    os.path.join(item)\n"
+    assert 'repeated_lookup' not in [context for _, context in contexts(code)]
+
+def test_augmented_add_on_list_is_not_string_concatenation():
+    code = "lst = []\ntext = ''\nfor row in rows:\n    lst += 'x'\n    text += row\n    total += 'x'\n"
+    assert contexts(code) == [(5, 'string_concat'), (6, 'string_concat')]
@@ -0,0 +1,73 @@
+import argparse
+import subprocess
+import textwrap
+
+import pytest
+
+import batch_run
+from batch_run import analyse_submission, run_jobs, run_batch
+
+def write_submission(directory, name, code):
+    path = directory / name
+    path.write_text(textwrap.dedent(code))
+    return str(path)
+
+def test_analyse_submission_writes_report(tmp_path):
+    input_path = write_submission(tmp_path, "sample.py", """\
+        numbers = [1, 2, 3]
+        if 2 in numbers:
+            print("Found")
+    """)
+    report_path = tmp_path / "sample_report.md"
+    result = analyse_submission(input_path, str(report_path))
+    assert result["error"] is None
+    assert result["suggestions"] == 1
+    assert result["elapsed"] >= 0
+    assert report_path.exists()
+
+def test_analyse_submission_captures_syntax_error(tmp_path):
+    input_path = write_submission(tmp_path, "broken.py", "def broken(:")
+    result = analyse_submission(input_path)
+    assert "Syntax error" in result["error"]
+
+def test_run_jobs_preserves_order_with_pool(tmp_path):
+    jobs = []
+    for i in range(4):
+        code = "x = [1]\n" + "if 1 in x:\n    pass\n" * i
+        jobs.append((write_submission(tmp_path, f"f{i}.py", code), None, None))
+    results = list(run_jobs(jobs, workers=2))
+    assert [r["input"] for r in results] == [job[0] for job in jobs]
+    assert [r["suggestions"] for r in results] == [0, 1, 2, 3]
+
+def test_run_batch_summary(tmp_path, monkeypatch):
+    submissions = tmp_path / "submissions"
+    submissions.mkdir()
+    write_submission(submissions, "a.py", "numbers = [1, 2, 3]\n")
+    write_submission(submissions, "b.py", "def broken(:")
+    monkeypatch.setattr(batch_run, "USER_SUBMISSIONS_DIR", str(submissions))
+    monkeypatch.setattr(batch_run, "REPORTS_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr(batch_run, "EXPECTED_REPORTS_DIR", str(tmp_path / "expected"))
+    (tmp_path / "expected").mkdir()
+
+    summary = run_batch(refresh_expected=True, workers=1, cache_dir=str(tmp_path / "cache"))
+    statuses = {name: status for name, status, _ in summary}
+    assert statuses == {"a.py": "UPDATED", "b.py": "ERROR"}
+
+def test_shards_partition_files_deterministically(tmp_path):
+    for i in range(12):
+        write_submission(tmp_path, f"m{i}.py", "x = 1\n")
+    shards = [batch_run.shard_files([str(tmp_path)], index, 3) for index in (1, 2, 3)]
+    names = [relative for shard in shards for relative, _ in shard]
+    assert sorted(names) == sorted(f"m{i}.py" for i in range(12))
+    assert batch_run.shard_files([str(tmp_path)], 2, 3) == shards[1]
+
+def test_parse_shard_rejects_out_of_range():
+    assert batch_run.parse_shard("2/4") == (2, 4)
+    for spec in ("0/4", "5/4", "two/4"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            batch_run.parse_shard(spec)
+
+def test_input_without_shard_is_rejected():
+    result = subprocess.run(["python", "batch_run.py", "--input", "tests"], capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "--input is only used with --shard" in result.stderr
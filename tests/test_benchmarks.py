@@ -0,0 +1,69 @@
+import ast
+import json
+import os
+import pytest
+from analyser import analyse_code
+from benchmarks.generate import generate_module
+from benchmarks.run_benchmarks import BASELINE_PATH, PHASES, compare_to_baseline, run_suite
+
+def test_generate_module_is_valid_and_sized():
+    code = generate_module(500)
+    ast.parse(code)
+    assert 500 <= code.count("\n") < 520
+
+def test_generate_module_is_deterministic():
+    assert generate_module(200, seed=1) == generate_module(200, seed=1)
+    assert generate_module(200, seed=1) != generate_module(200, seed=2)
+
+def test_generate_module_respects_mix():
+    code = generate_module(200, mix={"counter": 1})
+    contexts = {r["usage_context"] for r in analyse_code(code)}
+    assert contexts == {None, "manual_counter"}
+
+def test_generate_module_rejects_unknown_pattern():
+    with pytest.raises(ValueError):
+        generate_module(10, mix={"nope": 1})
+
+def test_run_suite_times_every_phase():
+    suite = run_suite(sizes=[200], repeat=1)
+    result = suite["results"]["200"]
+    assert all(result[phase] >= 0 for phase in PHASES)
+    assert result["findings"] > 0
+
+def test_compare_to_baseline_flags_slow_phase():
+    baseline = {"results": {"1000": {"parse": 0.10, "visit": 0.10}}}
+    current = {"results": {"1000": {"parse": 0.11, "visit": 0.20}}}
+    regressions = compare_to_baseline(current, baseline, tolerance=0.25)
+    assert len(regressions) == 1
+    assert "visit" in regressions[0]
+
+def test_findings_records_are_smaller_than_dicts():
+    result = run_suite(sizes=[200], repeat=1)["results"]["200"]
+    assert result["findings_bytes"] < result["findings_dict_bytes"]
+
+def test_compare_to_baseline_flags_memory_growth():
+    baseline = {"results": {"1000": {"findings_bytes": 1000}}}
+    current = {"results": {"1000": {"findings_bytes": 2000}}}
+    assert "memory" in compare_to_baseline(current, baseline, tolerance=0.25)[0]
+
+def load_baseline():
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+def test_committed_baseline_matches_current_findings():
+    # Deterministic: the baseline must describe the same workload the suite runs today
+    baseline = load_baseline()
+    current = run_suite(sizes=[1000], repeat=1, seed=baseline["seed"])
+    for key in ("findings", "suggestions"):
+        assert current["results"]["1000"][key] == baseline["results"]["1000"][key]
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="wall-clock benchmark; set RUN_BENCHMARKS=1")
+def test_no_regressions_against_committed_baseline():
+    # Generous default tolerance: the baseline was recorded on another machine, so this
+    # catches algorithmic regressions rather than noise (BENCHMARK_TOLERANCE tightens it)
+    baseline = load_baseline()
+    tolerance = float(os.environ.get("BENCHMARK_TOLERANCE", "1.0"))
+    size = 10_000
+    current = run_suite(sizes=[size], seed=baseline["seed"])
+    assert current["results"][str(size)]["findings"] == baseline["results"][str(size)]["findings"]
+    assert compare_to_baseline(current, baseline, tolerance=tolerance) == []
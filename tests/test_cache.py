@@ -0,0 +1,57 @@
+from cache import ResultCache
+from pipeline import analyse_source
+
+CODE = "numbers = [1, 2, 3]\nif 2 in numbers:\n    pass\n"
+
+def test_cache_miss_then_hit(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.get(CODE) is None
+
+    structures, suggestions = analyse_source(CODE, cache=cache)
+    cached_structures, cached_suggestions = cache.get(CODE)
+
+    assert cache.hits == 1
+    assert [dict(s) for s in structures] == cached_structures
+    assert [dict(s) for s in suggestions] == cached_suggestions
+
+def test_cache_key_depends_on_content(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.key(CODE) == cache.key(CODE)
+    assert cache.key(CODE) != cache.key(CODE + "\n")
+
+def test_cache_persists_across_instances(tmp_path):
+    analyse_source(CODE, cache=ResultCache(str(tmp_path)))
+    assert ResultCache(str(tmp_path)).get(CODE) is not None
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=600)
+    sources = [f"x{i} = [{i}]\n" for i in range(6)]
+    for code in sources:
+        analyse_source(code, cache=cache)
+
+    assert cache._total_bytes <= 600
+    assert cache.get(sources[0]) is None
+    assert cache.get(sources[-1]) is not None
+
+def test_cache_write_failure_does_not_abort_analysis(tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    cache = ResultCache(str(blocker / "cache"))
+
+    structures, suggestions = analyse_source(CODE, cache=cache)
+
+    assert structures and suggestions
+    assert cache.get(CODE) is None
+
+def test_cache_shared_between_threads(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = ResultCache(str(tmp_path), max_bytes=20_000)
+    sources = [f"items_{i} = [1, 2, 3]\nif 2 in items_{i}:\n    pass\n" for i in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda code: analyse_source(code, cache=cache), sources * 2))
+
+    assert all(suggestions for _, suggestions in results)
+    assert cache.hits + cache.misses == 2 * len(sources)
+    assert cache._total_bytes <= 20_000
+    assert cache._total_bytes == sum(size for _, size in cache._index.values())
@@ -0,0 +1,78 @@
+from analyser import analyse_code
+from callgraph import ProjectIndex, build_project_index, join_types, module_name
+from pipeline import iter_findings
+
+LOOKUP = """\
+def contains(items, x):
+    if x in items:
+        return True
+
+def forward(values, x):
+    return contains(values, x)
+
+def scan(rows, x):
+    if x in rows:
+        return 1
+"""
+
+MAIN = """\
+from pkg.lookup import forward, scan
+from pkg import lookup
+
+forward({1, 2}, 1)
+lookup.contains(set(), 3)
+scan([1, 2], 2)
+"""
+
+def membership_functions(findings):
+    return sorted(f['function'] for f in findings if f.get('usage_context') == 'membership_test')
+
+def write_project(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "lookup.py").write_text(LOOKUP)
+    (tmp_path / "main.py").write_text(MAIN)
+
+def test_module_name_strips_package_init(tmp_path):
+    assert module_name(str(tmp_path / "pkg" / "__init__.py"), str(tmp_path)) == "pkg"
+    assert module_name(str(tmp_path / "pkg" / "lookup.py"), str(tmp_path)) == "pkg.lookup"
+
+def test_join_types_prefers_list_and_drops_disagreement():
+    assert join_types({"set"}) == "set"
+    assert join_types({"set", "list"}) == "list"
+    assert join_types({"set", None}) is None
+
+def test_types_propagate_across_modules_and_forwarded_parameters(tmp_path):
+    write_project(tmp_path)
+    index = build_project_index([str(tmp_path)])
+
+    assert index.parameter_types("pkg.lookup", "contains")["items"] == "set"
+    assert index.parameter_types("pkg.lookup", "forward")["values"] == "set"
+    assert index.parameter_types("pkg.lookup", "scan")["rows"] == "list"
+
+    findings = [record for _, kind, record in iter_findings([str(tmp_path)], project_index=index) if kind == "structure"]
+    assert membership_functions(findings) == ["scan"]
+
+def test_parameter_with_unknown_caller_stays_flagged():
+    index = ProjectIndex()
+    index.add_module("m", LOOKUP + "\ndef entry(data):\n    contains(data, 1)\n\ncontains({1}, 1)\n")
+    index.solve()
+    assert index.parameter_types("m", "contains")["items"] is None
+    assert "contains" in membership_functions(analyse_code(LOOKUP, index, "m"))
+
+def test_method_calls_through_self_bind_after_self():
+    code = (
+        "class Finder:\n"
+        "    def has(self, items, x):\n        if x in items:\n            return True\n"
+        "    def run(self):\n        return self.has({1}, 1)\n"
+    )
+    index = ProjectIndex()
+    index.add_module("m", code)
+    index.solve()
+    assert membership_functions(analyse_code(code, index, "m")) == []
+
+def test_digest_changes_with_parameter_types():
+    first, second = ProjectIndex(), ProjectIndex()
+    first.add_module("m", LOOKUP + "contains({1}, 1)\n")
+    second.add_module("m", LOOKUP + "contains([1], 1)\n")
+    assert first.solve().digest("m") != second.solve().digest("m")
@@ -1,3 +1,4 @@
+import json
 import subprocess
 import os
 import textwrap  # ✅ Add this import
@@ -28,3 +29,21 @@ def test_cli_runs(tmp_path):
     assert os.path.exists(report_file)
     assert os.path.exists(csv_file)
     assert "Sustainability Score" in result.stdout
+
+def test_cli_streams_jsonl(tmp_path):
+    (tmp_path / "a.py").write_text("numbers = [1, 2, 3]\nif 2 in numbers:\n    pass\n")
+    (tmp_path / "b.py").write_text("queue = []\nqueue.pop(0)\n")
+    output_file = tmp_path / "findings.jsonl"
+
+    result = subprocess.run([
+        "python", "cli.py",
+        "--input", str(tmp_path),
+        "--format", "jsonl",
+        "--output", str(output_file),
+        "--no-cache"
+    ], capture_output=True, text=True)
+
+    assert result.returncode == 0
+    records = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert {r["file"].rsplit("/", 1)[-1] for r in records} == {"a.py", "b.py"}
+    assert sum(1 for r in records if r["kind"] == "summary") == 2
@@ -0,0 +1,42 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq
+
+import columnar
+from columnar import tee_findings
+from pipeline import iter_findings
+from test_usage_data import make_collector
+
+def test_parquet_export_is_typed_with_metadata(tmp_path):
+    path = tmp_path / "usage.parquet"
+    make_collector().export_columnar(str(path), metadata={"run_label": "abc123"})
+
+    table = pq.read_table(path)
+    assert table.num_rows == 2
+    assert pa.types.is_dictionary(table.schema.field("usage_context").type)
+    assert table.schema.field("line").type == pa.int32()
+    assert table.column("usage_context").to_pylist() == [None, "membership_test"]
+    metadata = table.schema.metadata
+    assert metadata[b"run_label"] == b"abc123"
+    assert b"rule_set_version" in metadata
+
+def test_arrow_stream_spans_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, "BATCH_SIZE", 2)
+    for i in range(3):
+        (tmp_path / f"f{i}.py").write_text("x = [1]\n" + "if 1 in x:\n    pass\n" * (i + 1))
+    path = tmp_path / "findings.arrow"
+
+    passed = list(tee_findings(iter_findings([str(tmp_path)]), str(path), "arrow"))
+    assert sum(1 for _, kind, _ in passed if kind == "summary") == 3
+
+    with pa.ipc.open_file(path) as reader:
+        assert reader.num_record_batches > 1
+        table = reader.read_all()
+    suggestions = [kind for kind in table.column("kind").to_pylist() if kind == "suggestion"]
+    assert len(suggestions) == 6
+    assert {file.rsplit("/", 1)[-1] for file in table.column("file").to_pylist()} == {"f0.py", "f1.py", "f2.py"}
+
+def test_unknown_format_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        columnar.ColumnarWriter(str(tmp_path / "x"), "orc")
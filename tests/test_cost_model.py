@@ -0,0 +1,47 @@
+import textwrap
+from analyser import analyse_code
+from cost_model import calculate_sustainability_score, complexity_order, describe_cost, rank_suggestions
+from pipeline import analyse_source
+
+NESTED = textwrap.dedent("""\
+    data = [1, 2, 3]
+    if 9 in data:
+        pass
+
+    def scan(rows):
+        for row in rows:
+            for col in row:
+                if col in data:
+                    pass
+""")
+
+def test_analyser_records_loop_depth_and_function():
+    memberships = [s for s in analyse_code(NESTED) if s['usage_context'] == 'membership_test']
+    assert [(s['line'], s['loop_depth'], s['function']) for s in memberships] == [
+        (2, 0, None),
+        (8, 2, 'scan')
+    ]
+
+def test_loop_depth_counts_comprehensions_and_while():
+    code = textwrap.dedent("""\
+        while pending:
+            pending.pop(0)
+        squares = [[x.pop() for x in row] for row in grid]
+    """)
+    depths = {s['line']: s['loop_depth'] for s in analyse_code(code) if s['usage_context'] == 'append_or_pop'}
+    assert depths == {2: 1, 3: 2}
+
+def test_nested_membership_ranks_first_and_costs_more():
+    _, suggestions = analyse_source(NESTED)
+    assert [s['line'] for s in suggestions] == [8, 2]
+    assert complexity_order(suggestions[0]) == 3
+    assert describe_cost(suggestions[0]) == "O(n^3) (inside 2 loops, in scan)"
+    assert calculate_sustainability_score(suggestions) == 100 - 2 - 18
+
+def test_flat_suggestions_keep_two_point_penalty():
+    suggestions = [
+        {'line': 1, 'usage_context': 'membership_test', 'loop_depth': 0},
+        {'line': 2, 'usage_context': 'manual_counter', 'loop_depth': 0}
+    ]
+    assert calculate_sustainability_score(suggestions) == 96
+    assert [s['line'] for s in rank_suggestions(suggestions)] == [1, 2]
@@ -0,0 +1,109 @@
+import socket
+import subprocess
+import threading
+
+import pytest
+
+from daemon import AnalysisService, call_daemon, create_server, request_analysis
+from patterns import pattern_pack
+from pipeline import analyse_source
+
+CODE = "items = [1, 2, 3]\nif 2 in items:\n    pass\n"
+
+@pytest.fixture
+def daemon_url():
+    server = create_server(AnalysisService(), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_health_endpoint(daemon_url):
+    assert call_daemon(daemon_url, "GET", "/health") == {"status": "ok"}
+
+def test_analyse_matches_local_pipeline(daemon_url, tmp_path):
+    path = tmp_path / "sample.py"
+    path.write_text(CODE)
+
+    assert request_analysis(daemon_url, str(path)) == analyse_source(CODE)
+
+def test_analyse_inline_source(daemon_url):
+    response = call_daemon(daemon_url, "POST", "/analyse", {"source": CODE, "name": "inline.py"})
+    assert response["file"] == "inline.py"
+    assert response["suggestions"]
+    assert 0 <= response["score"] <= 100
+
+def test_bad_requests_are_reported_and_counted(daemon_url):
+    with pytest.raises(ValueError):
+        call_daemon(daemon_url, "POST", "/analyse", {})
+    with pytest.raises(ValueError):
+        call_daemon(daemon_url, "POST", "/analyse", {"source": CODE, "packs": ["missing"]})
+
+    call_daemon(daemon_url, "POST", "/analyse", {"source": CODE})
+    metrics = call_daemon(daemon_url, "GET", "/metrics")
+    assert (metrics["requests"], metrics["errors"]) == (3, 2)
+    assert metrics["latency_ms"]["p50"] is not None
+
+@pytest.mark.parametrize("payload", [
+    [], {"source": 123}, {"path": ["a.py"]}, {"source": CODE, "packs": "memory"}, {"source": CODE, "rules": ["r"]}
+])
+def test_malformed_requests_get_400(daemon_url, payload):
+    with pytest.raises(ValueError, match="must be"):
+        call_daemon(daemon_url, "POST", "/analyse", payload)
+    assert call_daemon(daemon_url, "GET", "/metrics")["errors"] == 1
+
+def test_unexpected_errors_get_500(daemon_url, monkeypatch):
+    def fail(request):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(AnalysisService, "analyse", lambda self, request: fail(request))
+    with pytest.raises(ValueError, match="RuntimeError: boom"):
+        call_daemon(daemon_url, "POST", "/analyse", {"source": CODE})
+    assert call_daemon(daemon_url, "GET", "/metrics")["errors"] == 1
+    assert call_daemon(daemon_url, "GET", "/health") == {"status": "ok"}
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available")
+def test_unix_socket_transport(tmp_path):
+    socket_path = str(tmp_path / "daemon.sock")
+    server = create_server(AnalysisService(), socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert call_daemon(f"unix://{socket_path}", "GET", "/health") == {"status": "ok"}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+@pytest.mark.parametrize("flags", [["--interprocedural"], ["--format", "jsonl"], ["--since", "HEAD"]])
+def test_cli_rejects_options_the_daemon_cannot_apply(flags):
+    result = subprocess.run(
+        ["python", "cli.py", "--input", "cli.py", "--daemon", "http://127.0.0.1:9"] + flags,
+        capture_output=True, text=True
+    )
+    assert result.returncode == 2
+    assert "--daemon cannot be combined with" in result.stderr
+
+RULES = [{"id": "keys-membership", "pattern": "$K in $D.keys()", "suggestion": "Test membership on the dict."}]
+
+def test_pattern_rules_are_compiled_once_per_version(daemon_url, tmp_path):
+    path = tmp_path / "sample.py"
+    path.write_text("d = {}\nif 1 in d.keys():\n    pass\n")
+
+    structures, suggestions = request_analysis(daemon_url, str(path), rules=RULES)
+    assert (structures, suggestions) == analyse_source(path.read_text(), packs=[pattern_pack(RULES)])
+    assert any(struct.usage_context == "pattern:keys-membership" for struct in structures)
+    assert request_analysis(daemon_url, str(path)) != (structures, suggestions)
+
+    service = AnalysisService()
+    assert service.pattern_pack_for(RULES) is service.pattern_pack_for([dict(RULES[0])])
+
+def test_cli_forwards_rules_file_to_daemon(daemon_url, tmp_path):
+    (tmp_path / "sample.py").write_text("d = {}\nif 1 in d.keys():\n    pass\n")
+    result = subprocess.run(
+        ["python", "cli.py", "--input", str(tmp_path / "sample.py"), "--daemon", daemon_url,
+         "--rules-file", "examples/rules/pattern_rules.json", "--verbose", "--output", str(tmp_path / "r.md")],
+        capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Test membership on the dict itself" in result.stdout
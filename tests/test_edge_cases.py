@@ -212,3 +212,9 @@ def test_class_with_non_name_decorator():
     """)
     result = analyse_code(code)
     assert isinstance(result, list)
+
+def test_too_deeply_nested_code_raises_value_error():
+    code = "x = " + "+".join(["1"] * 200000)
+    with pytest.raises(ValueError) as e:
+        analyse_code(code)
+    assert "too deeply nested" in str(e.value)
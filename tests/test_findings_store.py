@@ -0,0 +1,57 @@
+import subprocess
+
+import findings_store
+from findings_store import FindingsStore
+from records import Finding, Suggestion
+
+def suggestion(line, usage_context):
+    return Suggestion(line, "List", usage_context, "Use a set.", "Hashing.", "Faster.")
+
+def test_aggregates_across_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(findings_store, "BATCH_SIZE", 2)
+    store = FindingsStore(str(tmp_path / "findings.db"))
+    for run in range(3):
+        run_id = store.start_run(f"run-{run}")
+        store.add(run_id, "a.py", "structure", Finding(1, "List", "", "membership_test"))
+        store.add(run_id, "a.py", "suggestion", suggestion(1, "membership_test"))
+        store.add(run_id, "b.py", "suggestion", suggestion(4, "queue_operation"))
+        if run == 2:
+            store.add(run_id, "b.py", "suggestion", suggestion(9, "membership_test"))
+        store.add(run_id, "b.py", "summary", {"score": 96})
+    store.flush()
+
+    assert store.per_file() == [("b.py", 4), ("a.py", 3)]
+    assert store.per_rule(file="b.py") == [("queue_operation", 3), ("membership_test", 1)]
+    assert store.per_run(usage_context="membership_test", last_runs=2) == [(2, 1), (3, 2)]
+    assert store.per_file(kind="structure") == [("a.py", 3)]
+    store.close()
+
+def test_cli_records_runs(tmp_path):
+    source = tmp_path / "sample.py"
+    source.write_text("numbers = [1, 2, 3]\nif 2 in numbers:\n    pass\n")
+    database = tmp_path / "findings.db"
+
+    for _ in range(2):
+        result = subprocess.run([
+            "python", "cli.py", "--input", str(source), "--sqlite", str(database), "--no-cache"
+        ], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+    result = subprocess.run([
+        "python", "findings_store.py", str(database), "runs", "--context", "membership_test"
+    ], capture_output=True, text=True)
+    assert result.stdout.splitlines() == ["1\t1", "1\t2"]
+
+def test_paths_are_stored_in_one_form(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pkg").mkdir()
+    store = FindingsStore(str(tmp_path / "findings.db"))
+    run_id = store.start_run()
+    for path in ("pkg/a.py", "./pkg/a.py", str(tmp_path / "pkg" / "a.py"), "pkg/../pkg/a.py"):
+        store.add(run_id, path, "suggestion", suggestion(1, "membership_test"))
+    store.add(run_id, "/elsewhere/b.py", "suggestion", suggestion(1, "membership_test"))
+    store.flush()
+
+    assert store.per_file() == [("pkg/a.py", 4), ("/elsewhere/b.py", 1)]
+    assert store.per_rule(file="./pkg/a.py") == [("membership_test", 4)]
+    store.close()
@@ -0,0 +1,95 @@
+import os
+import shutil
+import subprocess
+import textwrap
+
+import pytest
+
+from gitdiff import changed_lines, parse_hunks, unquote_path
+from pipeline import iter_findings
+
+DIFF = textwrap.dedent("""\
+    diff --git a/pkg/a.py b/pkg/a.py
+    --- a/pkg/a.py
+    +++ b/pkg/a.py
+    @@ -3 +3 @@ def f():
+    -    x = 1
+    +    x = 2
+    @@ -10,0 +11,2 @@ def g():
+    +    y = 1
+    +    z = 2
+    @@ -20,3 +22,0 @@ def h():
+    -    pass
+    diff --git a/gone.py b/gone.py
+    --- a/gone.py
+    +++ /dev/null
+    @@ -1 +0,0 @@
+    -x = 1
+""")
+
+def test_parse_hunks_collects_added_lines():
+    assert parse_hunks(DIFF) == {"pkg/a.py": {3, 11, 12}}
+
+def test_parse_hunks_decodes_quoted_paths():
+    diff = '+++ "b/caf\\303\\251/tab\\there.py"\n@@ -1 +1,2 @@\n'
+    assert parse_hunks(diff) == {"café/tab\there.py": {1, 2}}
+    assert unquote_path('"a\\"b\\\\c.py"') == 'a"b\\c.py'
+    assert unquote_path("plain.py") == "plain.py"
+
+def git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+@pytest.fixture
+def repo(tmp_path):
+    if shutil.which("git") is None:
+        pytest.skip("git not available")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.email", "test@example.com")
+    git(tmp_path, "config", "user.name", "Test")
+    (tmp_path / "old.py").write_text("items = [1, 2]\nif 1 in items:\n    pass\n")
+    (tmp_path / "same.py").write_text("queue = []\nqueue.pop(0)\n")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "base")
+    return tmp_path
+
+def test_changed_lines_since_ref(repo):
+    (repo / "old.py").write_text("items = [1, 2]\nif 1 in items:\n    pass\nif 2 in items:\n    pass\n")
+    (repo / "new.py").write_text("x = 1\n")
+    (repo / "notes.txt").write_text("not python\n")
+
+    changed = changed_lines("HEAD", [str(repo)])
+    assert {path.rsplit("/", 1)[-1]: lines for path, lines in changed.items()} == {
+        "old.py": {4, 5},
+        "new.py": None,
+    }
+
+def test_findings_filtered_to_changed_lines(repo):
+    (repo / "old.py").write_text("items = [1, 2]\nif 1 in items:\n    pass\nif 2 in items:\n    pass\n")
+
+    changed = changed_lines("HEAD", [str(repo)])
+    records = list(iter_findings(list(changed), changed=changed))
+    suggestions = [record for _, kind, record in records if kind == "suggestion"]
+    assert suggestions and {suggestion["line"] for suggestion in suggestions} == {4}
+
+def test_unknown_ref_raises(repo):
+    with pytest.raises(ValueError):
+        changed_lines("no-such-ref", [str(repo)])
+
+@pytest.mark.parametrize("config", [("diff.mnemonicPrefix", "true"), ("diff.noprefix", "true")])
+def test_changed_lines_ignores_user_diff_config(repo, config):
+    git(repo, "config", *config)
+    for name in ("b", "café"):
+        (repo / name).mkdir()
+        (repo / name / "m.py").write_text("x = 1\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "dirs")
+    for name in ("b", "café"):
+        (repo / name / "m.py").write_text("x = 1\ny = 2\n")
+    (repo / "új.py").write_text("z = 3\n")
+
+    changed = changed_lines("HEAD", [str(repo)])
+    assert {os.path.relpath(path, repo): lines for path, lines in changed.items()} == {
+        os.path.join("b", "m.py"): {2},
+        os.path.join("café", "m.py"): {2},
+        "új.py": None,
+    }
@@ -0,0 +1,79 @@
+import json
+import os
+
+from golden import GoldenManifest, MANIFEST_NAME, check_reports, report_hash
+
+REPORT = "# Report\n_Generated on 2024-01-01 00:00:00_\n\n### Line 2\n- **Suggestion:** Use a set.\n"
+
+def write_pair(tmp_path, name, generated, expected=None):
+    (tmp_path / "generated").mkdir(exist_ok=True)
+    (tmp_path / "expected").mkdir(exist_ok=True)
+    generated_path = tmp_path / "generated" / f"{name}_report.md"
+    generated_path.write_text(generated)
+    if expected is not None:
+        (tmp_path / "expected" / f"{name}_expected.md").write_text(expected)
+    return str(generated_path), f"{name}_expected.md"
+
+def test_hash_ignores_timestamps_and_line_endings(tmp_path):
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    a.write_text(REPORT)
+    b.write_bytes(REPORT.replace("2024-01-01", "2025-06-30").replace("\n", "\r\n").encode())
+    assert report_hash(str(a)) == report_hash(str(b))
+    assert report_hash(str(tmp_path / "missing.md")) is None
+
+def test_check_reports_passes_fails_and_records_manifest(tmp_path):
+    pairs = [
+        write_pair(tmp_path, "same", REPORT, REPORT.replace("2024", "2023")),
+        write_pair(tmp_path, "changed", REPORT, REPORT.replace("a set", "a deque")),
+        write_pair(tmp_path, "new", REPORT),
+    ]
+    results = check_reports(pairs, str(tmp_path / "expected"), workers=2)
+
+    assert [status for _, status, _ in results] == ["PASSED", "FAILED", "FAILED"]
+    assert "-- **Suggestion:** Use a deque." in results[1][2]
+    manifest = json.loads((tmp_path / "expected" / MANIFEST_NAME).read_text())
+    assert set(manifest) == {"same_expected.md", "changed_expected.md"}
+
+def test_refresh_rewrites_only_changed_reports(tmp_path):
+    pairs = [
+        write_pair(tmp_path, "same", REPORT, REPORT),
+        write_pair(tmp_path, "changed", REPORT, REPORT.replace("a set", "a deque")),
+    ]
+    expected_dir = str(tmp_path / "expected")
+    results = check_reports(pairs, expected_dir, refresh=True, workers=1)
+    assert [status for _, status, _ in results] == ["UNCHANGED", "UPDATED"]
+
+    assert [status for _, status, _ in check_reports(pairs, expected_dir, workers=1)] == ["PASSED", "PASSED"]
+    assert GoldenManifest(expected_dir).stale(["same_expected.md", "changed_expected.md"]) == []
+
+def test_stale_manifest_entry_is_rehashed(tmp_path):
+    pairs = [write_pair(tmp_path, "edited", REPORT, REPORT)]
+    expected_dir = str(tmp_path / "expected")
+    check_reports(pairs, expected_dir, workers=1)
+
+    (tmp_path / "expected" / "edited_expected.md").write_text(REPORT + "- extra\n")
+    assert [status for _, status, _ in check_reports(pairs, expected_dir, workers=1)] == ["FAILED"]
+
+def test_same_length_edit_is_rehashed(tmp_path):
+    pairs = [write_pair(tmp_path, "edited", REPORT, REPORT)]
+    expected_dir = str(tmp_path / "expected")
+    assert [status for _, status, _ in check_reports(pairs, expected_dir, workers=1)] == ["PASSED"]
+
+    expected = tmp_path / "expected" / "edited_expected.md"
+    mtime_ns = expected.stat().st_mtime_ns
+    expected.write_text(REPORT.replace("a set", "a bag"))
+    os.utime(expected, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    assert [status for _, status, _ in check_reports(pairs, expected_dir, workers=1)] == ["FAILED"]
+
+def test_fresh_checkout_rehashes_without_rewriting_manifest(tmp_path):
+    pairs = [write_pair(tmp_path, "same", REPORT, REPORT)]
+    expected_dir = str(tmp_path / "expected")
+    check_reports(pairs, expected_dir, workers=1)
+    manifest_path = tmp_path / "expected" / MANIFEST_NAME
+    committed = {name: {"hash": entry["hash"], "size": entry["size"]}
+                 for name, entry in json.loads(manifest_path.read_text()).items()}
+    manifest_path.write_text(json.dumps(committed))
+
+    assert GoldenManifest(expected_dir).stale(["same_expected.md"]) == ["same_expected.md"]
+    assert [status for _, status, _ in check_reports(pairs, expected_dir, workers=1)] == ["PASSED"]
+    assert json.loads(manifest_path.read_text()) == committed
@@ -0,0 +1,82 @@
+from analyser import analyse_code
+from memory_rules import MemoryPack, array_saving, dict_row_saving, int_typecode, slots_saving
+from pipeline import analyse_source
+
+CODE = """\
+from dataclasses import dataclass
+
+def load(rows):
+    points = [Point(r[0], r[1]) for r in rows]
+    records = []
+    for r in rows:
+        records.append({"id": r[0], "name": r[1]})
+    return points
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+class Slotted:
+    __slots__ = ("a",)
+
+@dataclass(slots=True)
+class Fast:
+    a: int
+
+class Config:
+    pass
+
+for i in range(10):
+    Slotted(); Fast(1)
+
+ids = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16]
+squares = [i * i for i in range(1000)]
+names = [str(i) for i in range(1000)]
+table = [{"a": 1, "b": 2}, {"b": 3, "a": 4}]
+Config()
+"""
+
+def memory_findings(code):
+    return [
+        (s['line'], s['usage_context']) for s in analyse_code(code, packs=(MemoryPack,))
+        if s.get('usage_context') in ('missing_slots', 'numeric_list', 'list_of_dicts')
+    ]
+
+def test_memory_pack_detects_footprint_patterns():
+    assert sorted(memory_findings(CODE)) == [
+        (7, 'list_of_dicts'),
+        (10, 'missing_slots'),
+        (28, 'numeric_list'),
+        (29, 'numeric_list'),
+        (31, 'list_of_dicts'),
+    ]
+
+def test_class_finding_uses_deepest_instantiation_and_estimates_saving():
+    finding = next(s for s in analyse_code(CODE, packs=(MemoryPack,)) if s.get('usage_context') == 'missing_slots')
+    assert finding['loop_depth'] == 1
+    assert finding['function'] is None
+    assert finding['bytes_saved'] == slots_saving(2) > 0
+
+def test_saving_estimates_are_positive():
+    assert int_typecode([1, 200]) == ('h', 2)
+    assert int_typecode([2 ** 40]) == ('q', 8)
+    assert array_saving("int") > 0 and array_saving("float") > 0
+    assert dict_row_saving(3) > 0
+
+def test_slots_saving_grows_with_attribute_count_and_ignores_tracing():
+    import tracemalloc
+
+    savings = [slots_saving(count) for count in range(1, 20)]
+    assert all(later > earlier for earlier, later in zip(savings, savings[1:]))
+
+    tracemalloc.start()
+    try:
+        assert [slots_saving(count) for count in range(1, 20)] == savings
+    finally:
+        tracemalloc.stop()
+
+def test_suggestions_carry_bytes_saved():
+    _, suggestions = analyse_source(CODE, packs=(MemoryPack,))
+    memory = [s for s in suggestions if s['usage_context'] == 'missing_slots']
+    assert memory and memory[0]['bytes_saved'] == slots_saving(2)
@@ -0,0 +1,54 @@
+import csv
+import json
+
+from batch_run import run_shard
+from merge_shards import merge_shards
+
+def write_tree(directory):
+    (directory / "a.py").write_text("numbers = [1, 2, 3]\nif 2 in numbers:\n    pass\n")
+    (directory / "b.py").write_text("queue = []\nqueue.pop(0)\n")
+    (directory / "c.py").write_text("def broken(:")
+    (directory / "pkg").mkdir()
+    (directory / "pkg" / "d.py").write_text("x = 1\n")
+
+def test_merged_shards_match_single_shard(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    write_tree(source)
+
+    single = tmp_path / "single.jsonl"
+    assert run_shard([str(source)], 1, 1, str(single), workers=1) == 4
+
+    shards = []
+    for index in (1, 2, 3):
+        shard = tmp_path / f"shard-{index}.jsonl"
+        run_shard([str(source)], index, 3, str(shard), workers=1)
+        shards.append(str(shard))
+
+    merged_csv = tmp_path / "merged.csv"
+    single_csv = tmp_path / "single.csv"
+    totals = merge_shards(shards, csv_path=str(merged_csv))
+    assert totals == merge_shards([str(single)], csv_path=str(single_csv))
+    assert merged_csv.read_text() == single_csv.read_text()
+    assert (totals["files"], totals["errors"]) == (3, 1)
+
+    rows = list(csv.DictReader(merged_csv.open()))
+    assert {row["file"] for row in rows} == {"a.py", "b.py"}
+
+def test_merged_report_groups_suggestions_by_file(tmp_path):
+    shard = tmp_path / "shard.jsonl"
+    records = [
+        {"file": "a.py", "kind": "suggestion", "line": 2, "current_type": "List", "usage_context": "membership_test",
+         "suggestion": "Use a set.", "explanation": "Hashing.", "impact_estimate": "Faster."},
+        {"file": "a.py", "kind": "summary", "score": 98, "structures": 1, "suggestions": 1},
+        {"file": "b.py", "kind": "summary", "score": 100, "structures": 0, "suggestions": 0},
+    ]
+    shard.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+    report = tmp_path / "report.md"
+    totals = merge_shards([str(shard)], report_path=str(report))
+    text = report.read_text()
+    assert totals["score"] == 99
+    assert "## Sustainability Score: 99/100" in text
+    assert "## a.py" in text and "## b.py" not in text
+    assert "### Line 2" in text
@@ -0,0 +1,59 @@
+import microbench
+from microbench import BENCHMARKS, ImpactEstimator, size_bucket
+from rules import rules
+
+def test_every_rule_benchmark_exists():
+    assert all(rule.benchmark in BENCHMARKS for rule in rules)
+
+def test_size_bucket_rounds_up_to_power_of_two():
+    assert size_bucket(1) == 16
+    assert size_bucket(1000) == 1024
+    assert size_bucket(1024) == 1024
+
+def test_membership_benchmark_favours_set():
+    current, suggested = BENCHMARKS["membership"](512)
+    assert current > suggested
+
+def test_measure_uses_observed_size_and_caches_per_host(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_benchmark(n):
+        calls.append(n)
+        return 3.0, 1.0
+
+    monkeypatch.setitem(microbench.BENCHMARKS, "membership", fake_benchmark)
+    suggestions = [
+        {'line': 1, 'suggestion': rules[0].suggestion, 'benchmark': 'membership', 'observed_size': 300},
+        {'line': 2, 'suggestion': 'Unknown advice.', 'benchmark': None}
+    ]
+    ImpactEstimator(cache_dir=str(tmp_path)).measure(suggestions)
+
+    assert suggestions[0]['speedup'] == 3.0
+    assert suggestions[0]['benchmark_size'] == 512
+    assert 'speedup' not in suggestions[1]
+
+    # A second estimator on the same host reads the cached result instead of re-running
+    ImpactEstimator(cache_dir=str(tmp_path)).measure([{'line': 3, 'benchmark': 'membership', 'observed_size': 500}])
+    assert calls == [512]
+
+def test_quadratic_benchmarks_are_capped(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setitem(microbench.BENCHMARKS, "join", lambda n: calls.append(n) or (2.0, 1.0))
+    suggestions = [{'line': 1, 'benchmark': 'join', 'observed_size': 100_000}]
+    ImpactEstimator(cache_dir=str(tmp_path)).measure(suggestions)
+    assert calls == [microbench.MAX_SIZES["join"]]
+    assert suggestions[0]['benchmark_size'] == microbench.MAX_SIZES["join"]
+
+def test_uncapped_benchmarks_scale_linearly():
+    # A 16x larger input should take about 16x as long; a quadratic current side takes ~256x
+    # and must be listed in MAX_SIZES
+    for name, benchmark in BENCHMARKS.items():
+        if name in microbench.MAX_SIZES:
+            continue
+        small, large = benchmark(1024)[0], benchmark(16384)[0]
+        assert large / small < 64, name
+
+def test_rules_attach_benchmark_name_to_suggestions():
+    structure = {'line': 1, 'type': 'Membership test on list', 'usage_context': 'membership_test'}
+    rule = next(rule for rule in rules if rule.benchmark == "membership")
+    assert rule.apply(structure)['benchmark'] == "membership"
@@ -0,0 +1,46 @@
+from analyser import analyse_code
+from pandas_rules import PandasPack
+from pipeline import analyse_source
+
+CODE = """\
+import pandas as pd
+import numpy as np
+
+df = pd.read_csv("data.csv")
+out = pd.DataFrame()
+for idx, row in df.iterrows():
+    out = out.append(row)
+    frames = pd.concat([out, df])
+    df.loc[idx, "total"] = row["a"] + row["b"]
+df["x"] = df.apply(lambda r: r.a * 2, axis=1)
+arr = np.zeros(100)
+for i in range(len(arr)):
+    arr[i] = i * 2
+"""
+
+def contexts(code, packs=(PandasPack,)):
+    return [(s['line'], s['usage_context']) for s in analyse_code(code, packs=packs) if s.get('usage_context')]
+
+def test_pack_detects_pandas_and_numpy_patterns():
+    assert contexts(CODE) == [
+        (6, 'pandas_iterrows'),
+        (7, 'pandas_grow_in_loop'),
+        (8, 'pandas_grow_in_loop'),
+        (9, 'pandas_scalar_write'),
+        (10, 'pandas_row_apply'),
+        (12, 'numpy_python_loop'),
+    ]
+
+def test_pack_is_disabled_by_default():
+    # Without the pack, out.append(row) still looks like a list used as a queue
+    assert contexts(CODE, packs=()) == [(7, 'append_or_pop')]
+
+def test_imported_names_and_aliases_are_recognised():
+    code = "import numpy as numeric\nfrom pandas import DataFrame\nframe = DataFrame()\nfor x in numeric.arange(5):\n    frame = frame.append(x)\n"
+    assert contexts(code) == [(4, 'numpy_python_loop'), (5, 'pandas_grow_in_loop')]
+
+def test_pack_rules_produce_suggestions():
+    _, suggestions = analyse_source(CODE, packs=(PandasPack,))
+    assert {s['usage_context'] for s in suggestions} == {
+        'pandas_iterrows', 'pandas_grow_in_loop', 'pandas_scalar_write', 'pandas_row_apply', 'numpy_python_loop'
+    }
@@ -0,0 +1,96 @@
+import textwrap
+
+import pytest
+
+from analyser import analyse_code
+from cache import packs_version
+from patterns import PatternIndex, PatternRule, load_pattern_pack, parse_pattern, pattern_pack
+from pipeline import analyse_source
+
+CODE = textwrap.dedent("""\
+    d = {}
+    items = []
+    for i in range(len(items)):
+        items.insert(0, i)
+        if i in d.keys():
+            pass
+    items.insert(0, 5)
+    print(items, items)
+    print(items, d)
+""")
+
+RULES = [
+    {"id": "insert-front", "pattern": "$X.insert(0, $_)", "in_loop": True, "type": "List",
+     "details": "{X}.insert(0, ...)", "suggestion": "Use a deque."},
+    {"id": "keys", "pattern": "$K in $D.keys()", "suggestion": "Test the dict directly."},
+    {"id": "range-len", "pattern": "for $I in range(len($X)):\n    $$_", "suggestion": "Use enumerate()."},
+    {"id": "same-twice", "pattern": "print($A, $A)", "suggestion": "Print once."},
+]
+
+def matches(code, rules=RULES):
+    findings = analyse_code(code, packs=[pattern_pack(rules)])
+    return [(f["line"], f["usage_context"]) for f in findings if (f["usage_context"] or "").startswith("pattern:")]
+
+def test_patterns_match_with_placeholders():
+    assert matches(CODE) == [
+        (3, "pattern:range-len"),
+        (4, "pattern:insert-front"),
+        (5, "pattern:keys"),
+        (8, "pattern:same-twice"),
+    ]
+
+def test_details_substitute_bindings():
+    findings = analyse_code(CODE, packs=[pattern_pack(RULES[:1])])
+    assert [f["details"] for f in findings if f["usage_context"] == "pattern:insert-front"] == ["items.insert(0, ...)"]
+
+def test_pattern_rules_produce_suggestions():
+    _, suggestions = analyse_source(CODE, packs=[pattern_pack(RULES)])
+    assert {s["suggestion"] for s in suggestions} >= {"Use a deque.", "Test the dict directly.", "Use enumerate()."}
+
+def test_index_only_checks_patterns_for_the_same_call():
+    rules = [PatternRule({"id": f"r{i}", "pattern": f"$X.method_{i}()", "suggestion": "s"}) for i in range(500)]
+    index = PatternIndex(rules)
+    keyed, general = index.by_type[type(parse_pattern("f()"))]
+    assert len(keyed) == 500 and not general
+    call = parse_pattern("obj.method_7()")
+    assert [rule.id for rule, _ in index.match(call)] == ["r7"]
+
+@pytest.mark.parametrize("spec", [
+    {"id": "bare", "pattern": "$X", "suggestion": "s"},
+    {"id": "two", "pattern": "a = 1\nb = 2", "suggestion": "s"},
+    {"id": "variadic", "pattern": "f($$A, $$B)", "suggestion": "s"},
+    {"id": "missing", "pattern": "f()"},
+])
+def test_invalid_rules_rejected(spec):
+    with pytest.raises(ValueError):
+        pattern_pack([spec])
+
+def test_example_rules_file_loads_and_versions_cache():
+    pack = load_pattern_pack(["examples/rules/pattern_rules.json"])
+    other = pattern_pack(RULES)
+    assert packs_version([pack]) != packs_version([other])
+    code = "xs = [1]\nfor i in range(len(xs)):\n    xs = list(xs)\n"
+    assert [(f["line"], f["usage_context"]) for f in analyse_code(code, packs=[pack])
+            if (f["usage_context"] or "").startswith("pattern:")] == [
+        (2, "pattern:range-len-loop"), (3, "pattern:list-in-loop-copy")
+    ]
+
+def test_patterns_match_inside_reported_attribute_chains():
+    rules = [{"id": "os-path", "pattern": "os.path", "suggestion": "s"}]
+    code = "import os\nx = os.path.sep\nfor item in items:\n    y = os.path.sep\n    os.path.join(item)\n"
+    assert matches(code, rules) == [(2, "pattern:os-path"), (4, "pattern:os-path"), (5, "pattern:os-path")]
+    assert [(s["line"], s["target"]) for s in analyse_code(code) if s["usage_context"] == "repeated_lookup"] == [
+        (4, "os.path.sep")
+    ]
+
+def test_order_is_kept_on_the_rule_not_the_global_cost_model():
+    from cost_model import BASE_ORDER, complexity_order
+
+    code = "for item in items:\n    items.insert(0, item)\n"
+    orders = []
+    for order in (1, 2):
+        spec = {"id": "front", "pattern": "$X.insert(0, $_)", "suggestion": "Use a deque.", "order": order}
+        _, suggestions = analyse_source(code, packs=[pattern_pack([spec])])
+        orders.append([complexity_order(s) for s in suggestions if s["usage_context"] == "pattern:front"])
+    assert orders == [[2], [3]]
+    assert "pattern:front" not in BASE_ORDER
@@ -0,0 +1,52 @@
+import io
+import json
+from pipeline import iter_findings, iter_python_files, write_jsonl
+
+def make_tree(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("numbers = [1, 2, 3]\nif 2 in numbers:\n    pass\n")
+    (tmp_path / "pkg" / "b.py").write_text("def broken(:")
+    (tmp_path / "pkg" / "notes.txt").write_text("not python")
+    (tmp_path / "pkg" / "__pycache__").mkdir()
+    (tmp_path / "pkg" / "__pycache__" / "c.py").write_text("x = []")
+    return tmp_path / "pkg"
+
+def test_iter_python_files_expands_directories(tmp_path):
+    root = make_tree(tmp_path)
+    files = list(iter_python_files([str(root)]))
+    assert [f.rsplit("/", 1)[-1] for f in files] == ["a.py", "b.py"]
+
+def test_iter_findings_yields_per_file_records(tmp_path):
+    root = make_tree(tmp_path)
+    items = list(iter_findings([str(root)]))
+    kinds = [kind for _, kind, _ in items]
+    assert kinds == ["structure", "structure", "suggestion", "summary", "error"]
+    assert items[3][2]["score"] == 98
+    assert "Syntax error" in items[4][2]["error"]
+
+def test_iter_findings_is_lazy(tmp_path):
+    root = make_tree(tmp_path)
+    findings = iter_findings([str(root)])
+    path, kind, _ = next(findings)
+    assert path.endswith("a.py") and kind == "structure"
+
+def test_write_jsonl(tmp_path):
+    root = make_tree(tmp_path)
+    stream = io.StringIO()
+    count = write_jsonl(iter_findings([str(root)]), stream)
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert count == len(lines) == 5
+    assert lines[2]["kind"] == "suggestion"
+    assert lines[2]["suggestion"] == "Use a set for membership testing."
+
+def test_write_jsonl_flushes_once_per_file(tmp_path):
+    class CountingStream(io.StringIO):
+        flushes = 0
+
+        def flush(self):
+            self.flushes += 1
+
+    root = make_tree(tmp_path)
+    stream = CountingStream()
+    write_jsonl(iter_findings([str(root)]), stream)
+    assert stream.flushes == 2
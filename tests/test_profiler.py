@@ -0,0 +1,63 @@
+import textwrap
+from cost_model import rank_suggestions
+from pipeline import analyse_source
+from profiler import apply_profile, profile_script
+
+SCRIPT = textwrap.dedent("""\
+    names = list(range(50))
+    pending = [1, 2, 3]
+
+    def hot():
+        for i in range(20):
+            if i in names:
+                pass
+
+    def cold():
+        for i in range(20):
+            if i in names:
+                pass
+
+    hot()
+    pending.pop(0)
+""")
+
+def profile(tmp_path, script=SCRIPT, target=None):
+    path = tmp_path / "script.py"
+    path.write_text(script)
+    structures, suggestions = analyse_source(script)
+    return profile_script(str(path), structures, target), suggestions
+
+def test_counts_executions_and_collection_sizes(tmp_path):
+    result, _ = profile(tmp_path)
+    assert result.executions == {6: 20, 15: 1}
+    assert result.max_sizes == {6: 50, 15: 3}
+
+def test_unexecuted_findings_rank_last(tmp_path):
+    result, suggestions = profile(tmp_path)
+    ranked = rank_suggestions(apply_profile(suggestions, result))
+    assert [s['line'] for s in ranked] == [6, 15, 11]
+    assert ranked[-1]['executions'] == 0
+    assert ranked[0]['observed_size'] == 50
+
+def test_profiles_module_run_by_another_script(tmp_path):
+    (tmp_path / "driver.py").write_text(textwrap.dedent(f"""\
+        import sys
+        sys.path.insert(0, {str(tmp_path)!r})
+        import script
+        script.cold()
+    """))
+    result, _ = profile(tmp_path, target=str(tmp_path / "driver.py"))
+    assert result.executions == {6: 20, 11: 20, 15: 1}
+
+def test_script_can_import_sibling_modules(tmp_path):
+    (tmp_path / "helper_for_profile.py").write_text("def size():\n    return 7\n")
+    script = "import helper_for_profile\nitems = list(range(helper_for_profile.size()))\nif 3 in items:\n    pass\n"
+    result, _ = profile(tmp_path, script=script)
+    assert result.executions == {3: 1}
+    assert result.max_sizes == {3: 7}
+
+def test_exception_in_script_keeps_partial_profile(tmp_path, capsys):
+    script = "names = [1, 2]\nif 1 in names:\n    pass\nraise RuntimeError('boom')\n"
+    result, _ = profile(tmp_path, script=script)
+    assert result.executions == {2: 1}
+    assert "RuntimeError: boom" in capsys.readouterr().err
@@ -0,0 +1,32 @@
+import json
+from records import Finding, Suggestion
+
+def test_finding_behaves_like_dict():
+    finding = Finding(3, "List", "Ordered, mutable, allows duplicates.")
+    assert finding["line"] == 3
+    assert finding.get("usage_context") is None
+    assert finding.get("missing", "default") == "default"
+    assert dict(finding) == {
+        "line": 3,
+        "type": "List",
+        "details": "Ordered, mutable, allows duplicates.",
+        "usage_context": None,
+        "loop_depth": 0,
+        "function": None,
+        "target": None,
+        "bytes_saved": None
+    }
+    assert finding == dict(finding)
+    assert json.loads(json.dumps(finding.to_dict()))["type"] == "List"
+
+def test_finding_has_no_instance_dict():
+    finding = Finding(1, "Tuple")
+    assert not hasattr(finding, "__dict__")
+
+def test_finding_interns_type_names():
+    name = "".join(["Membership Test on ", "numbers"])
+    assert Finding(1, name).type is Finding(2, "Membership Test on numbers").type
+
+def test_suggestion_round_trips_through_dict():
+    suggestion = Suggestion(4, "List", "append_or_pop", "Use deque.", "Faster.", "Less work.")
+    assert Suggestion.from_dict(suggestion.to_dict()) == suggestion
@@ -19,3 +19,24 @@ def test_generate_markdown_report(tmp_path):
         content = f.read()
         assert 'Line 3' in content
         assert 'Sustainability Score' in content
+
+def test_report_includes_measurements(tmp_path):
+    suggestions = [
+        {
+            'line': 5,
+            'current_type': 'Membership Test on names',
+            'usage_context': 'membership_test',
+            'loop_depth': 1,
+            'function': 'hot',
+            'executions': 20,
+            'observed_size': 50,
+            'suggestion': 'Use a set for membership testing.',
+            'explanation': 'Sets are faster for membership checks.',
+            'impact_estimate': 'Large efficiency gain.'
+        }
+    ]
+    report_file = tmp_path / "measured_report.md"
+    ReportGenerator(suggestions).generate_markdown_report(file_name=str(report_file))
+    content = report_file.read_text()
+    assert '**Estimated cost:** O(n^2) (inside 1 loop, in hot)' in content
+    assert '**Measured:** executed 20 times, collection size up to 50' in content
@@ -20,3 +20,17 @@ def test_queue_like_usage_rule_trigger():
     suggestion = rule.apply(structure)
     assert suggestion is not None
     assert 'deque' in suggestion['suggestion']
+
+def test_hot_loop_rules_trigger_on_their_contexts():
+    expected = {
+        'string_concat': "''.join",
+        'repeated_sort': 'heapq',
+        'nested_loop_join': 'dict',
+        'insert_front': 'appendleft',
+        'repeated_lookup': 'Hoist',
+    }
+    for context, text in expected.items():
+        matches = [rule.apply({'type': 'X', 'usage_context': context}) for rule in rules]
+        matches = [match for match in matches if match is not None]
+        assert len(matches) == 1
+        assert text in matches[0]['suggestion']
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+import time
+
+# Cold `cli.py --input` must stay well inside a pre-commit hook's budget.
+# Override with CLI_STARTUP_BUDGET (seconds) on slow CI machines.
+STARTUP_BUDGET = float(os.environ.get("CLI_STARTUP_BUDGET", "0.5"))
+
+def test_cli_does_not_import_pandas():
+    result = subprocess.run([
+        sys.executable, "-c",
+        "import sys, cli; print('pandas' in sys.modules)"
+    ], capture_output=True, text=True)
+    assert result.returncode == 0
+    assert result.stdout.strip() == "False"
+
+def test_cold_cli_startup_within_budget(tmp_path):
+    test_file = tmp_path / "sample.py"
+    test_file.write_text("numbers = [1, 2, 3]\nif 2 in numbers:\n    pass\n")
+
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        result = subprocess.run([
+            sys.executable, "cli.py", "--input", str(test_file), "--score", "--no-cache"
+        ], capture_output=True, text=True)
+        timings.append(time.perf_counter() - start)
+        assert result.returncode == 0
+
+    assert min(timings) < STARTUP_BUDGET, f"cold start took {min(timings):.3f}s"
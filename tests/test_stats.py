@@ -0,0 +1,40 @@
+import ast
+import json
+
+import stats
+from analyser import DataStructureAnalyzer, analyse_code
+from pipeline import analyse_source
+from stats import Stats, collect
+
+CODE = "items = [1, 2, 3]\nfor x in range(3):\n    if x in items:\n        items.append(x)\n"
+
+def test_collects_parse_handler_and_rule_timings():
+    with collect() as collected:
+        analyse_source(CODE)
+
+    data = collected.to_dict()
+    assert data["parse"]["ast.parse"]["count"] == 1
+    assert data["handler"]["DataStructureAnalyzer.visit_Compare"]["count"] == 1
+    assert data["rule"]["is_membership_test_on_list"]["count"] >= 1
+    assert json.loads(collected.to_json()) == data
+    assert "visit_Compare" in collected.format_table()
+
+def test_handlers_unwrapped_when_disabled():
+    assert stats.active_stats() is None
+    assert DataStructureAnalyzer().handlers[ast.Compare].__self__ is not None
+    with collect():
+        assert not hasattr(DataStructureAnalyzer().handlers[ast.Compare], "__self__")
+        with_stats = analyse_code(CODE)
+    assert stats.active_stats() is None
+    assert with_stats == analyse_code(CODE)
+
+def test_wrap_counts_calls_and_keeps_results():
+    collected = Stats()
+    double = collected.wrap("rule", "double", lambda value: value * 2)
+    assert [double(1), double(2)] == [2, 4]
+    assert collected.to_dict()["rule"]["double"]["count"] == 2
+
+def test_timer_is_noop_when_disabled():
+    with stats.timer("output", "csv"):
+        pass
+    assert stats.active_stats() is None
@@ -1,4 +1,5 @@
-from suggestor import Suggestor
+from suggestor import Suggestor, build_rule_index
+from rules import SuggestionRule, rules
 
 def test_suggestor_collects_suggestions():
     detected_structures = [
@@ -8,3 +9,39 @@ def test_suggestor_collects_suggestions():
     suggestor = Suggestor(detected_structures)
     suggestions = suggestor.get_suggestions()
     assert len(suggestions) >= 2
+
+def test_rule_index_only_dispatches_matching_contexts():
+    calls = []
+
+    def tracking(name):
+        def condition(structure):
+            calls.append(name)
+            return True
+        return condition
+
+    rule_set = [
+        SuggestionRule(tracking("membership"), "a", "b", "c", usage_contexts={"membership_test"}),
+        SuggestionRule(tracking("general"), "a", "b", "c")
+    ]
+    detected_structures = [
+        {'type': 'List', 'usage_context': None, 'line': 1},
+        {'type': 'Membership Test on x', 'usage_context': 'membership_test', 'line': 2}
+    ]
+    suggestions = Suggestor(detected_structures, rule_set=rule_set).get_suggestions()
+
+    assert calls == ["general", "membership", "general"]
+    assert [s['line'] for s in suggestions] == [1, 2, 2]
+
+def test_build_rule_index_keeps_rule_order():
+    index, general_rules = build_rule_index(rules)
+    assert general_rules == []
+    assert index["membership_test"] == [rules[0]]
+    assert index["append_or_pop"] == [rules[2]]
+
+def test_rule_index_cache_is_bounded():
+    import suggestor
+
+    for _ in range(suggestor.RULE_INDEX_CACHE_SIZE * 2):
+        rule = SuggestionRule(lambda s: True, "s", "e", "i", usage_contexts={"x"})
+        suggestor.get_rule_index(rules + [rule])
+    assert suggestor._cached_rule_index.cache_info().currsize <= suggestor.RULE_INDEX_CACHE_SIZE
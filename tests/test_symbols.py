@@ -0,0 +1,64 @@
+import ast
+from analyser import analyse_code
+from symbols import Scope, infer_type
+
+def membership_lines(code):
+    return [s['line'] for s in analyse_code(code) if s.get('usage_context') == 'membership_test']
+
+def test_infer_type_from_constructors_and_comprehensions():
+    scope = Scope("module")
+    for source, expected in [
+        ("set(xs)", "set"), ("{x for x in xs}", "set"), ("frozenset()", "frozenset"),
+        ("collections.deque()", "deque"), ("{k: 1 for k in xs}", "dict"), ("[1, 2]", "list"),
+        ("a | b", None), ("f(x)", None),
+    ]:
+        assert infer_type(ast.parse(source, mode="eval").body, scope) == expected
+
+def test_lookup_skips_class_scopes_and_honours_shadowing():
+    module = Scope("module")
+    module.bind("items", "set")
+    cls = Scope("class", "C", module)
+    cls.bind("items", "list")
+    method = Scope("function", "C.m", cls)
+    assert method.lookup("items") == "set"
+
+    inner = Scope("function", "f", module)
+    inner.bind("items", None)
+    assert inner.lookup("items") is None
+
+def test_set_constructors_skip_membership_findings():
+    code = "a = set(xs)\nb = {x for x in xs}\nc = frozenset(xs)\nif 1 in a:\n    pass\nif 1 in b:\n    pass\nif 1 in c:\n    pass\n"
+    assert membership_lines(code) == []
+
+def test_shadowed_name_is_typed_per_function():
+    code = (
+        "def f():\n    seen = set()\n    if 1 in seen:\n        pass\n"
+        "def g(seen):\n    if 1 in seen:\n        pass\n"
+    )
+    assert membership_lines(code) == [6]
+
+def test_reassignment_to_list_is_flagged_again():
+    code = "s = {1}\ns = list(s)\nif 1 in s:\n    pass\n"
+    assert membership_lines(code) == [3]
+
+def test_annotated_set_parameter_is_not_flagged():
+    code = "def f(s: set[int], t: 'List[int]'):\n    if 1 in s:\n        pass\n    if 1 in t:\n        pass\n"
+    assert membership_lines(code) == [4]
+
+def test_global_declaration_rebinds_module_name():
+    code = "seen = []\ndef reset():\n    global seen\n    seen = set()\nif 1 in seen:\n    pass\n"
+    assert membership_lines(code) == []
+
+def test_queue_findings_skip_known_deques():
+    code = (
+        "from collections import deque\n"
+        "class Worker:\n"
+        "    def __init__(self):\n        self.jobs = deque()\n        self.done = []\n"
+        "    def run(self):\n        self.jobs.pop()\n        self.done.append(1)\n"
+    )
+    pops = [s['line'] for s in analyse_code(code) if s.get('usage_context') == 'append_or_pop']
+    assert pops == [8]
+
+def test_findings_inside_skipped_membership_test_body_are_kept():
+    code = "s = set()\nitems = []\nif 1 in s:\n    items.pop(0)\n"
+    assert any(s.get('usage_context') == 'append_or_pop' for s in analyse_code(code))
@@ -0,0 +1,35 @@
+import csv
+import json
+from usage_data import UsageDataCollector
+
+def make_collector():
+    collector = UsageDataCollector()
+    collector.add_detected_structure({'line': 1, 'type': 'List', 'details': 'Ordered, mutable.', 'usage_context': None})
+    collector.add_suggestion({
+        'line': 2,
+        'current_type': 'Membership Test on numbers',
+        'usage_context': 'membership_test',
+        'suggestion': 'Use a set for membership testing.',
+        'impact_estimate': 'Faster, cheaper lookups.'
+    })
+    return collector
+
+def test_export_csv_without_pandas(tmp_path):
+    csv_file = tmp_path / "usage.csv"
+    make_collector().export_csv(file_name=str(csv_file))
+
+    lines = csv_file.read_text().splitlines()
+    assert lines[0] == "line,structure_type,details,usage_context,impact_estimate,loop_depth,function,executions,observed_size,speedup,benchmark_size,bytes_saved"
+    assert lines[1] == "1,List,\"Ordered, mutable.\",,,,,,,,,"
+
+    with open(csv_file, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[1]['impact_estimate'] == 'Faster, cheaper lookups.'
+
+def test_export_jsonl(tmp_path):
+    jsonl_file = tmp_path / "usage.jsonl"
+    make_collector().export_jsonl(file_name=str(jsonl_file))
+
+    records = [json.loads(line) for line in jsonl_file.read_text().splitlines()]
+    assert len(records) == 2
+    assert records[1]['usage_context'] == 'membership_test'
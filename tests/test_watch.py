@@ -0,0 +1,65 @@
+import textwrap
+from analyser import analyse_code
+from watch import IncrementalAnalyzer, Watcher
+
+ORIGINAL = textwrap.dedent("""\
+    seen = {1, 2}
+
+    def first(items):
+        if 1 in items:
+            return True
+        return False
+
+    class Queue:
+        def push(self, item):
+            self.items.append(item)
+
+    counts = {}
+    counts['a'] = counts.get('a', 0) + 1
+""")
+
+def test_incremental_matches_full_analysis():
+    analyser = IncrementalAnalyzer()
+    assert analyser.analyse(ORIGINAL) == analyse_code(ORIGINAL)
+    assert analyser.visited == 2
+
+def test_unchanged_definitions_are_reused_after_shift():
+    analyser = IncrementalAnalyzer()
+    analyser.analyse(ORIGINAL)
+
+    edited = "numbers = [1, 2, 3]\n\n" + ORIGINAL.replace("return False", "return None")
+    assert analyser.analyse(edited) == analyse_code(edited)
+    assert (analyser.visited, analyser.reused) == (1, 1)
+
+def test_definition_revisited_when_entry_state_changes():
+    analyser = IncrementalAnalyzer()
+    code = "items = {1}\ndef f():\n    if 1 in items:\n        pass\n"
+    analyser.analyse(code)
+
+    edited = code.replace("items = {1}", "items = [1]")
+    assert analyser.analyse(edited) == analyse_code(edited)
+    assert analyser.visited == 1
+
+def test_watcher_reports_changed_files(tmp_path):
+    source = tmp_path / "module.py"
+    source.write_text(ORIGINAL)
+    watcher = Watcher(str(tmp_path))
+
+    results = list(watcher.poll())
+    assert len(results) == 1 and results[0]["error"] is None
+    assert list(watcher.poll()) == []
+
+    source.write_text(ORIGINAL + "\nqueue = []\nqueue.pop(0)\n")
+    results = list(watcher.poll())
+    assert results[0]["reused"] == 2
+    assert results[0]["score"] < 100
+
+def test_watcher_runs_detector_packs(tmp_path):
+    from memory_rules import MemoryPack
+
+    code = "class Point:\n    def __init__(self):\n        self.x = 1\n\npoints = [Point() for _ in range(10)]\n"
+    (tmp_path / "module.py").write_text(code)
+    result = next(Watcher(str(tmp_path), packs=[MemoryPack]).poll())
+
+    assert result["structures"] == analyse_code(code, packs=[MemoryPack])
+    assert "missing_slots" in [s["usage_context"] for s in result["suggestions"]]
@@ -1,41 +1,102 @@
 # usage_data.py
 
-import pandas as pd
+import csv
+import json
+
+COLUMNS = (
+    "line", "structure_type", "details", "usage_context", "impact_estimate", "loop_depth", "function",
+    "executions", "observed_size", "speedup", "benchmark_size", "bytes_saved"
+)
+
+def structure_row(structure):
+    """Returns the COLUMNS row for a detected structure."""
+    return (
+        structure.get("line"),
+        structure.get("type"),
+        structure.get("details"),
+        structure.get("usage_context"),
+        None,
+        structure.get("loop_depth"),
+        structure.get("function"),
+        None,
+        None,
+        None,
+        None,
+        structure.get("bytes_saved")
+    )
+
+def suggestion_row(suggestion):
+    """Returns the COLUMNS row for a suggestion."""
+    return (
+        suggestion.get("line"),
+        suggestion.get("current_type"),
+        suggestion.get("suggestion"),
+        suggestion.get("usage_context"),
+        suggestion.get("impact_estimate"),
+        suggestion.get("loop_depth"),
+        suggestion.get("function"),
+        suggestion.get("executions"),
+        suggestion.get("observed_size"),
+        suggestion.get("speedup"),
+        suggestion.get("benchmark_size"),
+        suggestion.get("bytes_saved")
+    )
 
 class UsageDataCollector:
     """
-    Collects detected data structure information and suggestions into a pandas DataFrame
-    for export and further analysis.
+    Collects detected data structure information and suggestions as flat rows
+    for export and further analysis. Rows are stored as tuples in COLUMNS order.
+    Exports are written with the standard library; pandas is only imported
+    when a DataFrame is requested.
     """
 
     def __init__(self):
-        self.records = []
+        self.rows = []
 
     def add_detected_structure(self, structure):
         """Adds a detected structure to the records."""
-        self.records.append({
-            "line": structure.get("line"),
-            "structure_type": structure.get("type"),
-            "details": structure.get("details"),
-            "usage_context": structure.get("usage_context")
-        })
+        self.rows.append(structure_row(structure))
 
     def add_suggestion(self, suggestion):
         """Adds a suggestion entry to the records."""
-        self.records.append({
-            "line": suggestion.get("line"),
-            "structure_type": suggestion.get("current_type"),
-            "details": suggestion.get("suggestion"),
-            "usage_context": suggestion.get("usage_context"),
-            "impact_estimate": suggestion.get("impact_estimate")
-        })
+        self.rows.append(suggestion_row(suggestion))
+
+    @property
+    def records(self):
+        """Returns the collected rows as a list of dicts."""
+        return [dict(zip(COLUMNS, row)) for row in self.rows]
+
+    def get_columns(self):
+        """Returns the exported column names."""
+        return list(COLUMNS)
 
     def export_csv(self, file_name="usage_data.csv"):
-        """Exports the collected data to a CSV file."""
-        df = pd.DataFrame(self.records)
-        df.to_csv(file_name, index=False)
+        """Exports the collected data to a CSV file (missing values are left empty)."""
+        with open(file_name, "w", newline="") as f:
+            # csv.writer writes None as an empty cell
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(COLUMNS)
+            writer.writerows(self.rows)
         return file_name
 
+    def export_jsonl(self, file_name="usage_data.jsonl"):
+        """Exports the collected data as one JSON object per line."""
+        with open(file_name, "w") as f:
+            for row in self.rows:
+                f.write(json.dumps(dict(zip(COLUMNS, row))) + "\n")
+        return file_name
+
+    def export_columnar(self, file_name="usage_data.parquet", format="parquet", metadata=None):
+        """
+        Exports the collected data as typed Parquet or Arrow IPC ("arrow") record batches,
+        with run metadata in the schema. Requires pyarrow, which is imported only here.
+        """
+        from columnar import export_rows
+
+        return export_rows(self.rows, file_name, format, metadata)
+
     def get_dataframe(self):
         """Returns the pandas DataFrame of all collected records."""
+        import pandas as pd
+
         return pd.DataFrame(self.records)
@@ -0,0 +1,168 @@
+# watch.py
+
+import ast
+import hashlib
+import os
+import time
+
+from analyser import DataStructureAnalyzer
+from cost_model import calculate_sustainability_score, rank_suggestions
+from pipeline import iter_python_files, rule_set_for
+from suggestor import Suggestor
+
+DEFINITION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+class IncrementalAnalyzer:
+    """
+    Analyses successive versions of one file, re-visiting only the top-level
+    functions and classes whose source changed.
+
+    Findings for each definition are cached with line numbers relative to the
+    definition, keyed by a hash of its source and the module-level types of the
+    names it mentions on entry, so a definition that only moved is reused with
+    its lines shifted.
+
+    With detector packs enabled, the whole file is walked in one pass instead: packs
+    keep module-wide state (imports, class definitions) and report some findings
+    from finalize(), which per-definition reuse cannot reproduce.
+    """
+
+    def __init__(self, packs=()):
+        self.packs = list(packs)
+        # (source hash, entry state of the names used) -> (relative findings, exit state of those names)
+        self.definitions = {}
+        self.reused = 0
+        self.visited = 0
+
+    def analyse(self, code):
+        """Returns the findings for code, matching analyse_code's output."""
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            raise ValueError(f"Syntax error while parsing code: {e}")
+        except RecursionError:
+            raise ValueError("Code is too deeply nested to parse.")
+
+        if self.packs:
+            analyser = DataStructureAnalyzer(packs=self.packs)
+            analyser.visit(tree)
+            analyser.finalize()
+            self.reused = 0
+            self.visited = sum(isinstance(statement, DEFINITION_NODES) for statement in tree.body)
+            return analyser.data_structures
+
+        lines = code.splitlines(keepends=True)
+        analyser = DataStructureAnalyzer()
+        findings = analyser.data_structures
+        definitions = {}
+        self.reused = self.visited = 0
+
+        for statement in tree.body:
+            if not isinstance(statement, DEFINITION_NODES):
+                analyser.visit(statement)
+                continue
+
+            start = min([statement.lineno] + [d.lineno for d in statement.decorator_list])
+            source = "".join(lines[start - 1:statement.end_lineno])
+            # A definition can only read or rebind module names that appear in it (or its own name)
+            names = {node.id for node in ast.walk(statement) if isinstance(node, ast.Name)}
+            names.add(statement.name)
+            key = (hashlib.sha1(source.encode()).hexdigest(), analyser.get_state(names))
+
+            entry = self.definitions.get(key)
+            if entry is None:
+                analyser.data_structures = []
+                analyser.visit(statement)
+                relative = [f.replace(line=f["line"] - start) for f in analyser.data_structures]
+                entry = (relative, analyser.get_state(names))
+                analyser.data_structures = findings
+                self.visited += 1
+            else:
+                self.reused += 1
+
+            analyser.update_state(entry[1])
+            findings.extend(f.replace(line=f["line"] + start) for f in entry[0])
+            definitions[key] = entry
+
+        # Only keep entries for the current version so the cache cannot grow unbounded
+        self.definitions = definitions
+        return findings
+
+class Watcher:
+    """
+    Polls a directory for changed .py files and re-analyses them incrementally,
+    keeping one IncrementalAnalyzer per file warm between changes.
+    packs are detector pack classes to enable, as for analyse_source.
+    """
+
+    def __init__(self, root, interval=0.5, packs=()):
+        self.root = root
+        self.interval = interval
+        self.packs = list(packs)
+        self.snapshots = {}
+        self.analysers = {}
+
+    def changed_files(self):
+        """Returns the files added or modified since the last call, forgetting deleted ones."""
+        changed = []
+        seen = set()
+        for path in iter_python_files([self.root]):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            seen.add(path)
+            snapshot = (stat.st_mtime_ns, stat.st_size)
+            if self.snapshots.get(path) != snapshot:
+                self.snapshots[path] = snapshot
+                changed.append(path)
+
+        for path in set(self.snapshots) - seen:
+            del self.snapshots[path]
+            self.analysers.pop(path, None)
+        return changed
+
+    def analyse_file(self, path):
+        """
+        Re-analyses one file. Returns a result dict with structures, suggestions,
+        score, reuse counts and elapsed time, or an error message.
+        """
+        start = time.perf_counter()
+        analyser = self.analysers.get(path)
+        if analyser is None:
+            analyser = self.analysers[path] = IncrementalAnalyzer(self.packs)
+        result = {"file": path, "error": None}
+
+        try:
+            with open(path, "r") as file:
+                code = file.read()
+            structures = analyser.analyse(code)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            result["error"] = str(e)
+        else:
+            suggestions = rank_suggestions(Suggestor(structures, rule_set_for(self.packs)).get_suggestions())
+            result.update({
+                "structures": structures,
+                "suggestions": suggestions,
+                "score": calculate_sustainability_score(suggestions),
+                "reused": analyser.reused,
+                "visited": analyser.visited
+            })
+
+        result["elapsed"] = time.perf_counter() - start
+        return result
+
+    def poll(self):
+        """Yields a result for each file changed since the last poll."""
+        for path in self.changed_files():
+            yield self.analyse_file(path)
+
+    def run(self, on_result, max_polls=None):
+        """Polls every `interval` seconds, passing each result to on_result."""
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            for result in self.poll():
+                on_result(result)
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(self.interval)